@@ -1,12 +1,17 @@
 # app.py — BAU Looncalculator (interactieve versie met Plotly)
 # --------------------------------------------------------------
 
+import os
 import streamlit as st
 import numpy as np
-import plotly.express as px
-import plotly.graph_objects as go
 from payroll.werknemer import Bediende
-from payroll.overzicht import maak_overzicht
+from payroll.cache import BerekeningCache, STANDAARD_GROOTTE
+from payroll.vectorieel import bereken_gevoeligheid
+from payroll.knikpunten import tariefcurves
+from payroll.voordelenmix import (
+    MC_WG_MAX_PER_DAG, MC_WN_MIN_PER_DAG, MC_TOTAAL_MAX_PER_DAG, KOSTENVERGOEDING_MAX_MAAND,
+    optimaliseer_voordelen,
+)
 
 # 🎨 BAU-stijl
 PRIMARY = "#003366"
@@ -17,6 +22,13 @@ TEXT = "#333333"
 # ⚙️ Pagina-instellingen
 st.set_page_config(page_title="BAU Looncalculator", page_icon="💼", layout="wide")
 
+# 🗃️ Gedeelde rekencache (één instantie voor alle sessies)
+@st.cache_resource
+def berekening_cache():
+    return BerekeningCache(maxsize=int(os.environ.get("LOONCALCULATOR_CACHE_GROOTTE", STANDAARD_GROOTTE)))
+
+cache = berekening_cache()
+
 # 💅 CSS
 st.markdown(
     f"""
@@ -47,7 +59,7 @@ with st.sidebar:
 
     # 🍽️ Maaltijdcheques
     st.subheader("Maaltijdcheques")
-    MAX_WG_PER_DAG, MIN_WN_PER_DAG, MAX_TOTAAL_PER_DAG = 6.91, 1.09, 8.00
+    MAX_WG_PER_DAG, MIN_WN_PER_DAG, MAX_TOTAAL_PER_DAG = MC_WG_MAX_PER_DAG, MC_WN_MIN_PER_DAG, MC_TOTAAL_MAX_PER_DAG
     mc_per_dag_wg = st.number_input("Werkgeversdeel (€)", 0.0, MAX_WG_PER_DAG, 5.91, 0.1)
     mc_per_dag_wn = st.number_input("Werknemersdeel (€)", MIN_WN_PER_DAG, MAX_TOTAAL_PER_DAG - mc_per_dag_wg, 1.09, 0.1)
     vakantie = st.number_input("Vakantiedagen", 0, 50, 20)
@@ -61,7 +73,7 @@ with st.sidebar:
     # 🌱 Andere voordelen
     st.subheader("Andere voordelen / vergoedingen")
     ec = st.number_input("Ecocheques / jaar", 0.0, 2000.0, 250.0, 10.0)
-    kosten_eigen_m = st.number_input("Kosten eigen aan WG / maand", 0.0, 197.83, 150.0, 5.0)
+    kosten_eigen_m = st.number_input("Kosten eigen aan WG / maand", 0.0, KOSTENVERGOEDING_MAX_MAAND, 150.0, 5.0)
     gv = st.number_input("GV WG (%)", 0.0, 20.0, 5.0, 0.5) / 100.0
     ao = st.number_input("AO verzekering (%)", 0.0, 10.0, 2.0, 0.5) / 100.0
 
@@ -80,7 +92,15 @@ b = Bediende(
     regime=regime,
 )
 toon_maand = True
-df, netto, kost = maak_overzicht(b, toon_per_maand=toon_maand)
+df, netto, kost = cache.overzicht(b, toon_per_maand=toon_maand)
+
+# 🗃️ Cache-statistieken (in de zijbalk, na de berekening)
+with st.sidebar.expander("Cache"):
+    stats = cache.statistieken
+    st.caption(
+        f"{stats['hits']} hits / {stats['misses']} misses "
+        f"({stats['hit_ratio']:.0%}) — {stats['grootte']}/{stats['maxsize']} resultaten"
+    )
 
 # --------------------------------------------------------------
 # 📋 Overzichtstabel
@@ -91,8 +111,8 @@ st.dataframe(df, use_container_width=True)
 # Toggle weergave
 toon_maand_toggle = st.toggle("Toon bedragen per maand", value=toon_maand)
 if toon_maand_toggle != toon_maand:
-    df, netto, kost = maak_overzicht(b, toon_per_maand=toon_maand_toggle)
-    st.experimental_rerun()
+    df, netto, kost = cache.overzicht(b, toon_per_maand=toon_maand_toggle)
+    st.rerun()
 
 st.markdown("---")
 
@@ -101,6 +121,11 @@ st.markdown("---")
 # --------------------------------------------------------------
 st.subheader("Kostenstructuur en koopkracht")
 
+# ⚡ Plotly pas laden wanneer de grafieken getekend worden: invoer en tabel
+# verschijnen zo al vóór de (trage) eerste import
+import plotly.express as px
+import plotly.graph_objects as go
+
 # Maak twee kolommen voor overzicht
 col_pie, col_bar = st.columns([1, 1])
 
@@ -185,34 +210,24 @@ col1, col2 = st.columns(2)
 with col1:
     range_step = st.number_input("Bereik ± (€)", 200, 3000, 1000, 100)
 with col2:
-    n_steps = st.slider("Aantal stappen", 3, 15, 7, 1)
+    n_steps = st.slider("Aantal stappen", 3, 2000, 500, 1)
 
 bruto_range = np.linspace(bruto - range_step, bruto + range_step, n_steps)
 bruto_range = bruto_range[bruto_range > 0]
 
-netto_values, koopkracht_values, kost_values = [], [], []
-
-for b_val in bruto_range:
-    b_tmp = Bediende(
-        bruto_maandloon=b_val,
-        prestatiebreuk=prestatie,
-        MG_WG_jaar=mg_wg,
-        MG_WN_jaar=mg_wn,
-        EC_jaar=ec,
-        GV_WG_pct=gv,
-        AO_pct=ao,
-        maandelijkse_kostenvergoeding=kosten_eigen_m,
-        regime=regime,
-    )
-    _, netto_tmp, kost_tmp = maak_overzicht(b_tmp, toon_per_maand=True)
-    netto_values.append(netto_tmp["nettoloon_maand"])
-    koopkracht_values.append(netto_tmp["koopkracht_maand"])
-    kost_values.append(kost_tmp["totaal_loonkost_maand"])
+# Enkel de drie curves berekenen (gevectoriseerd), geen overzicht per punt
+curves = bereken_gevoeligheid(b, bruto_range)
+netto_values = curves["nettoloon_maand"]
+koopkracht_values = curves["koopkracht_maand"]
+kost_values = curves["totaal_loonkost_maand"]
+
+# Markers enkel bij weinig punten; anders volstaat een lijn
+modus = "lines+markers" if len(bruto_range) <= 50 else "lines"
 
 fig3 = go.Figure()
-fig3.add_trace(go.Scatter(x=bruto_range, y=netto_values, mode="lines+markers", name="Netto loon", line=dict(color="#1f77b4", width=3)))
-fig3.add_trace(go.Scatter(x=bruto_range, y=koopkracht_values, mode="lines+markers", name="Koopkracht", line=dict(color="#2ca02c", width=3, dash="dash")))
-fig3.add_trace(go.Scatter(x=bruto_range, y=kost_values, mode="lines+markers", name="Loonkost werkgever", line=dict(color="#ff7f0e", width=3, dash="dot")))
+fig3.add_trace(go.Scatter(x=bruto_range, y=netto_values, mode=modus, name="Netto loon", line=dict(color="#1f77b4", width=3)))
+fig3.add_trace(go.Scatter(x=bruto_range, y=koopkracht_values, mode=modus, name="Koopkracht", line=dict(color="#2ca02c", width=3, dash="dash")))
+fig3.add_trace(go.Scatter(x=bruto_range, y=kost_values, mode=modus, name="Loonkost werkgever", line=dict(color="#ff7f0e", width=3, dash="dot")))
 fig3.update_layout(
     title="Evolutie van netto, koopkracht en werkgeverskost bij variatie van brutoloon",
     xaxis_title="Bruto maandloon (€)",
@@ -223,16 +238,176 @@ fig3.update_layout(
 st.plotly_chart(fig3, use_container_width=True)
 
 # --------------------------------------------------------------
-# 📄 PDF RAPPORT EXPORT (inclusief volledige tabel en sectiekoppen)
+# 📐 MARGINALE EN GEMIDDELDE TARIEVEN — exact uit de knikpunten
+# --------------------------------------------------------------
+st.subheader("Marginale en gemiddelde tarieven")
+st.caption(
+    "Marginaal: wat van een extra euro bruto bij de werknemer terechtkomt of wat hij de werkgever kost. "
+    "Exact berekend uit de hellingen van de parameterregels, dus knikken (zoals het einde van de afbouw "
+    "van de werkbonus) staan op hun juiste plaats."
+)
+
+tarieven = tariefcurves(b, max(bruto - range_step, 0.0), bruto + range_step, punten=max(n_steps, 1_000))
+i_huidig = min(np.searchsorted(tarieven["bruto"], bruto, side="right") - 1, len(tarieven["bruto"]) - 1)
+c1, c2, c3 = st.columns(3)
+c1.metric("Netto per extra €100 bruto", f"€{100 * tarieven['marginaal_nettoloon_maand'][i_huidig]:,.2f}")
+c2.metric("Koopkracht per extra €100 bruto", f"€{100 * tarieven['marginaal_koopkracht_maand'][i_huidig]:,.2f}")
+c3.metric("Loonkost per extra €100 bruto", f"€{100 * tarieven['marginaal_totaal_loonkost_maand'][i_huidig]:,.2f}")
+
+fig_tarief = go.Figure()
+for g, naam, kleur in (
+    ("nettoloon_maand", "Netto", "#1f77b4"),
+    ("koopkracht_maand", "Koopkracht", "#2ca02c"),
+    ("totaal_loonkost_maand", "Loonkost werkgever", "#ff7f0e"),
+):
+    fig_tarief.add_trace(go.Scatter(
+        x=tarieven["bruto"], y=100 * tarieven["marginaal_" + g], name=f"{naam} — marginaal",
+        mode="lines", line=dict(color=kleur, width=3, shape="hv"),
+    ))
+    fig_tarief.add_trace(go.Scatter(
+        x=tarieven["bruto"], y=100 * tarieven["gemiddeld_" + g], name=f"{naam} — gemiddeld",
+        mode="lines", line=dict(color=kleur, width=2, dash="dot"),
+    ))
+fig_tarief.add_vline(x=bruto, line_dash="dash", line_color="#999999")
+fig_tarief.update_layout(
+    title="Marginaal en gemiddeld tarief (per €100 bruto)",
+    xaxis_title="Bruto maandloon (€)",
+    yaxis_title="€ per €100 bruto",
+    template="simple_white",
+    hovermode="x unified",
+)
+st.plotly_chart(fig_tarief, use_container_width=True)
+
+# --------------------------------------------------------------
+# 🎯 OPTIMALE VERLONINGSMIX — zelfde budget, meer koopkracht
+# --------------------------------------------------------------
+st.markdown("---")
+st.subheader("🎯 Optimale verloningsmix")
+st.caption(
+    "Zoekt binnen de wettelijke grenzen de verdeling tussen bruto, maaltijdcheques, ecocheques "
+    "en kosten eigen aan de werkgever met de hoogste koopkracht voor hetzelfde loonkostbudget."
+)
+budget = st.number_input("Loonkostbudget per maand (€)", 0.0, 100_000.0, float(kost["totaal_loonkost_maand"]), 50.0)
+
+if st.button("🔎 Zoek optimale mix"):
+    mix = optimaliseer_voordelen(budget, werkdagen, prestatie, gv, ao, regime)
+    beste = mix["beste"]
+    if beste is None:
+        st.warning("Geen enkele mix past binnen dit budget.")
+    else:
+        c1, c2, c3 = st.columns(3)
+        c1.metric("Koopkracht / maand", f"€{beste['koopkracht_maand']:,.2f}",
+                  f"{beste['koopkracht_maand'] - netto['koopkracht_maand']:+,.2f} t.o.v. huidige situatie")
+        c2.metric("Bruto / maand", f"€{beste['bruto_maandloon']:,.2f}")
+        c3.metric("Loonkost / maand", f"€{beste['totaal_loonkost_maand']:,.2f}")
+
+        import pandas as pd
+        top = pd.DataFrame(mix["kandidaten"]).head(10).rename(columns={
+            "mc_wg_per_dag": "MC WG / dag",
+            "mc_wn_per_dag": "MC WN / dag",
+            "EC_jaar": "Ecocheques / jaar",
+            "maandelijkse_kostenvergoeding": "Kosten eigen / maand",
+            "bruto_maandloon": "Bruto / maand",
+            "nettoloon_maand": "Netto / maand",
+            "koopkracht_maand": "Koopkracht / maand",
+            "totaal_loonkost_maand": "Loonkost / maand",
+        })
+        st.dataframe(top, use_container_width=True, hide_index=True)
+
+# --------------------------------------------------------------
+# 👥 TEAM / AFDELING — CSV-upload, berekend op de achtergrond
 # --------------------------------------------------------------
-from io import BytesIO
-from reportlab.lib.pagesizes import A4
-from reportlab.lib import colors
-from reportlab.lib.units import cm
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Table, TableStyle, Spacer
-from datetime import datetime
+st.markdown("---")
+st.subheader("👥 Team of afdeling")
+st.caption(
+    "Upload een CSV met één rij per werknemer (kolommen zoals de invoer: bruto_maandloon, prestatiebreuk, "
+    "MG_WG_jaar, regime, ...). De berekening loopt op de achtergrond; hetzelfde bestand wordt niet opnieuw berekend."
+)
 
+from payroll.achtergrond import Takenbeheer, inhoud_hash, samenvatting, KLAAR, GEANNULEERD, MISLUKT
+
+# 🧵 Gedeelde threadpool + resultaten per uploadhash (één instantie voor alle sessies)
+@st.cache_resource
+def takenbeheer():
+    return Takenbeheer()
+
+@st.cache_data(show_spinner=False)
+def team_samenvatting(sleutel):
+    return samenvatting(takenbeheer().taak(sleutel).resultaat)
+
+# ⏳ Enkel dit fragment herlaadt tijdens de berekening; klaar of geannuleerd → volledige rerun
+@st.fragment(run_every=0.5)
+def team_voortgang(sleutel):
+    taak = takenbeheer().taak(sleutel)
+    if taak is None or not taak.bezig:
+        st.rerun()
+    if taak.totaal is None:
+        st.progress(0.0, text="Rijen tellen…")
+    else:
+        st.progress(taak.voortgang, text=f"{taak.verwerkt:,} / {taak.totaal:,} werknemers berekend")
+    if st.button("⏹️ Annuleren"):
+        taak.annuleer()
+
+col_upload, col_sep = st.columns([3, 1])
+with col_upload:
+    upload = st.file_uploader("Personeelsbestand (CSV)", type=["csv"])
+with col_sep:
+    sep = st.selectbox("Scheidingsteken", [",", ";"])
+
+if upload is not None:
+    inhoud = upload.getvalue()
+    sleutel = inhoud_hash(inhoud, sep=sep)
+    taak = takenbeheer().taak(sleutel)
+    # Automatisch starten, behalve als de gebruiker deze upload zelf annuleerde
+    if taak is None or (taak.status == MISLUKT and st.button("🔁 Opnieuw proberen")):
+        taak = takenbeheer().start(inhoud, sep)
+    elif taak.status == GEANNULEERD:
+        st.info(f"Berekening geannuleerd na {taak.verwerkt:,} van {taak.totaal or 0:,} werknemers.")
+        if st.button("▶️ Opnieuw starten"):
+            taak = takenbeheer().start(inhoud, sep)
+
+    if taak.bezig:
+        team_voortgang(sleutel)
+    elif taak.status == MISLUKT:
+        st.error(f"Berekening mislukt: {taak.fout}")
+    elif taak.status == KLAAR:
+        team = team_samenvatting(sleutel)
+        totaal = team.loc["totaal"]
+        c1, c2, c3, c4 = st.columns(4)
+        c1.metric("Werknemers", f"{int(totaal['werknemers']):,}")
+        c2.metric("Bruto / maand", f"€{totaal['som_bruto_maand']:,.0f}")
+        c3.metric("Netto / maand", f"€{totaal['som_nettoloon_maand']:,.0f}")
+        c4.metric("Loonkost / maand", f"€{totaal['som_totaal_loonkost_maand']:,.0f}")
+
+        weergave = st.radio("Grafiek", ["Totaal per regime", "Verdeling per werknemer"], horizontal=True)
+        if weergave == "Totaal per regime":
+            per_regime = team.drop(index="totaal")
+            fig_team = go.Figure()
+            for veld, naam, kleur in (
+                ("som_totaal_loonkost_maand", "Loonkost", PRIMARY),
+                ("som_bruto_maand", "Bruto", "#00509E"),
+                ("som_nettoloon_maand", "Netto", ACCENT),
+                ("som_koopkracht_maand", "Koopkracht", "#4CAF50"),
+            ):
+                fig_team.add_trace(go.Bar(x=per_regime.index, y=per_regime[veld], name=naam, marker_color=kleur))
+            fig_team.update_layout(barmode="group", title="Totalen per BBSZ-regime", yaxis_title="€ per maand",
+                                   template="simple_white")
+        else:
+            resultaat = taak.resultaat
+            # Grote bestanden: een steekproef volstaat voor een histogram
+            punten = resultaat if len(resultaat) <= 50_000 else resultaat.sample(50_000, random_state=0)
+            fig_team = go.Figure()
+            fig_team.add_trace(go.Histogram(x=punten["nettoloon_maand"], name="Netto", marker_color=ACCENT, opacity=0.7))
+            fig_team.add_trace(go.Histogram(x=punten["totaal_loonkost_maand"], name="Loonkost", marker_color=PRIMARY,
+                                            opacity=0.7))
+            fig_team.update_layout(barmode="overlay", title="Verdeling netto en loonkost per werknemer",
+                                   xaxis_title="€ per maand", yaxis_title="Werknemers", template="simple_white")
+        st.plotly_chart(fig_team, use_container_width=True)
+        st.dataframe(team, use_container_width=True)
+
+# --------------------------------------------------------------
+# 📄 PDF RAPPORT EXPORT (inclusief volledige tabel en sectiekoppen)
+# --------------------------------------------------------------
 st.markdown("---")
 st.subheader("📄 Rapport export")
 
@@ -243,110 +418,10 @@ beschrijving = st.text_area(
 )
 
 if st.button("💾 Download rapport (PDF)"):
-    buffer = BytesIO()
-
-    # PDF-document setup
-    doc = SimpleDocTemplate(
-        buffer,
-        pagesize=A4,
-        leftMargin=2*cm,
-        rightMargin=2*cm,
-        topMargin=2*cm,
-        bottomMargin=2*cm,
-    )
-
-    styles = getSampleStyleSheet()
-    elements = []  # ✅ HIER wordt elements aangemaakt
-
-    # 🏷️ Titel
-    title_style = styles["Title"]
-    title_style.textColor = colors.HexColor("#003366")
-    elements.append(Paragraph("BAU Looncalculator — Rapport", title_style))
-    elements.append(Spacer(1, 0.2 * cm))
-    elements.append(Paragraph(f"<i>Gegenereerd op {datetime.now():%d/%m/%Y}</i>", styles["Normal"]))
-    elements.append(Spacer(1, 0.5 * cm))
-
-    # 📋 Beschrijving
-    if beschrijving.strip():
-        elements.append(Paragraph("<b>Beschrijving</b>", styles["Heading3"]))
-        elements.append(Paragraph(beschrijving.replace("\n", "<br/>"), styles["Normal"]))
-        elements.append(Spacer(1, 0.5 * cm))
-
-    # 🧾 Samenvatting
-    summary = [
-        ["Bruto maandloon", f"€ {netto['bruto_maand']:.2f}"],
-        ["Netto maandloon", f"€ {netto['nettoloon_maand']:.2f}"],
-        ["Netto koopkracht", f"€ {netto['koopkracht_maand']:.2f}"],
-        ["Totale werkgeverskost", f"€ {kost['totaal_loonkost_maand']:.2f}"],
-        ["Structurele vermindering", f"€ {kost.get('structurele_vermindering', 0):.2f} per jaar"],
-    ]
-    t_summary = Table(summary, colWidths=[8*cm, 6*cm])
-    t_summary.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor("#003366")),
-        ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-        ('ALIGN', (1, 0), (-1, -1), 'RIGHT'),
-        ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-        ('GRID', (0, 0), (-1, -1), 0.25, colors.grey),
-    ]))
-    elements.append(Paragraph("<b>Samenvatting</b>", styles["Heading3"]))
-    elements.append(t_summary)
-    elements.append(Spacer(1, 0.7 * cm))
-
-    # 📊 Tabel met loonoverzicht
-    elements.append(Paragraph("<b>Volledig loonoverzicht</b>", styles["Heading3"]))
-
-    # Zet DataFrame om in tabeldata
-    data = [df.columns.tolist()] + df.values.tolist()
-
-    # Detecteer sectiekoppen zoals 'INKOMSTEN', 'INHOUDINGEN', 'KOOPKRACHT', 'WERKGEVERSKOST'
-    header_rows = []
-    for i, row in enumerate(df["Component"].tolist(), start=1):
-        if isinstance(row, str) and row.isupper() and row.strip() != "":
-            header_rows.append(i)
-
-    # Maak de tabel
-    table = Table(data, repeatRows=1, colWidths=[7*cm, 7*cm])
-
-    # Basisstijl
-    table_style = [
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor("#003366")),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-        ('ALIGN', (1, 1), (-1, -1), 'RIGHT'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 0), (-1, -1), 9),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 6),
-        ('GRID', (0, 0), (-1, -1), 0.25, colors.grey),
-        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.whitesmoke, colors.lightgrey]),
-    ]
-
-    # Extra opmaak voor sectiekoppen
-    for r in header_rows:
-        table_style += [
-            ('BACKGROUND', (0, r), (-1, r), colors.HexColor("#DDE5F2")),
-            ('TEXTCOLOR', (0, r), (-1, r), colors.HexColor("#003366")),
-            ('FONTNAME', (0, r), (-1, r), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, r), (-1, r), 10),
-            ('ALIGN', (0, r), (-1, r), 'LEFT'),
-            ('LINEABOVE', (0, r), (-1, r), 0.75, colors.HexColor("#003366")),
-            ('TOPPADDING', (0, r), (-1, r), 4),
-        ]
-
-    table.setStyle(TableStyle(table_style))
-    elements.append(table)
-
-    # Footer
-    elements.append(Spacer(1, 0.7 * cm))
-    elements.append(Paragraph(
-        "<i>Gegenereerd met BAU Looncalculator — dit rapport is informatief en niet bindend.</i>",
-        styles["Normal"],
-    ))
+    # ⚡ reportlab enkel laden wanneer er effectief een rapport gevraagd wordt
+    from payroll.rapport import bouw_rapport
 
-    doc.build(elements)
-    pdf_data = buffer.getvalue()
-    buffer.close()
+    pdf_data, _ = bouw_rapport(df, netto, kost, beschrijving)
 
     st.download_button(
         label="📥 Download PDF",
@@ -0,0 +1 @@
+# conftest.py — zorgt dat pytest de repo-root op sys.path zet (parameters/, payroll/)
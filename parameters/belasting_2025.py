@@ -1,4 +1,5 @@
 # parameters/belasting_2025.py
+from parameters.structuren import Belasting, compileer_belasting
 BELASTING_SCHIJVEN = [
     (10570, 0.00),
     (15200, 0.25),
@@ -6,10 +7,12 @@ BELASTING_SCHIJVEN = [
     (46440, 0.45),
     (float('inf'), 0.50)
 ]
-def bereken_personenbelasting(belastbaar_inkomen: float) -> float:
+KOSTENFORFAIT_PLAFOND = 5930.0
+BELASTING = compileer_belasting(BELASTING_SCHIJVEN, KOSTENFORFAIT_PLAFOND)
+def bereken_personenbelasting(belastbaar_inkomen: float, params: Belasting = BELASTING) -> float:
     belasting = 0.0
     vorige = 0.0
-    for grens, tarief in BELASTING_SCHIJVEN:#een for-loop die over de schijven gaat
+    for grens, tarief in params.schijven:#een for-loop die over de schijven gaat
         deel = min(belastbaar_inkomen, grens) - vorige
         if deel > 0:
             belasting += deel * tarief
@@ -1,7 +1,10 @@
 # parameters/bszb_2025.py
 from typing import Literal
+from parameters.structuren import Bszb, compileer_bszb
 Regime = Literal["gemeenschappelijk_met_inkomen", "gemeenschappelijk_zonder_inkomen", "individueel"]
-BSZB_PARAMS_2024 = {
+# Vaste volgorde van de regimes → categorische code (index) voor batchberekeningen
+REGIMES = ("individueel", "gemeenschappelijk_met_inkomen", "gemeenschappelijk_zonder_inkomen")
+BSZB_PARAMS = {
     "maandgrenzen": {
         "g1": 1945.38, 
         "g2": 2190.18, 
@@ -22,11 +25,13 @@ BSZB_PARAMS_2024 = {
             "zone1_q": 15.45, 
             "zone2_pct": 0.0590, 
             "min_q": 15.45, 
+            "zone3_basis_q": 43.32, 
             "zone3_pct": 0.0110, 
             "max_q": 154.92
             },
         "gemeenschappelijk_zonder_inkomen": {
             "zone2_pct": 0.0590, 
+            "zone3_basis_q": 43.32, 
             "zone3_pct": 0.0110, 
             "max_q": 182.82
             },
@@ -43,36 +48,39 @@ BSZB_PARAMS_2024 = {
     },
 }
 
+BSZB = compileer_bszb(BSZB_PARAMS)
+BSZB_PARAMS_2024 = BSZB_PARAMS  # oude naam, behouden voor bestaande imports
+
 def _within(x, low, high): 
     return max(0.0, min(x, high) - low)
 
-def bereken_bszb(maandloon: float, regime: Regime = "individueel") -> dict:
+def bereken_bszb(maandloon: float, regime: Regime = "individueel", params: Bszb = BSZB) -> dict:
 
     S = maandloon; K = S * 3
-    g = BSZB_PARAMS_2024["maandgrenzen"]; k = BSZB_PARAMS_2024["kwartaalgrenzen"]; pc = BSZB_PARAMS_2024["percentages"]; p = pc[regime]
+    P = params; p = P.percentages[regime]
     q = 0.0
 
     if regime == "gemeenschappelijk_met_inkomen":
-        if k["k1"] <= K < k["k2"]: q = p["zone1_q"]
-        elif k["k2"] <= K <= k["k3"]:
-            base = _within(S, g["g1"], g["g2"]); q = max(p["min_q"], base * p["zone2_pct"])
-        elif K > k["k3"]:
-            excedent = max(0.0, S - g["g2"]); q = 43.32 + excedent * p["zone3_pct"]; q = min(q, p["max_q"])
+        if P.k1 <= K < P.k2: q = p.zone1_q
+        elif P.k2 <= K <= P.k3:
+            base = _within(S, P.g1, P.g2); q = max(p.min_q, base * p.zone2_pct)
+        elif K > P.k3:
+            excedent = max(0.0, S - P.g2); q = p.zone3_basis_q + excedent * p.zone3_pct; q = min(q, p.max_q)
     elif regime == "gemeenschappelijk_zonder_inkomen":
-        if k["k2"] <= K <= k["k3"]:
-            base = _within(S, g["g1"], g["g2"]); q = base * p["zone2_pct"]
-        elif K > k["k3"]:
-            excedent = max(0.0, S - g["g2"]); q = 43.32 + excedent * p["zone3_pct"]; q = min(q, p["max_q"])
+        if P.k2 <= K <= P.k3:
+            base = _within(S, P.g1, P.g2); q = base * p.zone2_pct
+        elif K > P.k3:
+            excedent = max(0.0, S - P.g2); q = p.zone3_basis_q + excedent * p.zone3_pct; q = min(q, p.max_q)
     elif regime == "individueel":
-        if k["k2"] <= K <= k["k3"]:
-            base = _within(S, g["g1"], g["g2"]); q = base * p["z2_pct"]
-        elif k["k3"] < K <= k["k4"]:
-            base = _within(S, g["g2"], g["g3"]); q = p["z3_q"] + base * p["z3_pct"]
-        elif k["k4"] < K <= k["k5"]:
-            base = _within(S, g["g3"], g["g4"]); q = p["z4_q"] + base * p["z4_pct"]
-        elif k["k5"] < K <= k["k6"]:
-            base = _within(S, g["g4"], g["g5"]); q = p["z5_q"] + base * p["z5_pct"]
-        elif K > k["k6"]: q = p["z6_q"]
+        if P.k2 <= K <= P.k3:
+            base = _within(S, P.g1, P.g2); q = base * p.z2_pct
+        elif P.k3 < K <= P.k4:
+            base = _within(S, P.g2, P.g3); q = p.z3_q + base * p.z3_pct
+        elif P.k4 < K <= P.k5:
+            base = _within(S, P.g3, P.g4); q = p.z4_q + base * p.z4_pct
+        elif P.k5 < K <= P.k6:
+            base = _within(S, P.g4, P.g5); q = p.z5_q + base * p.z5_pct
+        elif K > P.k6: q = p.z6_q
 
     maand = round(q/3.0 + 1e-9, 2); 
     jaar = round(maand*12 + 1e-9, 2)
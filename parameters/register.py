@@ -0,0 +1,67 @@
+# parameters/register.py
+#
+# Register van parameterjaren.
+#
+# Per jaar bestaan vier modules (belasting_<jaar>, werkbonus_<jaar>,
+# bszb_<jaar>, structurele_vermindering_<jaar>) die hun gegevens bij het
+# importeren compileren naar de onveranderlijke structuren uit
+# parameters/structuren.py. laad_parameters(jaar) importeert die modules pas
+# wanneer het jaar voor het eerst gevraagd wordt en bundelt ze in één
+# Parameterset; elk jaar wordt dus exact één keer geladen en gecompileerd.
+#
+# Een nieuw jaar toevoegen = de vier modules voor dat jaar aanmaken.
+
+import importlib
+from collections import namedtuple
+from functools import lru_cache
+
+import parameters
+
+STANDAARD_JAAR = 2025
+
+# onderdeel → (modulenaam, naam van de gecompileerde constante)
+_ONDERDELEN = {
+    "belasting": ("belasting_{jaar}", "BELASTING"),
+    "werkbonus": ("werkbonus_{jaar}", "WERKBONUS"),
+    "bszb": ("bszb_{jaar}", "BSZB"),
+    "structureel": ("structurele_vermindering_{jaar}", "STRUCTURELE_VERMINDERING"),
+}
+
+
+# belasting: Belasting · werkbonus: categorie → Werkbonus · bszb: Bszb
+# structureel: categorie → StructureleCategorie (zie parameters/structuren.py)
+Parameterset = namedtuple("Parameterset", "jaar belasting werkbonus bszb structureel")
+
+
+def beschikbare_jaren() -> list:
+    """Jaren waarvoor alle vier de parametermodules aanwezig zijn."""
+    import pkgutil
+    modules = {m.name for m in pkgutil.iter_modules(parameters.__path__)}
+    jaren = None
+    for sjabloon, _ in _ONDERDELEN.values():
+        prefix = sjabloon.split("{")[0]
+        gevonden = {int(naam[len(prefix):]) for naam in modules
+                    if naam.startswith(prefix) and naam[len(prefix):].isdigit()}
+        jaren = gevonden if jaren is None else jaren & gevonden
+    return sorted(jaren)
+
+
+@lru_cache(maxsize=None)
+def laad_parameters(jaar: int = STANDAARD_JAAR) -> Parameterset:
+    """Laadt (eenmalig) de gecompileerde parameters voor het gevraagde jaar."""
+    onderdelen = {}
+    for onderdeel, (sjabloon, constante) in _ONDERDELEN.items():
+        naam = f"parameters.{sjabloon.format(jaar=jaar)}"
+        try:
+            module = importlib.import_module(naam)
+        except ModuleNotFoundError as e:
+            if e.name != naam:
+                raise
+            raise ValueError(
+                f"Geen parameters voor {jaar} (beschikbaar: {', '.join(map(str, beschikbare_jaren()))})"
+            ) from None
+        onderdelen[onderdeel] = getattr(module, constante)
+    return Parameterset(jaar=jaar, **onderdelen)
+
+
+STANDAARD = laad_parameters(STANDAARD_JAAR)
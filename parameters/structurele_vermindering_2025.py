@@ -1,4 +1,5 @@
 # parameters/structurele_vermindering_2025.py
+from parameters.structuren import compileer_structurele_vermindering
 
 # 📌 Parameters voor structurele vermindering werkgeversbijdrage
 # Momenteel enkel categorie 1 (algemene categorie)
@@ -14,6 +15,7 @@ PARAMS = {
         "S1": None        # grens voor hogelonencomponent (niet gebruikt)
     }
 }
+STRUCTURELE_VERMINDERING = compileer_structurele_vermindering(PARAMS)
 
 
 def _comp(value):
@@ -29,7 +31,7 @@ def _comp(value):
     return max(0.0, v)
 
 
-def bereken_R(categorie: int, maandloon: float, prestatiebreuk: float) -> float:
+def bereken_R(categorie: int, maandloon: float, prestatiebreuk: float, params=STRUCTURELE_VERMINDERING) -> float:
     """
     Berekent het forfaitaire verminderingsbedrag R (per kwartaal) volgens:
     
@@ -42,17 +44,18 @@ def bereken_R(categorie: int, maandloon: float, prestatiebreuk: float) -> float:
     ❗ Dit is enkel het R-bedrag → moet nog vermenigvuldigd
     worden met prestatiebreuk en factor µ (bij ons 1)
     """
-    p = PARAMS[categorie]
+    p = params[categorie]
     S=maandloon*3*prestatiebreuk
-    R = p["F"]
-    R += _comp(p["alpha"] * (p["S0"] - S))   # lage lonen
-    R += _comp(p["gamma"] * (p["S2"] - S))   # zeer lage lonen
+    R = p.F
+    R += _comp(p.alpha * (p.S0 - S))   # lage lonen
+    R += _comp(p.gamma * (p.S2 - S))   # zeer lage lonen
     # hogelonencomponent δ wordt nu niet toegepast in categorie 1
     return round(R + 1e-9, 2)
 
 
 
-def bereken_structurele_vermindering_maand(categorie: int, maandloon: float, prestatiebreuk: float = 1.0) -> float:
+def bereken_structurele_vermindering_maand(categorie: int, maandloon: float, prestatiebreuk: float = 1.0,
+                                           params=STRUCTURELE_VERMINDERING) -> float:
     """
     Berekent de structurele vermindering per maand
 
@@ -66,7 +69,7 @@ def bereken_structurele_vermindering_maand(categorie: int, maandloon: float, pre
     Return:
     ✅ maandelijkse vermindering werkgeversbijdragen
     """
-    R = bereken_R(categorie, maandloon, prestatiebreuk)
+    R = bereken_R(categorie, maandloon, prestatiebreuk, params)
     mu=prestatiebreuk
     if mu<0.55:
         beta=1.18
@@ -78,4 +81,3 @@ def bereken_structurele_vermindering_maand(categorie: int, maandloon: float, pre
 
     return round(Ps + 1e-9, 2)
 
-print(bereken_structurele_vermindering_maand(1,2000,1))
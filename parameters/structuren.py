@@ -0,0 +1,96 @@
+# parameters/structuren.py
+#
+# Onveranderlijke structuren voor één parameterjaar.
+# De parametermodules houden hun gegevens als leesbare dicts/lijsten; die
+# worden één keer bij het importeren gecompileerd naar deze structuren, zodat
+# de rekenfuncties met gewone attribuuttoegang werken i.p.v. geneste dict-lookups.
+#
+# ⚡ namedtuple i.p.v. dataclass: even onveranderlijk en zonder __dict__, maar
+# dataclasses trekt inspect/re/enum mee en verdubbelt zo de importtijd van
+# de rekenmodules (zie payroll/importtijd.py).
+#
+# De alleen-lezen mappings (MappingProxyType) zijn op zich niet te pickelen;
+# hieronder wordt geregistreerd dat ze als gewone dict overgaan en aan de
+# andere kant opnieuw in een MappingProxyType verpakt worden. Zo kan een
+# volledige Parameterset (ook een aangepaste) naar workers van een procespool,
+# ook met spawn/forkserver.
+
+import copyreg
+from collections import namedtuple
+from types import MappingProxyType
+
+
+def alleen_lezen(d: dict) -> MappingProxyType:
+    return MappingProxyType(d)
+
+
+def _reduceer_mapping(m: MappingProxyType):
+    return alleen_lezen, (dict(m),)
+
+
+copyreg.pickle(MappingProxyType, _reduceer_mapping)
+
+
+# -----------------------
+# Personenbelasting
+# -----------------------
+# schijven: ((bovengrens, tarief), ...) oplopend, laatste grens = inf
+# kostenforfait_plafond: forfaitaire beroepskosten, maximum per jaar
+Belasting = namedtuple("Belasting", "schijven kostenforfait_plafond")
+
+
+def compileer_belasting(schijven, kostenforfait_plafond: float) -> Belasting:
+    return Belasting(tuple((float(g), float(t)) for g, t in schijven), float(kostenforfait_plafond))
+
+
+# -----------------------
+# Werkbonus
+# -----------------------
+AfbouwLuik = namedtuple("AfbouwLuik", "S_max bedrag S_afbouw_max afbouw_coef")
+Werkbonus = namedtuple("Werkbonus", "luikA luikB fiscale_pct_luikA fiscale_pct_luikB")
+
+
+def compileer_werkbonus(params: dict):
+    """{categorie: {...}} → alleen-lezen mapping categorie → Werkbonus."""
+    return MappingProxyType({
+        categorie: Werkbonus(
+            AfbouwLuik(**p["luikA"]), AfbouwLuik(**p["luikB"]),
+            p["fiscale_pct_luikA"], p["fiscale_pct_luikB"],
+        )
+        for categorie, p in params.items()
+    })
+
+
+# -----------------------
+# Bijzondere bijdrage sociale zekerheid
+# -----------------------
+BszbGemeenschappelijk = namedtuple(
+    "BszbGemeenschappelijk", "zone2_pct zone3_basis_q zone3_pct max_q zone1_q min_q", defaults=(0.0, 0.0)
+)
+BszbIndividueel = namedtuple("BszbIndividueel", "z2_pct z3_q z3_pct z4_q z4_pct z5_q z5_pct z6_q")
+# percentages: regime → BszbGemeenschappelijk / BszbIndividueel
+Bszb = namedtuple("Bszb", "g1 g2 g3 g4 g5 k1 k2 k3 k4 k5 k6 percentages")
+
+
+def compileer_bszb(params: dict) -> Bszb:
+    pc = params["percentages"]
+    return Bszb(
+        **params["maandgrenzen"],
+        **params["kwartaalgrenzen"],
+        percentages=MappingProxyType({
+            "gemeenschappelijk_met_inkomen": BszbGemeenschappelijk(**pc["gemeenschappelijk_met_inkomen"]),
+            "gemeenschappelijk_zonder_inkomen": BszbGemeenschappelijk(**pc["gemeenschappelijk_zonder_inkomen"]),
+            "individueel": BszbIndividueel(**pc["individueel"]),
+        }),
+    )
+
+
+# -----------------------
+# Structurele vermindering
+# -----------------------
+StructureleCategorie = namedtuple("StructureleCategorie", "F alpha gamma delta S0 S2 S1", defaults=(None,))
+
+
+def compileer_structurele_vermindering(params: dict):
+    """{categorie: {...}} → alleen-lezen mapping categorie → StructureleCategorie."""
+    return MappingProxyType({categorie: StructureleCategorie(**p) for categorie, p in params.items()})
@@ -1,4 +1,5 @@
 # parameters/werkbonus_2025.py
+from parameters.structuren import AfbouwLuik, compileer_werkbonus
 WERKBONUS_PARAMS = {
     "bedienden": {
         "luikA": {
@@ -16,19 +17,19 @@ WERKBONUS_PARAMS = {
         "fiscale_pct_luikB": 0.5254
     }
 }
-def _afbouw(S, S_max, bedrag, S_afbouw_max, afbouw_coef):
-    if S <= S_max: return bedrag
-    elif S <= S_afbouw_max:
-        v = bedrag - afbouw_coef * (S - S_max)
+WERKBONUS = compileer_werkbonus(WERKBONUS_PARAMS)
+def _afbouw(S, luik: AfbouwLuik):
+    if S <= luik.S_max: return luik.bedrag
+    elif S <= luik.S_afbouw_max:
+        v = luik.bedrag - luik.afbouw_coef * (S - luik.S_max)
         return max(0.0, v)
     else: return 0.0
-def bereken_sociale_werkbonus(refertemaandloon: float, categorie: str = "bedienden"):
-    p = WERKBONUS_PARAMS[categorie]
-    A = _afbouw(refertemaandloon, **p["luikA"])
-    B = _afbouw(refertemaandloon, **p["luikB"])
+def bereken_sociale_werkbonus(refertemaandloon: float, categorie: str = "bedienden", params=WERKBONUS):
+    p = params[categorie]
+    A = _afbouw(refertemaandloon, p.luikA)
+    B = _afbouw(refertemaandloon, p.luikB)
     return round(A, 2), round(B, 2)
-def bereken_fiscale_werkbonus(luikA: float, luikB: float, categorie: str = "bedienden"):
-    p = WERKBONUS_PARAMS[categorie]
-    return round(luikA * p["fiscale_pct_luikA"], 2), round(luikB * p["fiscale_pct_luikB"], 2)
+def bereken_fiscale_werkbonus(luikA: float, luikB: float, categorie: str = "bedienden", params=WERKBONUS):
+    p = params[categorie]
+    return round(luikA * p.fiscale_pct_luikA, 2), round(luikB * p.fiscale_pct_luikB, 2)
 
-print(bereken_sociale_werkbonus(2000,"bedienden"))
\ No newline at end of file
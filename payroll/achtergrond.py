@@ -0,0 +1,161 @@
+# payroll/achtergrond.py
+#
+# Personeelsbestanden (CSV-upload) op de achtergrond berekenen, los van de
+# Streamlit-reruns: een gedeelde threadpool voert de taken uit, de app vraagt
+# enkel voortgang en resultaat op.
+#
+# - Elke upload wordt geïdentificeerd door de hash van zijn inhoud; hetzelfde
+#   bestand opnieuw (of een rerun van de app) hergebruikt de lopende taak of
+#   het bewaarde resultaat, er wordt niets herberekend
+# - Een taak rekent blok per blok en controleert tussen twee blokken of ze
+#   geannuleerd werd; voortgang = verwerkte rijen / totaal (het totaal wordt
+#   eerst in de taak zelf geteld met de csv-parser: velden tussen
+#   aanhalingstekens mogen regeleinden bevatten)
+# - Afgewerkte resultaten blijven in een begrensde LRU (zoals payroll/cache.py)
+#
+#   beheer = Takenbeheer()
+#   taak = beheer.start(inhoud)            # bytes van de CSV
+#   taak.voortgang, taak.status             # 0.0..1.0, "bezig"/"klaar"/...
+#   taak.annuleer()
+
+import csv
+import hashlib
+import io
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from parameters.bszb_2025 import REGIMES
+from parameters.register import Parameterset, STANDAARD
+from payroll.batch import verwerk_blok
+from payroll.export import SAMENVATTING_BEDRAGEN, samenvatting_per_regime
+
+STANDAARD_WORKERS = 2
+STANDAARD_BLOKGROOTTE = 5_000
+STANDAARD_BEWAREN = 8      # aantal afgewerkte resultaten in de cache
+
+BEZIG, KLAAR, GEANNULEERD, MISLUKT = "bezig", "klaar", "geannuleerd", "mislukt"
+
+
+def inhoud_hash(inhoud: bytes, params: Parameterset = STANDAARD, sep: str = ",") -> str:
+    """Sleutel van een upload: inhoud + parameterjaar + scheidingsteken."""
+    h = hashlib.blake2b(inhoud, digest_size=16)
+    h.update(f"|{params.jaar}|{sep}".encode())
+    return h.hexdigest()
+
+
+def tel_rijen(inhoud: bytes, sep: str = ",") -> int:
+    """Aantal gegevensrijen (zonder kopregel) zoals pandas ze leest: lege regels tellen niet mee."""
+    tekst = io.TextIOWrapper(io.BytesIO(inhoud), encoding="utf-8", errors="replace", newline="")
+    return max(sum(1 for rij in csv.reader(tekst, delimiter=sep) if rij) - 1, 0)
+
+
+class Taak:
+    """Eén achtergrondberekening; alle attributen zijn veilig te lezen vanuit een andere thread."""
+
+    def __init__(self, sleutel: str):
+        self.sleutel = sleutel
+        self.totaal = None          # aantal rijen; None zolang het nog geteld wordt
+        self.verwerkt = 0
+        self.status = BEZIG
+        self.resultaat = None       # DataFrame: invoer + netto- en loonkostkolommen
+        self.fout = None
+        self._stop = threading.Event()
+        self.future = None
+
+    @property
+    def voortgang(self) -> float:
+        if self.status == KLAAR:
+            return 1.0
+        return min(1.0, self.verwerkt / max(self.totaal, 1)) if self.totaal is not None else 0.0
+
+    @property
+    def bezig(self) -> bool:
+        return self.status == BEZIG
+
+    def annuleer(self):
+        self._stop.set()
+
+    def _voer_uit(self, inhoud: bytes, sep: str, blokgrootte: int, params: Parameterset):
+        try:
+            self.totaal = tel_rijen(inhoud, sep)
+            blokken = []
+            for blok in pd.read_csv(io.BytesIO(inhoud), sep=sep, chunksize=blokgrootte):
+                if self._stop.is_set():
+                    self.status = GEANNULEERD
+                    return
+                blokken.append(verwerk_blok(blok, params))
+                self.verwerkt += len(blok)
+            self.resultaat = pd.concat(blokken, ignore_index=True) if blokken else pd.DataFrame()
+            self.status = KLAAR
+        except Exception as e:      # foutmelding tonen in de app i.p.v. de thread te laten sterven
+            self.fout = e
+            self.status = MISLUKT
+
+
+class Takenbeheer:
+    """
+    Threadpool + register van taken per uploadhash. Thread-safe, zodat één
+    instantie gedeeld kan worden door alle Streamlit-sessies.
+    """
+
+    def __init__(self, workers: int = STANDAARD_WORKERS, bewaren: int = STANDAARD_BEWAREN,
+                 blokgrootte: int = STANDAARD_BLOKGROOTTE):
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="looncalculator")
+        self.bewaren = bewaren
+        self.blokgrootte = blokgrootte
+        self._taken = OrderedDict()     # sleutel → Taak (lopend of afgewerkt)
+        self._lock = threading.Lock()
+
+    def start(self, inhoud: bytes, sep: str = ",", params: Parameterset = STANDAARD) -> Taak:
+        """
+        Taak voor deze upload: bestaand (lopend of klaar) als dezelfde inhoud al
+        gezien werd, anders een nieuwe op de pool. Een geannuleerde of
+        mislukte taak wordt opnieuw gestart.
+        """
+        sleutel = inhoud_hash(inhoud, params, sep)
+        with self._lock:
+            taak = self._taken.get(sleutel)
+            if taak is not None and taak.status in (BEZIG, KLAAR):
+                self._taken.move_to_end(sleutel)
+                return taak
+            taak = Taak(sleutel)
+            self._taken[sleutel] = taak
+            self._taken.move_to_end(sleutel)
+            self._opruimen()
+        taak.future = self.pool.submit(taak._voer_uit, inhoud, sep, self.blokgrootte, params)
+        return taak
+
+    def taak(self, sleutel: str):
+        with self._lock:
+            return self._taken.get(sleutel)
+
+    def _opruimen(self):
+        # Oudste afgewerkte taken eruit; lopende taken nooit
+        afgewerkt = [k for k, t in self._taken.items() if not t.bezig]
+        for k in afgewerkt[:max(0, len(afgewerkt) - self.bewaren)]:
+            del self._taken[k]
+
+    def sluit(self):
+        for taak in list(self._taken.values()):
+            taak.annuleer()
+        self.pool.shutdown(wait=True)
+
+
+def samenvatting(resultaat: pd.DataFrame) -> pd.DataFrame:
+    """
+    Zelfde tabel als het samenvattingsblad van StreamExport (payroll/export.py),
+    met het regime als index: enkel regimes met werknemers, plus "totaal".
+    """
+    if "regime" in resultaat.columns:
+        codes = pd.Categorical(resultaat["regime"], categories=REGIMES).codes
+    else:
+        codes = np.zeros(len(resultaat), dtype=np.int8)
+    aantal = np.bincount(codes, minlength=len(REGIMES))
+    sommen = {veld: np.bincount(codes, weights=resultaat[veld].to_numpy(dtype=np.float64), minlength=len(REGIMES))
+              for veld, _ in SAMENVATTING_BEDRAGEN}
+    tabel = samenvatting_per_regime(aantal, sommen).set_index("regime")
+    return tabel[(tabel["werknemers"] > 0) | (tabel.index == "totaal")]
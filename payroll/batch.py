@@ -0,0 +1,139 @@
+# payroll/batch.py
+#
+# Maandafsluiting voor een volledig personeelsbestand vanuit een CSV/Excel-bestand.
+# Het bestand wordt in blokken van vaste grootte gelezen, per blok berekend
+# (nettoloon + loonkost, gevectoriseerd) en meteen weggeschreven, zodat het
+# geheugengebruik constant blijft, los van de bestandsgrootte.
+#
+#   python -m payroll.batch personeel.csv resultaten.csv --blok 50000
+#   python -m payroll.batch personeel.csv resultaten.xlsx   (bladen netto/loonkost/samenvatting)
+
+import argparse
+import sys
+import time
+from contextlib import nullcontext
+
+import pandas as pd
+
+from parameters.register import Parameterset, STANDAARD, STANDAARD_JAAR, laad_parameters
+from payroll.personeelsbestand import Personeelsbestand
+
+STANDAARD_BLOKGROOTTE = 50_000
+
+
+def lees_in_blokken(pad: str, blokgrootte: int = STANDAARD_BLOKGROOTTE, sep: str = ","):
+    """
+    Leest een CSV- of Excel-bestand blok per blok (generator van DataFrames).
+    Kolomnamen volgen de velden van Bediende; extra kolommen (bv. een ID)
+    worden ongewijzigd doorgegeven.
+    """
+    if pad.lower().endswith((".xlsx", ".xlsm")):
+        yield from _lees_excel_in_blokken(pad, blokgrootte)
+    else:
+        yield from pd.read_csv(pad, sep=sep, chunksize=blokgrootte)
+
+
+def _lees_excel_in_blokken(pad: str, blokgrootte: int):
+    try:
+        import openpyxl
+    except ImportError:
+        raise ImportError("openpyxl is vereist om Excel-bestanden te lezen") from None
+
+    # read_only: rijen worden gestreamd i.p.v. het hele werkboek te laden
+    wb = openpyxl.load_workbook(pad, read_only=True, data_only=True)
+    try:
+        rijen = wb.active.iter_rows(values_only=True)
+        kolommen = [str(c) for c in next(rijen, ())]
+        blok = []
+        for rij in rijen:
+            blok.append(rij)
+            if len(blok) == blokgrootte:
+                yield pd.DataFrame(blok, columns=kolommen)
+                blok = []
+        if blok:
+            yield pd.DataFrame(blok, columns=kolommen)
+    finally:
+        wb.close()
+
+
+def verwerk_blok(df: pd.DataFrame, params: Parameterset = STANDAARD) -> pd.DataFrame:
+    """Berekent nettoloon en loonkost voor één blok → invoer + resultaatkolommen."""
+    netto, kost = Personeelsbestand.uit_dataframe(df).bereken(params)
+    return pd.concat([df, netto.naar_dataframe(df.index), kost.naar_dataframe(df.index)], axis=1)
+
+
+def verwerk_bestand(invoer: str, uitvoer: str, blokgrootte: int = STANDAARD_BLOKGROOTTE,
+                    sep: str = ",", log=sys.stderr, params: Parameterset = STANDAARD, bladen: bool = False) -> int:
+    """
+    Verwerkt invoer → uitvoer blok per blok en rapporteert de doorvoer.
+    Standaard één CSV met invoer + resultaatkolommen; met bladen=True (of een
+    .xlsx-uitvoer) aparte bladen netto/loonkost/samenvatting via StreamExport.
+    Geeft het totaal aantal verwerkte rijen terug.
+    """
+    bladen = bladen or uitvoer.lower().endswith(".xlsx")
+    if bladen:
+        from payroll.export import StreamExport
+        export = StreamExport(uitvoer, sep=sep)
+    else:
+        export = nullcontext()
+
+    totaal = 0
+    start = time.perf_counter()
+    with export:
+        for i, blok in enumerate(lees_in_blokken(invoer, blokgrootte, sep)):
+            t0 = time.perf_counter()
+            if bladen:
+                pb = Personeelsbestand.uit_dataframe(blok)
+                netto, kost = pb.bereken(params)
+                export.schrijf_blok(blok, netto, kost, pb.regime_code)
+            else:
+                verwerk_blok(blok, params).to_csv(uitvoer, mode="w" if i == 0 else "a", header=(i == 0), index=False,
+                                                  sep=sep)
+            totaal += len(blok)
+            duur = time.perf_counter() - t0
+            if log is not None:
+                print(f"blok {i + 1}: {len(blok):,} rijen in {duur:.2f}s ({len(blok) / max(duur, 1e-9):,.0f} rijen/s)",
+                      file=log)
+
+    duur = time.perf_counter() - start
+    if log is not None:
+        print(f"✅ {totaal:,} rijen in {duur:.2f}s ({totaal / max(duur, 1e-9):,.0f} rijen/s) → {uitvoer}", file=log)
+    return totaal
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m payroll.batch",
+        description="Bereken nettoloon en loonkost voor een personeelsbestand (CSV/Excel) in blokken.",
+    )
+    parser.add_argument("invoer", help="CSV- of Excel-bestand met één rij per werknemer")
+    parser.add_argument("uitvoer", help="CSV- of Excel-bestand (.xlsx) voor de resultaten")
+    parser.add_argument("--blok", type=int, default=STANDAARD_BLOKGROOTTE, help="aantal rijen per blok")
+    parser.add_argument("--sep", default=",", help="scheidingsteken voor CSV (standaard ',')")
+    parser.add_argument("--bladen", action="store_true",
+                        help="CSV: aparte bestanden netto/loonkost/samenvatting (bij .xlsx altijd)")
+    parser.add_argument("--meting", nargs="?", const="", metavar="JSON",
+                        help="tijd per rekenstap meten en tonen (optioneel ook als JSON wegschrijven)")
+    parser.add_argument("--jaar", type=int, default=STANDAARD_JAAR, help=f"parameterjaar (standaard {STANDAARD_JAAR})")
+    args = parser.parse_args(argv)
+
+    if args.blok <= 0:
+        parser.error("--blok moet positief zijn")
+    try:
+        params = laad_parameters(args.jaar)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.meting is None:
+        verwerk_bestand(args.invoer, args.uitvoer, args.blok, args.sep, params=params, bladen=args.bladen)
+        return
+
+    from payroll.meting import meet
+    with meet() as m:
+        verwerk_bestand(args.invoer, args.uitvoer, args.blok, args.sep, params=params, bladen=args.bladen)
+    print(m.tabel(), file=sys.stderr)
+    if args.meting:
+        m.naar_json(args.meting)
+
+
+if __name__ == "__main__":
+    main()
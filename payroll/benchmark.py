@@ -0,0 +1,235 @@
+# payroll/benchmark.py
+#
+# Reproduceerbare benchmarksuite voor de rekenketen.
+#
+# 1️⃣ Microbenchmarks per functie (timeit): bereken_personenbelasting,
+#    bereken_bszb (per regime), bereken_sociale_werkbonus, bereken_R,
+#    bereken_nettoloon, bereken_loonkost en maak_overzicht.
+# 2️⃣ End-to-end: synthetische personeelsbestanden van 1 / 10k / 1M werknemers
+#    × de drie BBSZ-regimes × enkele prestatiebreuken, gevectoriseerd via
+#    Personeelsbestand.bereken(), met de centenmotor (payroll/centen.py) en
+#    (tot 10k rijen) ook scalair per Bediende.
+#
+# De invoer is deterministisch (vaste seed); resultaten gaan naar JSON zodat
+# runs onderling vergeleken kunnen worden:
+#
+#   python -m payroll.benchmark -o bench.json
+#   python -m payroll.benchmark --aantallen 1 10000 --vergelijk bench.json
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+import timeit
+from datetime import datetime
+
+import numpy as np
+
+from parameters.bszb_2025 import REGIMES, bereken_bszb
+from parameters.belasting_2025 import bereken_personenbelasting
+from parameters.werkbonus_2025 import bereken_sociale_werkbonus
+from parameters.structurele_vermindering_2025 import bereken_R
+from parameters.register import STANDAARD_JAAR, laad_parameters
+from payroll.werknemer import Bediende
+from payroll.nettoloon import bereken_nettoloon
+from payroll.loonkost import bereken_loonkost
+from payroll.personeelsbestand import Personeelsbestand
+from payroll.centen import bereken_batch_centen
+
+STANDAARD_AANTALLEN = (1, 10_000, 1_000_000)
+STANDAARD_PRESTATIEBREUKEN = (1.0, 0.8, 0.5)
+SCALAIR_MAX = 10_000   # boven dit aantal wordt de scalaire lus overgeslagen
+SEED = 2025
+
+
+# -----------------------
+# Invoer
+# -----------------------
+def synthetisch_bestand(n: int, regime: str = "individueel", prestatiebreuk: float = 1.0,
+                        seed: int = SEED) -> Personeelsbestand:
+    """Deterministisch personeelsbestand met realistische spreiding van lonen en voordelen."""
+    rng = np.random.default_rng(seed)
+    bruto = np.round(rng.lognormal(np.log(3500.0), 0.35, n).clip(1_500.0, 15_000.0), 2)
+    heeft_mc = rng.random(n) < 0.8
+    return Personeelsbestand(
+        bruto_maandloon=bruto,
+        prestatiebreuk=prestatiebreuk,
+        MG_WG_jaar=np.where(heeft_mc, 220 * 6.91, 0.0),
+        MG_WN_jaar=np.where(heeft_mc, 220 * 1.09, 0.0),
+        EC_jaar=np.where(rng.random(n) < 0.6, 250.0, 0.0),
+        GV_WG_pct=np.where(rng.random(n) < 0.5, 0.03, 0.0),
+        AO_pct=0.01,
+        maandelijkse_kostenvergoeding=np.where(rng.random(n) < 0.4, 150.0, 0.0),
+        regime=regime,
+    )
+
+
+# -----------------------
+# Meting
+# -----------------------
+def _meet(functie, herhalingen: int = 5) -> dict:
+    """timeit met automatisch bepaald aantal aanroepen; tijden per aanroep in µs."""
+    timer = timeit.Timer(functie)
+    aantal, _ = timer.autorange()
+    tijden = [t / aantal * 1e6 for t in timer.repeat(repeat=herhalingen, number=aantal)]
+    return {"aanroepen": aantal, "min_us": min(tijden), "mediaan_us": statistics.median(tijden)}
+
+
+def microbenchmarks(herhalingen: int = 5) -> list:
+    b = Bediende(3500.0, 1.0, 220 * 6.91, 220 * 1.09, 250.0, 0.03, 0.01, 150.0, "individueel")
+    netto = bereken_nettoloon(b)
+    gevallen = [
+        ("bereken_personenbelasting", {}, lambda: bereken_personenbelasting(38_000.0)),
+        *[
+            ("bereken_bszb", {"regime": r}, lambda r=r: bereken_bszb(3500.0, r))
+            for r in REGIMES
+        ],
+        ("bereken_sociale_werkbonus", {}, lambda: bereken_sociale_werkbonus(2500.0)),
+        ("bereken_R", {}, lambda: bereken_R(1, 3500.0, 1.0)),
+        ("bereken_nettoloon", {}, lambda: bereken_nettoloon(b)),
+        ("bereken_loonkost", {}, lambda: bereken_loonkost(b, netto)),
+    ]
+    try:
+        from payroll.overzicht import maak_overzicht
+        gevallen.append(("maak_overzicht", {}, lambda: maak_overzicht(b)))
+    except ImportError:  # pandas ontbreekt
+        pass
+
+    resultaten = []
+    for naam, extra, functie in gevallen:
+        resultaten.append({"functie": naam, **extra, **_meet(functie, herhalingen)})
+    return resultaten
+
+
+def end_to_end(aantallen=STANDAARD_AANTALLEN, prestatiebreuken=STANDAARD_PRESTATIEBREUKEN,
+               herhalingen: int = 3) -> list:
+    resultaten = []
+    for n in aantallen:
+        for regime in REGIMES:
+            for mu in prestatiebreuken:
+                pb = synthetisch_bestand(n, regime, mu)
+                pb.bereken()  # opwarmen
+                tijden = []
+                for _ in range(herhalingen):
+                    t0 = time.perf_counter()
+                    netto, kost = pb.bereken()
+                    tijden.append(time.perf_counter() - t0)
+                duur = min(tijden)
+                r = {
+                    "werknemers": n, "regime": regime, "prestatiebreuk": mu,
+                    "vectorieel_s": duur, "vectorieel_rijen_per_s": n / duur,
+                    # controlegetal: wijzigt enkel als de uitkomsten wijzigen
+                    "som_loonkost_maand": round(float(kost["totaal_loonkost_maand"].sum()), 2),
+                }
+                tijden = []
+                for _ in range(herhalingen):
+                    t0 = time.perf_counter()
+                    bereken_batch_centen(regime=pb.regime_code, **pb.kolommen)
+                    tijden.append(time.perf_counter() - t0)
+                r["centen_s"] = min(tijden)
+                r["centen_rijen_per_s"] = n / r["centen_s"]
+                if n <= SCALAIR_MAX:
+                    bedienden = [pb[i].naar_bediende() for i in range(n)]
+                    tijden = []
+                    for _ in range(herhalingen):
+                        t0 = time.perf_counter()
+                        for b in bedienden:
+                            bereken_loonkost(b, bereken_nettoloon(b))
+                        tijden.append(time.perf_counter() - t0)
+                    duur = min(tijden)
+                    r["scalair_s"] = duur
+                    r["scalair_rijen_per_s"] = n / duur
+                resultaten.append(r)
+    return resultaten
+
+
+def _omgeving() -> dict:
+    return {
+        "tijdstip": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "parameterjaar": laad_parameters(STANDAARD_JAAR).jaar,
+        "seed": SEED,
+    }
+
+
+def voer_uit(aantallen=STANDAARD_AANTALLEN, prestatiebreuken=STANDAARD_PRESTATIEBREUKEN,
+             micro: bool = True, herhalingen: int = 3) -> dict:
+    return {
+        "omgeving": _omgeving(),
+        "micro": microbenchmarks() if micro else [],
+        "end_to_end": end_to_end(aantallen, prestatiebreuken, herhalingen),
+    }
+
+
+# -----------------------
+# Vergelijken
+# -----------------------
+def vergelijk(oud: dict, nieuw: dict) -> list:
+    """Verhouding nieuw/oud per meting (> 1 = trager). Enkel metingen die in beide runs voorkomen."""
+    rijen = []
+    oud_micro = {(m["functie"], m.get("regime")): m for m in oud.get("micro", [])}
+    for m in nieuw.get("micro", []):
+        o = oud_micro.get((m["functie"], m.get("regime")))
+        if o:
+            naam = m["functie"] + (f"[{m['regime']}]" if m.get("regime") else "")
+            rijen.append((naam, o["min_us"], m["min_us"], m["min_us"] / o["min_us"]))
+    oud_e2e = {(r["werknemers"], r["regime"], r["prestatiebreuk"]): r for r in oud.get("end_to_end", [])}
+    for r in nieuw.get("end_to_end", []):
+        o = oud_e2e.get((r["werknemers"], r["regime"], r["prestatiebreuk"]))
+        if o:
+            naam = f"batch n={r['werknemers']} {r['regime']} µ={r['prestatiebreuk']}"
+            rijen.append((naam, o["vectorieel_s"] * 1e6, r["vectorieel_s"] * 1e6, r["vectorieel_s"] / o["vectorieel_s"]))
+    return rijen
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m payroll.benchmark",
+        description="Micro- en end-to-end benchmarks van de looncalculator.",
+    )
+    parser.add_argument("-o", "--uitvoer", default="benchmark.json", help="JSON-bestand voor de resultaten")
+    parser.add_argument("--aantallen", type=int, nargs="+", default=list(STANDAARD_AANTALLEN),
+                        help="aantallen werknemers voor de end-to-end runs")
+    parser.add_argument("--prestatiebreuken", type=float, nargs="+", default=list(STANDAARD_PRESTATIEBREUKEN))
+    parser.add_argument("--herhalingen", type=int, default=3, help="herhalingen per end-to-end run (minimum telt)")
+    parser.add_argument("--geen-micro", action="store_true", help="microbenchmarks overslaan")
+    parser.add_argument("--vergelijk", metavar="JSON", help="vorige run om mee te vergelijken")
+    args = parser.parse_args(argv)
+
+    # Vorige run eerst inlezen: --vergelijk mag hetzelfde bestand zijn als --uitvoer
+    oud = None
+    if args.vergelijk:
+        try:
+            with open(args.vergelijk, encoding="utf-8") as f:
+                oud = json.load(f)
+        except (OSError, ValueError) as e:
+            parser.error(f"--vergelijk {args.vergelijk}: {e}")
+
+    resultaat = voer_uit(args.aantallen, args.prestatiebreuken, not args.geen_micro, args.herhalingen)
+    with open(args.uitvoer, "w", encoding="utf-8") as f:
+        json.dump(resultaat, f, indent=2)
+
+    for m in resultaat["micro"]:
+        naam = m["functie"] + (f"[{m['regime']}]" if m.get("regime") else "")
+        print(f"{naam:<50} {m['min_us']:10.2f} µs")
+    for r in resultaat["end_to_end"]:
+        naam = f"n={r['werknemers']:,} {r['regime']} µ={r['prestatiebreuk']}"
+        scalair = f"  scalair {r['scalair_rijen_per_s']:>12,.0f} rijen/s" if "scalair_s" in r else ""
+        print(f"{naam:<50} {r['vectorieel_rijen_per_s']:>14,.0f} rijen/s"
+              f"  centen {r['centen_rijen_per_s']:>14,.0f} rijen/s{scalair}")
+    print(f"✅ resultaten → {args.uitvoer}", file=sys.stderr)
+
+    if oud is not None:
+        print("\nVergelijking (nieuw/oud, > 1 = trager):")
+        for naam, o, n, verhouding in vergelijk(oud, resultaat):
+            teken = "🔺" if verhouding > 1.10 else ("🔻" if verhouding < 0.90 else "  ")
+            print(f"{teken} {naam:<50} {verhouding:6.2f}×")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+# payroll/cache.py
+#
+# Begrensde LRU-cache voor de berekeningen van één bediende.
+# De sleutel is de tuple van alle invoervelden van Bediende plus de
+# parameterset (op identiteit, zodat ook een aangepaste set van hetzelfde
+# jaar een eigen resultaat krijgt); bij een volle
+# cache verdwijnt het langst niet gebruikte resultaat. Thread-safe, zodat
+# één instantie gedeeld kan worden door alle Streamlit-sessies.
+
+import threading
+from collections import OrderedDict
+
+from parameters.register import Parameterset, STANDAARD
+from payroll.werknemer import Bediende
+from payroll.nettoloon import bereken_nettoloon
+from payroll.loonkost import bereken_loonkost
+
+STANDAARD_GROOTTE = 512
+
+
+def sleutel(b: Bediende) -> tuple:
+    """Hashbare sleutel op basis van alle invoervelden van de bediende."""
+    return tuple(getattr(b, k) for k in Bediende.__slots__)
+
+
+class BerekeningCache:
+    """
+    LRU-cache vóór maak_overzicht / bereken_nettoloon / bereken_loonkost.
+
+    De teruggegeven dicts en DataFrames zijn kopieën: aanpassen door de
+    aanroeper verandert de cache niet.
+    """
+
+    def __init__(self, maxsize: int = STANDAARD_GROOTTE):
+        if maxsize <= 0:
+            raise ValueError("maxsize moet positief zijn")
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self._parametersets = {}    # id → set: sterke referentie, zodat een id niet hergebruikt wordt
+        self.hits = 0
+        self.misses = 0
+
+    def _haal(self, key, bereken):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+
+        # Buiten de lock rekenen: andere sessies worden niet geblokkeerd
+        waarde = bereken()
+
+        with self._lock:
+            self._data[key] = waarde
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return waarde
+
+    def _params(self, params: Parameterset) -> int:
+        """Sleutel voor een parameterset (Parameterset is niet hashbaar: MappingProxyType-velden)."""
+        self._parametersets.setdefault(id(params), params)
+        return id(params)
+
+    # -----------------------
+    # Berekeningen
+    # -----------------------
+    def nettoloon(self, b: Bediende, params: Parameterset = STANDAARD) -> dict:
+        return dict(self._haal(("netto", sleutel(b), self._params(params)), lambda: bereken_nettoloon(b, params)))
+
+    def loonkost(self, b: Bediende, categorie: int = 1, RSZ_WG_PCT: float = 0.25,
+                 params: Parameterset = STANDAARD) -> dict:
+        kost = self._haal(
+            ("kost", sleutel(b), categorie, RSZ_WG_PCT, self._params(params)),
+            lambda: bereken_loonkost(b, self.nettoloon(b, params), categorie, RSZ_WG_PCT, params),
+        )
+        return dict(kost)
+
+    def overzicht(self, b: Bediende, toon_per_maand: bool = True, params: Parameterset = STANDAARD):
+        """Zelfde resultaat als maak_overzicht: (df, netto, kost)."""
+        from payroll.overzicht import maak_overzicht  # pandas pas laden wanneer nodig
+        df, netto, kost = self._haal(("overzicht", sleutel(b), toon_per_maand, self._params(params)),
+                                     lambda: maak_overzicht(b, toon_per_maand, params))
+        return df.copy(), dict(netto), dict(kost)
+
+    # -----------------------
+    # Beheer
+    # -----------------------
+    def wis(self):
+        with self._lock:
+            self._data.clear()
+            self._parametersets.clear()
+            self.hits = self.misses = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    @property
+    def statistieken(self) -> dict:
+        totaal = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / totaal if totaal else 0.0,
+            "grootte": len(self._data),
+            "maxsize": self.maxsize,
+        }
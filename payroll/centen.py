@@ -0,0 +1,429 @@
+# payroll/centen.py
+#
+# Exacte rekenmotor in gehele centen (int64), scalair en gevectoriseerd.
+#
+# De float-motor (nettoloon.py, loonkost.py, vectorieel.py) rekent in euro's
+# en rondt af met round(x + 1e-9, 2). Bij bedragen die exact op een halve
+# cent vallen hangt de uitkomst daar af van de binaire voorstelling en van de
+# epsilon. Deze motor volgt dezelfde formules en dezelfde afrondingspunten,
+# maar uitsluitend met gehele getallen:
+#
+# - bedragen in centen; tarieven, percentages en prestatiebreuk in
+#   tienduizendsten (1 = 0,01 %, zoals in alle parameters)
+# - tussenresultaten (bv. bruto × 13,07 %) in 10⁻⁴ cent ("e"), zodat
+#   bedrag × tarief exact blijft; een tarief × een tussenresultaat wordt
+#   op 1 e afgerond
+# - afronden op de cent (of op 1 e) gebeurt steeds half weg van nul
+#   (Belgische regel: 0,5 cent → 1 cent, -0,5 cent → -1 cent)
+#
+# Invoer in euro wordt één keer omgezet naar centen resp. tienduizendsten
+# (|x| × schaal, ontdaan van binaire ruis, + 0,5, naar beneden, met teken).
+# Daarna zijn alle bewerkingen integer, dus bit-voor-bit reproduceerbaar op
+# elke machine; scalair (Python int) en NumPy (int64) geven identieke
+# resultaten. Met deze schalen past
+# bedrag × tarief zonder overloop in int64 tot ± 10 miljoen € bruto per maand.
+
+import math
+from decimal import Decimal
+from types import MappingProxyType
+
+import numpy as np
+
+from parameters.register import Parameterset, STANDAARD
+from parameters.structuren import (
+    AfbouwLuik, Belasting, Bszb, BszbGemeenschappelijk, BszbIndividueel, StructureleCategorie, Werkbonus,
+)
+from payroll.nettoloon import RSZ_WERKNEMER_PERCENT
+from payroll.vectorieel import regime_codes
+
+E = 10_000                  # e per cent, en schaal voor tarieven (1/10 000)
+KOSTENFORFAIT_TARIEF = 3_000  # 30 % (zie bereken_nettoloon)
+_RUIS = 6                   # decimalen waarop euro × schaal eerst afgerond wordt (binaire ruis weg)
+
+
+# -----------------------
+# Omzetting
+# -----------------------
+def _exact(x, schaal: int) -> int:
+    """Parameterwaarde → geheel getal op de gegeven schaal; weigert waarden die niet exact passen."""
+    d = Decimal(repr(float(x))) * schaal
+    if d != d.to_integral_value():
+        raise ValueError(f"{x} is niet exact voor te stellen op schaal 1/{schaal}")
+    return int(d)
+
+
+def naar_centen(x, schaal: int = 100):
+    """
+    Euro (of fractie) → gehele eenheden op `schaal`, half weg van nul. Scalar → int, array → int64.
+    Het product wordt eerst op 10⁻⁶ eenheid afgerond: 1.005 × 100 = 100.49999999999999 in binair
+    is bedoeld als 100,5 en wordt dus 101.
+    """
+    if isinstance(x, (float, int)) or np.ndim(x) == 0 and not isinstance(x, np.ndarray):
+        v = math.floor(float(np.round(abs(float(x)) * schaal, _RUIS)) + 0.5)
+        return -v if x < 0 else v
+    a = np.asarray(x, dtype=np.float64)
+    return (np.sign(a) * np.floor(np.round(np.abs(a) * schaal, _RUIS) + 0.5)).astype(np.int64)
+
+
+def naar_euro(resultaat: dict) -> dict:
+    """Dict met centen (ints of int64-arrays) → euro's (floats of float64-arrays)."""
+    return {k: (v / 100.0 if isinstance(v, np.ndarray) else v / 100) for k, v in resultaat.items()}
+
+
+_GECOMPILEERD = {}
+
+
+def compileer_centen(params: Parameterset = STANDAARD) -> Parameterset:
+    """
+    Zelfde Parameterset, maar met bedragen in centen en tarieven in tienduizendsten.
+    Wordt per parameterset één keer opgebouwd.
+    """
+    bestaand = _GECOMPILEERD.get(id(params))
+    if bestaand is not None and bestaand[0] is params:
+        return bestaand[1]
+
+    def c(x):
+        return _exact(x, 100)
+
+    def t(x):
+        return _exact(x, E)
+
+    def luik(l: AfbouwLuik):
+        return AfbouwLuik(c(l.S_max), c(l.bedrag), c(l.S_afbouw_max), t(l.afbouw_coef))
+
+    pc = params.bszb.percentages
+    g, i = pc["gemeenschappelijk_met_inkomen"], pc["individueel"]
+    gz = pc["gemeenschappelijk_zonder_inkomen"]
+
+    def gemeenschappelijk(p: BszbGemeenschappelijk):
+        return BszbGemeenschappelijk(t(p.zone2_pct), c(p.zone3_basis_q), t(p.zone3_pct), c(p.max_q),
+                                     c(p.zone1_q), c(p.min_q))
+
+    B = params.bszb
+    gecompileerd = Parameterset(
+        jaar=params.jaar,
+        belasting=Belasting(
+            tuple((None if math.isinf(grens) else c(grens) * E, t(tarief)) for grens, tarief in params.belasting.schijven),
+            c(params.belasting.kostenforfait_plafond),
+        ),
+        werkbonus=MappingProxyType({
+            cat: Werkbonus(luik(w.luikA), luik(w.luikB), t(w.fiscale_pct_luikA), t(w.fiscale_pct_luikB))
+            for cat, w in params.werkbonus.items()
+        }),
+        bszb=Bszb(
+            *(c(x) for x in (B.g1, B.g2, B.g3, B.g4, B.g5, B.k1, B.k2, B.k3, B.k4, B.k5, B.k6)),
+            percentages=MappingProxyType({
+                "gemeenschappelijk_met_inkomen": gemeenschappelijk(g),
+                "gemeenschappelijk_zonder_inkomen": gemeenschappelijk(gz),
+                "individueel": BszbIndividueel(t(i.z2_pct), c(i.z3_q), t(i.z3_pct), c(i.z4_q), t(i.z4_pct),
+                                               c(i.z5_q), t(i.z5_pct), c(i.z6_q)),
+            }),
+        ),
+        structureel=MappingProxyType({
+            cat: StructureleCategorie(c(p.F), t(p.alpha), t(p.gamma), t(p.delta), c(p.S0), c(p.S2),
+                                      None if p.S1 is None else c(p.S1))
+            for cat, p in params.structureel.items()
+        }),
+    )
+    _GECOMPILEERD[id(params)] = (params, gecompileerd)
+    return gecompileerd
+
+
+RSZ_WN_TARIEF = _exact(RSZ_WERKNEMER_PERCENT, E)
+
+
+# -----------------------
+# Afronden (half weg van nul)
+# -----------------------
+def _deel(a: int, d: int) -> int:
+    """a / d afgerond op een geheel getal, half weg van nul (d > 0)."""
+    if a >= 0:
+        return (2 * a + d) // (2 * d)
+    return -((-2 * a + d) // (2 * d))
+
+
+def _maal(x: int, r: int) -> int:
+    """x × r / E (r in tienduizendsten), afgerond half weg van nul."""
+    return _deel(x * r, E)
+
+
+def _deel_vec(a, d: int):
+    t = 2 * a
+    negatief = t < 0
+    np.negative(t, out=t, where=negatief)
+    t += d
+    t //= 2 * d
+    np.negative(t, out=t, where=negatief)
+    return t
+
+
+def _maal_vec(x, r):
+    return _deel_vec(x * r, E)
+
+
+# -----------------------
+# Scalair
+# -----------------------
+def _afbouw(S: int, l: AfbouwLuik) -> int:
+    if S <= l.S_max:
+        return l.bedrag
+    if S <= l.S_afbouw_max:
+        return max(0, _deel(l.bedrag * E - l.afbouw_coef * (S - l.S_max), E))
+    return 0
+
+
+def _personenbelasting_uc(belastbaar: int, schijven) -> int:
+    belasting = 0
+    vorige = 0
+    for grens, tarief in schijven:
+        deel = (belastbaar if grens is None else min(belastbaar, grens)) - vorige
+        if deel > 0:
+            belasting += _maal(deel, tarief)
+        if grens is None or belastbaar <= grens:
+            break
+        vorige = grens
+    return belasting
+
+
+def _bszb_uc(S: int, regime: str, P: Bszb) -> int:
+    """Kwartaalbijdrage in e (10⁻⁴ cent)."""
+    K = 3 * S
+    p = P.percentages[regime]
+
+    def within(lo, hi):
+        return max(0, min(S, hi) - lo)
+
+    if regime == "individueel":
+        if P.k2 <= K <= P.k3:
+            return within(P.g1, P.g2) * p.z2_pct
+        if P.k3 < K <= P.k4:
+            return p.z3_q * E + within(P.g2, P.g3) * p.z3_pct
+        if P.k4 < K <= P.k5:
+            return p.z4_q * E + within(P.g3, P.g4) * p.z4_pct
+        if P.k5 < K <= P.k6:
+            return p.z5_q * E + within(P.g4, P.g5) * p.z5_pct
+        if K > P.k6:
+            return p.z6_q * E
+        return 0
+
+    if regime == "gemeenschappelijk_met_inkomen" and P.k1 <= K < P.k2:
+        return p.zone1_q * E
+    if P.k2 <= K <= P.k3:
+        return max(p.min_q * E, within(P.g1, P.g2) * p.zone2_pct)
+    if K > P.k3:
+        return min(p.zone3_basis_q * E + max(0, S - P.g2) * p.zone3_pct, p.max_q * E)
+    return 0
+
+
+def _structurele_vermindering_maand(S: int, mu: int, p: StructureleCategorie) -> int:
+    """Structurele vermindering per maand in centen (S in centen, mu in tienduizendsten)."""
+    S_ref = 3 * S * mu  # refertekwartaalloon in e
+    R = p.F + max(0, _deel(_maal(p.S0 * E - S_ref, p.alpha), E)) + max(0, _deel(_maal(p.S2 * E - S_ref, p.gamma), E))
+    if mu >= 9_000:
+        return _deel(R, 3)                    # βs = 1/µ → Ps = R / 3
+    # βs in 10⁻⁸ (exact: 1,18 + (µ - 0,55) × 0,28 met µ in tienduizendsten)
+    beta = 118_000_000 if mu < 5_500 else 118_000_000 + (mu - 5_500) * 2_800
+    return _deel(R * mu * beta, 3 * E * E * E)
+
+
+def bereken_nettoloon_centen(b, params: Parameterset = STANDAARD) -> dict:
+    """Zelfde velden als bereken_nettoloon, in gehele centen."""
+    P = compileer_centen(params)
+    S = naar_centen(b.bruto_maandloon)
+    bj = 12 * S
+
+    wb = P.werkbonus["bedienden"]
+    A, B = _afbouw(S, wb.luikA), _afbouw(S, wb.luikB)
+    sociale = A + B
+    fiscale = _deel(A * wb.fiscale_pct_luikA, E) + _deel(B * wb.fiscale_pct_luikB, E)
+
+    rsz_wn = bj * RSZ_WN_TARIEF - sociale * E
+    kostenforfait = min(P.belasting.kostenforfait_plafond * E, _maal(bj * E - rsz_wn, KOSTENFORFAIT_TARIEF))
+    belastbaar = bj * E - rsz_wn - kostenforfait
+    personenbelasting = _deel(_personenbelasting_uc(belastbaar, P.belasting.schijven), E) - fiscale
+    bbsz = 12 * _deel(_bszb_uc(S, b.regime, P.bszb), 3 * E)
+
+    netto_jaar = bj * E - rsz_wn - personenbelasting * E - bbsz * E - naar_centen(b.MG_WN_jaar) * E
+    koopkracht_jaar = netto_jaar + (
+        naar_centen(b.MG_WG_jaar) + naar_centen(b.EC_jaar) + 12 * naar_centen(b.maandelijkse_kostenvergoeding)
+    ) * E
+    return {
+        "bruto_maand": S, "bruto_jaar": bj,
+        "rsz_werknemer": _deel(rsz_wn, E),
+        "sociale_werkbonus": sociale, "fiscale_werkbonus": fiscale,
+        "kostenforfait": _deel(kostenforfait, E), "belastbaar_inkomen": _deel(belastbaar, E),
+        "personenbelasting": personenbelasting, "bbsz": bbsz,
+        "nettoloon_maand": _deel(netto_jaar, 12 * E), "nettoloon_jaar": _deel(netto_jaar, E),
+        "koopkracht_maand": _deel(koopkracht_jaar, 12 * E), "koopkracht_jaar": _deel(koopkracht_jaar, E),
+    }
+
+
+def bereken_loonkost_centen(b, nettoloon_result: dict = None, categorie: int = 1, RSZ_WG_PCT: float = 0.25,
+                            params: Parameterset = STANDAARD) -> dict:
+    """Zelfde velden als bereken_loonkost, in gehele centen."""
+    P = compileer_centen(params)
+    S = naar_centen(b.bruto_maandloon)
+    bj = 12 * S
+
+    rsz_wg = bj * naar_centen(RSZ_WG_PCT, E)
+    gv = bj * naar_centen(b.GV_WG_pct, E)
+    ao = bj * naar_centen(b.AO_pct, E)
+    mg_wg = naar_centen(b.MG_WG_jaar)
+    ec = naar_centen(b.EC_jaar)
+    kosten_eigen = 12 * naar_centen(b.maandelijkse_kostenvergoeding)
+
+    sv = 12 * _structurele_vermindering_maand(S, naar_centen(b.prestatiebreuk, E), P.structureel[categorie])
+    sv = min(sv * E, rsz_wg)
+
+    totaal = bj * E + rsz_wg + gv + ao + (mg_wg + ec + kosten_eigen) * E - sv
+    return {
+        "rsz_werkgever": _deel(rsz_wg - sv, E),
+        "gv_werkgever": _deel(gv, E),
+        "ao_verzekering": _deel(ao, E),
+        "maaltijdcheques_wg": mg_wg,
+        "ecocheques": ec,
+        "kosten_eigen": kosten_eigen,
+        "totaal_loonkost_jaar": _deel(totaal, E),
+        "totaal_loonkost_maand": _deel(totaal, 12 * E),
+    }
+
+
+# -----------------------
+# Gevectoriseerd (int64)
+# -----------------------
+def _afbouw_vec(S, l: AfbouwLuik):
+    afbouw = np.maximum(0, _deel_vec(l.bedrag * E - l.afbouw_coef * (S - l.S_max), E))
+    return np.where(S <= l.S_max, l.bedrag, np.where(S <= l.S_afbouw_max, afbouw, 0))
+
+
+def _personenbelasting_uc_vec(belastbaar, schijven):
+    belasting = np.zeros_like(belastbaar)
+    vorige = 0
+    for grens, tarief in schijven:
+        boven = belastbaar if grens is None else np.minimum(belastbaar, grens)
+        belasting += _maal_vec(np.maximum(boven - vorige, 0), tarief)
+        if grens is None:
+            break
+        vorige = grens
+    return belasting
+
+
+def _bszb_uc_vec(S, codes, P: Bszb):
+    K = 3 * S
+
+    def within(lo, hi):
+        return np.maximum(0, np.minimum(S, hi) - lo)
+
+    zone2 = (P.k2 <= K) & (K <= P.k3)
+    boven3 = K > P.k3
+    base12 = within(P.g1, P.g2)
+    excedent = np.maximum(0, S - P.g2)
+
+    p = P.percentages["gemeenschappelijk_met_inkomen"]
+    q_met = np.select(
+        [(P.k1 <= K) & (K < P.k2), zone2, boven3],
+        [p.zone1_q * E, np.maximum(p.min_q * E, base12 * p.zone2_pct),
+         np.minimum(p.zone3_basis_q * E + excedent * p.zone3_pct, p.max_q * E)],
+        0,
+    )
+    p = P.percentages["gemeenschappelijk_zonder_inkomen"]
+    q_zonder = np.select(
+        [zone2, boven3],
+        [base12 * p.zone2_pct, np.minimum(p.zone3_basis_q * E + excedent * p.zone3_pct, p.max_q * E)],
+        0,
+    )
+    p = P.percentages["individueel"]
+    q_ind = np.select(
+        [zone2, (P.k3 < K) & (K <= P.k4), (P.k4 < K) & (K <= P.k5), (P.k5 < K) & (K <= P.k6), K > P.k6],
+        [base12 * p.z2_pct,
+         p.z3_q * E + within(P.g2, P.g3) * p.z3_pct,
+         p.z4_q * E + within(P.g3, P.g4) * p.z4_pct,
+         p.z5_q * E + within(P.g4, P.g5) * p.z5_pct,
+         np.full_like(S, p.z6_q * E)],
+        0,
+    )
+    return np.choose(codes, [q_ind, q_met, q_zonder])  # volgorde van REGIMES
+
+
+def _structurele_vermindering_maand_vec(S, mu, p: StructureleCategorie):
+    S_ref = 3 * S * mu
+    R = (p.F + np.maximum(0, _deel_vec(_maal_vec(p.S0 * E - S_ref, p.alpha), E))
+         + np.maximum(0, _deel_vec(_maal_vec(p.S2 * E - S_ref, p.gamma), E)))
+    beta = np.where(mu < 5_500, 118_000_000, 118_000_000 + (mu - 5_500) * 2_800)
+    return np.where(mu >= 9_000, _deel_vec(R, 3), _deel_vec(R * mu * beta, 3 * E * E * E))
+
+
+def bereken_batch_centen(
+    bruto_maandloon,
+    prestatiebreuk=1.0,
+    MG_WG_jaar=0.0,
+    MG_WN_jaar=0.0,
+    EC_jaar=0.0,
+    GV_WG_pct=0.0,
+    AO_pct=0.0,
+    maandelijkse_kostenvergoeding=0.0,
+    regime="individueel",
+    categorie: int = 1,
+    RSZ_WG_PCT: float = 0.25,
+    params: Parameterset = STANDAARD,
+):
+    """
+    Gevectoriseerde bereken_nettoloon_centen + bereken_loonkost_centen.
+    Invoer in euro (zoals bij bereken_batch); geeft (netto, kost) als dicts
+    van int64-arrays in centen, identiek aan de scalaire functies.
+    """
+    P = compileer_centen(params)
+    S = np.atleast_1d(naar_centen(bruto_maandloon))
+    n = S.shape[0]
+
+    def kol(x, schaal=100):
+        return np.broadcast_to(naar_centen(np.asarray(x, dtype=np.float64), schaal), (n,))
+
+    bj = 12 * S
+    mg_wn, mg_wg, ec = kol(MG_WN_jaar), kol(MG_WG_jaar), kol(EC_jaar)
+    kosten_eigen = 12 * kol(maandelijkse_kostenvergoeding)
+    extra = (mg_wg + ec + kosten_eigen) * E
+
+    # Nettoloon
+    wb = P.werkbonus["bedienden"]
+    A, B = _afbouw_vec(S, wb.luikA), _afbouw_vec(S, wb.luikB)
+    sociale = A + B
+    fiscale = _deel_vec(A * wb.fiscale_pct_luikA, E) + _deel_vec(B * wb.fiscale_pct_luikB, E)
+
+    rsz_wn = bj * RSZ_WN_TARIEF - sociale * E
+    kostenforfait = np.minimum(P.belasting.kostenforfait_plafond * E, _maal_vec(bj * E - rsz_wn, KOSTENFORFAIT_TARIEF))
+    belastbaar = bj * E - rsz_wn - kostenforfait
+    personenbelasting = _deel_vec(_personenbelasting_uc_vec(belastbaar, P.belasting.schijven), E) - fiscale
+    codes = np.broadcast_to(regime_codes(regime), (n,))
+    bbsz = 12 * _deel_vec(_bszb_uc_vec(S, codes, P.bszb), 3 * E)
+
+    netto_jaar = bj * E - rsz_wn - personenbelasting * E - bbsz * E - mg_wn * E
+    koopkracht_jaar = netto_jaar + extra
+    netto = {
+        "bruto_maand": S, "bruto_jaar": bj,
+        "rsz_werknemer": _deel_vec(rsz_wn, E),
+        "sociale_werkbonus": sociale, "fiscale_werkbonus": fiscale,
+        "kostenforfait": _deel_vec(kostenforfait, E), "belastbaar_inkomen": _deel_vec(belastbaar, E),
+        "personenbelasting": personenbelasting, "bbsz": bbsz,
+        "nettoloon_maand": _deel_vec(netto_jaar, 12 * E), "nettoloon_jaar": _deel_vec(netto_jaar, E),
+        "koopkracht_maand": _deel_vec(koopkracht_jaar, 12 * E), "koopkracht_jaar": _deel_vec(koopkracht_jaar, E),
+    }
+
+    # Loonkost
+    rsz_wg = bj * naar_centen(RSZ_WG_PCT, E)
+    gv = bj * kol(GV_WG_pct, E)
+    ao = bj * kol(AO_pct, E)
+    sv = 12 * _structurele_vermindering_maand_vec(S, kol(prestatiebreuk, E), P.structureel[categorie])
+    sv = np.minimum(sv * E, rsz_wg)
+    totaal = bj * E + rsz_wg + gv + ao + extra - sv
+    kost = {
+        "rsz_werkgever": _deel_vec(rsz_wg - sv, E),
+        "gv_werkgever": _deel_vec(gv, E),
+        "ao_verzekering": _deel_vec(ao, E),
+        "maaltijdcheques_wg": mg_wg.copy(),
+        "ecocheques": ec.copy(),
+        "kosten_eigen": kosten_eigen,
+        "totaal_loonkost_jaar": _deel_vec(totaal, E),
+        "totaal_loonkost_maand": _deel_vec(totaal, 12 * E),
+    }
+    return netto, kost
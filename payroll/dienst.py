@@ -0,0 +1,369 @@
+# payroll/dienst.py
+#
+# Lokale HTTP-rekendienst (enkel standaardbibliotheek + numpy, asyncio).
+#
+#   POST /nettoloon   {"bruto_maandloon": 3500, "regime": "individueel", ...}
+#   POST /loonkost    idem + optioneel "categorie", "RSZ_WG_PCT"
+#   POST /overzicht   idem + optioneel "toon_per_maand"
+#   GET  /statistieken   p50/p99-latency, batchgroottes, µs per berekening
+#
+# Velden volgen Bediende; "jaar" kiest het parameterjaar. Ongeldige invoer
+# (onbekend jaar of categorie, NaN/oneindig) → 400.
+#
+# ⚡ Micro-batching: gelijktijdige verzoeken voor nettoloon/loonkost worden
+#    verzameld en samen berekend. De batch wordt geleegd zodra de event loop
+#    de reeds binnengekomen verzoeken heeft ingelezen (of na --max-wacht-ms).
+#    Kleine batches gaan per bediende door de scalaire motor, grote batches
+#    door de gevectoriseerde; beide zijn op de cent gelijk.
+#
+#   python -m payroll.dienst --poort 8000
+#   python -m payroll.dienst --belastingtest 20000 --gelijktijdig 64
+
+import argparse
+import asyncio
+import json
+import math
+import sys
+import time
+from collections import deque
+
+import numpy as np
+
+from parameters.bszb_2025 import REGIMES
+from parameters.register import STANDAARD_JAAR, laad_parameters
+from payroll.werknemer import Bediende
+from payroll.nettoloon import bereken_nettoloon
+from payroll.loonkost import bereken_loonkost
+from payroll.vectorieel import bereken_nettoloon_batch, bereken_loonkost_batch
+from payroll.cache import BerekeningCache
+
+STANDAARD_POORT = 8000
+MAX_BATCH = 1024
+VECTOR_DREMPEL = 32        # vanaf zoveel bedienden is de gevectoriseerde motor sneller
+LATENCY_VENSTER = 100_000  # laatste N verzoeken voor p50/p99
+MAX_BODY = 1 << 20
+
+_REDENEN = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large",
+            500: "Internal Server Error"}
+_NUMERIEK = tuple(k for k in Bediende.__slots__ if k != "regime")
+
+
+class Fout(Exception):
+    """Fout in een verzoek → HTTP-status met {"fout": ...}."""
+
+    def __init__(self, status: int, bericht: str):
+        super().__init__(bericht)
+        self.status = status
+
+
+def _bediende(data: dict, extra: tuple = ()) -> Bediende:
+    if not isinstance(data, dict):
+        raise Fout(400, "verwacht een JSON-object")
+    onbekend = set(data) - set(Bediende.__slots__) - {"jaar", *extra}
+    if onbekend:
+        raise Fout(400, f"onbekende velden: {', '.join(sorted(onbekend))}")
+    if "bruto_maandloon" not in data:
+        raise Fout(400, "bruto_maandloon ontbreekt")
+    try:
+        velden = {k: float(data[k]) for k in _NUMERIEK if k in data}
+    except (TypeError, ValueError, OverflowError):
+        raise Fout(400, "numerieke velden moeten getallen zijn") from None
+    niet_eindig = [k for k, v in velden.items() if not math.isfinite(v)]
+    if niet_eindig:
+        raise Fout(400, f"velden moeten eindige getallen zijn: {', '.join(niet_eindig)}")
+    regime = data.get("regime", "individueel")
+    if regime not in REGIMES:
+        raise Fout(400, f"onbekend BBSZ-regime {regime!r}")
+    return Bediende(regime=regime, **velden)
+
+
+# -----------------------
+# Micro-batching
+# -----------------------
+class MicroBatcher:
+    """
+    Verzamelt verzoeken per (soort, jaar, categorie, RSZ_WG_PCT) en rekent ze
+    samen uit. soort "netto" → nettoloon-dict, "kost" → loonkost-dict.
+    """
+
+    def __init__(self, max_wacht: float = 0.0, max_batch: int = MAX_BATCH):
+        self.max_wacht = max_wacht
+        self.max_batch = max_batch
+        self._wachtrij = {}
+        self._gepland = False
+        self.batches = 0
+        self.berekeningen = 0
+        self.rekentijd = 0.0
+        self.grootste_batch = 0
+
+    def bereken(self, soort: str, b: Bediende, jaar: int, categorie: int = 1, RSZ_WG_PCT: float = 0.25):
+        """Geeft een future die het resultaat krijgt zodra de batch uitgerekend is."""
+        loop = asyncio.get_running_loop()
+        toekomst = loop.create_future()
+        sleutel = (soort, jaar, categorie, RSZ_WG_PCT)
+        rij = self._wachtrij.setdefault(sleutel, [])
+        rij.append((b, toekomst))
+        if len(rij) >= self.max_batch:
+            self._leeg(sleutel)
+        elif not self._gepland:
+            # call_soon: verzoeken die in dezelfde lus-iteratie binnenkomen, komen eerst aan de beurt
+            self._gepland = True
+            if self.max_wacht > 0:
+                loop.call_later(self.max_wacht, self._leeg_alles)
+            else:
+                loop.call_soon(self._leeg_alles)
+        return toekomst
+
+    def _leeg_alles(self):
+        self._gepland = False
+        for sleutel in list(self._wachtrij):
+            self._leeg(sleutel)
+
+    def _leeg(self, sleutel):
+        rij = self._wachtrij.pop(sleutel, None)
+        if not rij:
+            return
+        soort, jaar, categorie, RSZ_WG_PCT = sleutel
+        t0 = time.perf_counter()
+        try:
+            resultaten = _bereken_batch(soort, [b for b, _ in rij], laad_parameters(jaar), categorie, RSZ_WG_PCT)
+        except Exception as e:
+            for _, toekomst in rij:
+                if not toekomst.done():
+                    toekomst.set_exception(e)
+            return
+        self.rekentijd += time.perf_counter() - t0
+        self.batches += 1
+        self.berekeningen += len(rij)
+        self.grootste_batch = max(self.grootste_batch, len(rij))
+        for (_, toekomst), r in zip(rij, resultaten):
+            if not toekomst.done():   # client kan intussen weg zijn
+                toekomst.set_result(r)
+
+
+def _bereken_batch(soort: str, bedienden: list, params, categorie: int, RSZ_WG_PCT: float) -> list:
+    if len(bedienden) < VECTOR_DREMPEL:
+        uit = []
+        for b in bedienden:
+            netto = bereken_nettoloon(b, params)
+            r = netto if soort == "netto" else bereken_loonkost(b, netto, categorie, RSZ_WG_PCT, params)
+            uit.append(r._asdict())     # JSON kent enkel echte dicts
+        return uit
+
+    kol = {k: np.fromiter((getattr(b, k) for b in bedienden), dtype=np.float64, count=len(bedienden))
+           for k in _NUMERIEK}
+    if soort == "netto":
+        res = bereken_nettoloon_batch(kol["bruto_maandloon"], kol["MG_WG_jaar"], kol["MG_WN_jaar"], kol["EC_jaar"],
+                                      kol["maandelijkse_kostenvergoeding"], [b.regime for b in bedienden],
+                                      params=params)
+    else:
+        res = bereken_loonkost_batch(kol["bruto_maandloon"], kol["prestatiebreuk"], kol["MG_WG_jaar"], kol["EC_jaar"],
+                                     kol["GV_WG_pct"], kol["AO_pct"], kol["maandelijkse_kostenvergoeding"],
+                                     categorie, RSZ_WG_PCT, params=params)
+    return [dict(zip(res.velden, rij)) for rij in res.matrix.T.tolist()]
+
+
+# -----------------------
+# Dienst
+# -----------------------
+class Rekendienst:
+    def __init__(self, max_wacht: float = 0.0, max_batch: int = MAX_BATCH):
+        self.batcher = MicroBatcher(max_wacht, max_batch)
+        self.cache = BerekeningCache()
+        self.latency = deque(maxlen=LATENCY_VENSTER)
+        self.verzoeken = 0
+        self.gestart = time.time()
+
+    async def verwerk(self, methode: str, pad: str, body: bytes):
+        """(methode, pad, body) → (status, JSON-serialiseerbaar antwoord)."""
+        if pad == "/statistieken":
+            if methode != "GET":
+                raise Fout(405, "gebruik GET")
+            return 200, self.statistieken()
+        if pad not in ("/nettoloon", "/loonkost", "/overzicht"):
+            raise Fout(404, f"onbekend pad {pad}")
+        if methode != "POST":
+            raise Fout(405, "gebruik POST")
+        try:
+            data = json.loads(body or b"{}")
+        except ValueError:
+            raise Fout(400, "ongeldige JSON") from None
+
+        if pad == "/overzicht":
+            b = _bediende(data, ("toon_per_maand",))
+        elif pad == "/nettoloon":
+            b, soort, extra = _bediende(data), "netto", {}
+        else:
+            b, soort = _bediende(data, ("categorie", "RSZ_WG_PCT")), "kost"
+            try:
+                extra = {"categorie": int(data.get("categorie", 1)), "RSZ_WG_PCT": float(data.get("RSZ_WG_PCT", 0.25))}
+            except (TypeError, ValueError, OverflowError):
+                raise Fout(400, "categorie/RSZ_WG_PCT moeten getallen zijn") from None
+            if not math.isfinite(extra["RSZ_WG_PCT"]):
+                raise Fout(400, "RSZ_WG_PCT moet een eindig getal zijn")
+        try:
+            jaar = int(data.get("jaar", STANDAARD_JAAR))
+            params = laad_parameters(jaar)
+        except (TypeError, ValueError, OverflowError) as e:
+            raise Fout(400, str(e)) from None
+
+        if pad == "/overzicht":
+            df, netto, kost = self.cache.overzicht(b, bool(data.get("toon_per_maand", True)), params)
+            return 200, {"titel": df.attrs.get("title"), "overzicht": df.to_dict("records"),
+                         "nettoloon": netto, "loonkost": kost}
+        if soort == "kost" and extra["categorie"] not in params.structureel:
+            raise Fout(400, f"onbekende categorie {extra['categorie']} "
+                            f"(beschikbaar: {', '.join(map(str, sorted(params.structureel)))})")
+        return 200, await self.batcher.bereken(soort, b, jaar, **extra)
+
+    def statistieken(self) -> dict:
+        lat = np.fromiter(self.latency, dtype=np.float64)
+        p50, p99 = np.percentile(lat, [50, 99]) * 1e3 if lat.size else (0.0, 0.0)
+        bt = self.batcher
+        return {
+            "verzoeken": self.verzoeken,
+            "uptime_s": round(time.time() - self.gestart, 1),
+            "p50_ms": round(float(p50), 4),
+            "p99_ms": round(float(p99), 4),
+            "batches": bt.batches,
+            "gemiddelde_batch": round(bt.berekeningen / bt.batches, 2) if bt.batches else 0.0,
+            "grootste_batch": bt.grootste_batch,
+            "us_per_berekening": round(bt.rekentijd / bt.berekeningen * 1e6, 2) if bt.berekeningen else 0.0,
+            "cache": self.cache.statistieken,
+        }
+
+    # -----------------------
+    # HTTP/1.1 (keep-alive)
+    # -----------------------
+    async def _verbinding(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    kop = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    return
+                t0 = time.perf_counter()
+                regels = kop.decode("latin-1").split("\r\n")
+                try:
+                    methode, pad, versie = regels[0].split(" ", 2)
+                except ValueError:
+                    return
+                headers = {}
+                for regel in regels[1:]:
+                    naam, _, waarde = regel.partition(":")
+                    headers[naam.strip().lower()] = waarde.strip()
+
+                try:
+                    lengte = int(headers.get("content-length", 0))
+                    if lengte > MAX_BODY:
+                        raise Fout(413, "verzoek te groot")
+                    body = await reader.readexactly(lengte) if lengte else b""
+                    status, antwoord = await self.verwerk(methode, pad.split("?", 1)[0], body)
+                except Fout as e:
+                    status, antwoord = e.status, {"fout": str(e)}
+                except asyncio.IncompleteReadError:
+                    return
+                except Exception as e:
+                    status, antwoord = 500, {"fout": f"{type(e).__name__}: {e}"}
+
+                sluiten = headers.get("connection", "").lower() == "close" or versie == "HTTP/1.0"
+                try:
+                    inhoud = json.dumps(antwoord, ensure_ascii=False, allow_nan=False).encode()
+                except ValueError:     # NaN/oneindig in een resultaat: geen geldige JSON
+                    status, inhoud = 500, json.dumps({"fout": "resultaat bevat NaN of oneindig"}).encode()
+                writer.write(
+                    f"HTTP/1.1 {status} {_REDENEN.get(status, '')}\r\nContent-Type: application/json; charset=utf-8\r\n"
+                    f"Content-Length: {len(inhoud)}\r\nConnection: {'close' if sluiten else 'keep-alive'}\r\n\r\n"
+                    .encode() + inhoud
+                )
+                await writer.drain()
+                self.verzoeken += 1
+                self.latency.append(time.perf_counter() - t0)
+                if sluiten:
+                    return
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host: str = "127.0.0.1", poort: int = STANDAARD_POORT):
+        return await asyncio.start_server(self._verbinding, host, poort)
+
+
+# -----------------------
+# Belastingtest
+# -----------------------
+async def _client(host, poort, aantal, latencies, rng):
+    reader, writer = await asyncio.open_connection(host, poort)
+    try:
+        for _ in range(aantal):
+            pad = "/nettoloon" if rng.random() < 0.5 else "/loonkost"
+            body = json.dumps({"bruto_maandloon": round(float(rng.uniform(2000, 8000)), 2),
+                               "MG_WG_jaar": 1520.2, "MG_WN_jaar": 239.8, "AO_pct": 0.01}).encode()
+            t0 = time.perf_counter()
+            writer.write(f"POST {pad} HTTP/1.1\r\nHost: {host}\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body)
+            kop = await reader.readuntil(b"\r\n\r\n")
+            lengte = int(kop.lower().split(b"content-length:")[1].split(b"\r\n")[0])
+            await reader.readexactly(lengte)
+            latencies.append(time.perf_counter() - t0)
+    finally:
+        writer.close()
+
+
+async def belastingtest(aantal: int, gelijktijdig: int, host: str, poort: int, max_wacht: float, max_batch: int):
+    dienst = Rekendienst(max_wacht, max_batch)
+    server = await dienst.start(host, poort)
+    poort = server.sockets[0].getsockname()[1]
+    rng = np.random.default_rng(2025)
+    latencies = []
+    t0 = time.perf_counter()
+    per_client = max(1, aantal // gelijktijdig)
+    await asyncio.gather(*[_client(host, poort, per_client, latencies, rng) for _ in range(gelijktijdig)])
+    duur = time.perf_counter() - t0
+    server.close()
+    await server.wait_closed()
+    lat = np.array(latencies) * 1e3
+    return {
+        "verzoeken_per_s": round(len(latencies) / duur),
+        "client_p50_ms": round(float(np.percentile(lat, 50)), 3),
+        "client_p99_ms": round(float(np.percentile(lat, 99)), 3),
+        "dienst": dienst.statistieken(),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m payroll.dienst",
+        description="Lokale JSON-rekendienst voor nettoloon, loonkost en overzicht.",
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--poort", type=int, default=STANDAARD_POORT)
+    parser.add_argument("--max-wacht-ms", type=float, default=0.0,
+                        help="extra wachttijd om batches te vullen (standaard 0: enkel wat al binnen is)")
+    parser.add_argument("--max-batch", type=int, default=MAX_BATCH)
+    parser.add_argument("--belastingtest", type=int, metavar="N",
+                        help="start de dienst op een vrije poort, stuur N verzoeken en toon de latency")
+    parser.add_argument("--gelijktijdig", type=int, default=64, help="gelijktijdige clients voor --belastingtest")
+    args = parser.parse_args(argv)
+    max_wacht = args.max_wacht_ms / 1e3
+
+    if args.belastingtest:
+        resultaat = asyncio.run(belastingtest(args.belastingtest, args.gelijktijdig, args.host, 0, max_wacht,
+                                              args.max_batch))
+        print(json.dumps(resultaat, indent=2))
+        return
+
+    async def draai():
+        server = await Rekendienst(max_wacht, args.max_batch).start(args.host, args.poort)
+        print(f"✅ rekendienst op http://{args.host}:{args.poort}", file=sys.stderr)
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(draai())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+# payroll/export.py
+#
+# Streaming export van resultaten voor grote personeelsbestanden.
+#
+# De resultaten komen blok per blok binnen (zoals ze berekend worden) en gaan
+# meteen naar schijf, zodat het geheugengebruik begrensd blijft door de
+# blokgrootte en niet door het aantal werknemers:
+#   - Excel (.xlsx): openpyxl write-only, bladen "netto", "loonkost" en
+#     "samenvatting" (totalen per BBSZ-regime)
+#   - CSV: één bestand per blad (resultaten_netto.csv, resultaten_loonkost.csv,
+#     resultaten_samenvatting.csv)
+#
+#   with StreamExport("resultaten.xlsx") as exp:
+#       for df in lees_in_blokken("personeel.csv"):
+#           pb = Personeelsbestand.uit_dataframe(df)
+#           netto, kost = pb.bereken()
+#           exp.schrijf_blok(df, netto, kost, pb.regime_code)
+
+import csv
+import os
+
+import numpy as np
+import pandas as pd
+
+from parameters.bszb_2025 import REGIMES
+from payroll.personeelsbestand import NUMERIEKE_KOLOMMEN
+from payroll.resultaten import NETTO_VELDEN, KOST_VELDEN
+
+BLADEN = ("netto", "loonkost", "samenvatting")
+MAX_RIJEN_EXCEL = 1_048_576   # incl. kopregel; daarna gaat het verder op "netto (2)", ...
+
+# Maandbedragen die per regime opgeteld worden
+SAMENVATTING_BEDRAGEN = (
+    ("bruto_maand", "netto"),
+    ("nettoloon_maand", "netto"),
+    ("koopkracht_maand", "netto"),
+    ("totaal_loonkost_maand", "kost"),
+)
+
+
+def samenvatting_per_regime(aantal, sommen: dict) -> pd.DataFrame:
+    """
+    Aantal werknemers en sommen per BBSZ-regime (arrays in de volgorde van
+    REGIMES, sleutels uit SAMENVATTING_BEDRAGEN) → totalen en gemiddelden per
+    maand per regime, met een totaalrij.
+    """
+    aantal = np.asarray(aantal)
+    aantal = np.append(aantal, aantal.sum())
+    tabel = {"regime": [*REGIMES, "totaal"], "werknemers": aantal}
+    for veld, _ in SAMENVATTING_BEDRAGEN:
+        som = np.append(sommen[veld], np.sum(sommen[veld]))
+        tabel[f"som_{veld}"] = np.round(som, 2)
+        tabel[f"gemiddeld_{veld}"] = np.round(np.divide(som, aantal, out=np.zeros_like(som), where=aantal > 0), 2)
+    return pd.DataFrame(tabel)
+
+
+class StreamExport:
+    """
+    Schrijft resultaatblokken weg naar Excel (write-only) of CSV.
+
+    Kolommen van de invoer die geen Bediende-veld zijn (bv. een werknemer-ID)
+    worden als sleutel vooraan op de netto- en loonkostbladen meegenomen.
+    Het samenvattingsblad wordt bij close() geschreven.
+    """
+
+    def __init__(self, pad: str, sep: str = ","):
+        self.pad = pad
+        self.sep = sep
+        self.excel = pad.lower().endswith(".xlsx")
+        self.rijen = 0
+        self._sleutels = None
+        self._aantal = np.zeros(len(REGIMES), dtype=np.int64)
+        self._sommen = {veld: np.zeros(len(REGIMES)) for veld, _ in SAMENVATTING_BEDRAGEN}
+
+        if self.excel:
+            try:
+                import openpyxl
+            except ImportError:
+                raise ImportError("openpyxl is vereist om naar Excel te exporteren") from None
+            self._wb = openpyxl.Workbook(write_only=True)
+            # Volgorde van de bladen ligt vast bij aanmaak; "samenvatting" wordt pas op het einde gevuld
+            self._bladen = {naam: [self._wb.create_sheet(naam), 0, 1] for naam in BLADEN}
+        else:
+            stam, _ = os.path.splitext(pad)
+            self._bestanden = {naam: open(f"{stam}_{naam}.csv", "w", encoding="utf-8", newline="") for naam in BLADEN}
+
+    # -----------------------
+    # Schrijven
+    # -----------------------
+    def _kop(self, naam: str) -> list:
+        velden = NETTO_VELDEN if naam == "netto" else KOST_VELDEN
+        return [*self._sleutels, "regime", *velden]
+
+    def _schrijf_excel(self, naam: str, kolommen: list):
+        blad = self._bladen[naam]   # [werkblad, rijen, volgnummer]
+        for rij in zip(*kolommen):
+            # Vol blad: pas een nieuw blad wanneer er nog een rij komt (geen leeg blad op het einde)
+            if blad[1] == MAX_RIJEN_EXCEL:
+                blad[2] += 1
+                blad[0], blad[1] = self._wb.create_sheet(f"{naam} ({blad[2]})"), 0
+            if blad[1] == 0:
+                blad[0].append(self._kop(naam))
+                blad[1] = 1
+            blad[0].append(rij)
+            blad[1] += 1
+
+    def schrijf_blok(self, df: pd.DataFrame, netto: dict, kost: dict, regime_code: np.ndarray):
+        """Eén blok: invoer-DataFrame + resultaten van Personeelsbestand.bereken()."""
+        if self._sleutels is None:
+            self._sleutels = [k for k in df.columns if k not in NUMERIEKE_KOLOMMEN and k != "regime"]
+            if not self.excel:
+                # Zelfde quoting als de rijen (to_csv): een sleutelnaam met sep of " blijft één kolom
+                for naam in ("netto", "loonkost"):
+                    kop = csv.writer(self._bestanden[naam], delimiter=self.sep, lineterminator=os.linesep)
+                    kop.writerow(self._kop(naam))
+
+        regime = np.asarray(REGIMES, dtype=object)[regime_code]
+        for naam, resultaat, velden in (("netto", netto, NETTO_VELDEN), ("loonkost", kost, KOST_VELDEN)):
+            if self.excel:
+                kolommen = [df[k].tolist() for k in self._sleutels] + [regime.tolist()]
+                kolommen += [resultaat[v].tolist() for v in velden]
+                self._schrijf_excel(naam, kolommen)
+            else:
+                blok = pd.DataFrame({k: df[k].to_numpy() for k in self._sleutels})
+                blok["regime"] = regime
+                for v in velden:
+                    blok[v] = resultaat[v]
+                blok.to_csv(self._bestanden[naam], header=False, index=False, sep=self.sep)
+
+        # Samenvatting per regime bijwerken
+        self._aantal += np.bincount(regime_code, minlength=len(REGIMES))
+        for veld, bron in SAMENVATTING_BEDRAGEN:
+            waarden = (netto if bron == "netto" else kost)[veld]
+            self._sommen[veld] += np.bincount(regime_code, weights=waarden, minlength=len(REGIMES))
+        self.rijen += len(regime_code)
+
+    def samenvatting(self) -> pd.DataFrame:
+        """Totalen en gemiddelden per maand per BBSZ-regime (+ totaalrij)."""
+        return samenvatting_per_regime(self._aantal, self._sommen)
+
+    # -----------------------
+    # Afsluiten
+    # -----------------------
+    def close(self):
+        samenvatting = self.samenvatting()
+        if self.excel:
+            blad = self._bladen["samenvatting"][0]
+            blad.append(samenvatting.columns.tolist())
+            for rij in samenvatting.itertuples(index=False):
+                blad.append([v.item() if hasattr(v, "item") else v for v in rij])
+            self._wb.save(self.pad)
+        else:
+            samenvatting.to_csv(self._bestanden["samenvatting"], index=False, sep=self.sep)
+            for f in self._bestanden.values():
+                f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        elif self.excel:
+            self._wb.close()
+        else:
+            for f in self._bestanden.values():
+                f.close()
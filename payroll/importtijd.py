@@ -0,0 +1,102 @@
+# payroll/importtijd.py
+#
+# Importtijd-budget voor de rekenmodules.
+#
+# Batchworkers starten vaak als korte processen en importeren payroll.* telkens
+# opnieuw. Dit script importeert elke module in een vers Python-proces, meet
+# de importtijd (mediaan over enkele herhalingen) en controleert dat er geen
+# zware of UI-afhankelijkheden meekomen (pandas, plotly, reportlab, streamlit,
+# openpyxl, pyarrow). Bij een overschreden budget of een verboden import → exitcode 1.
+#
+#   python -m payroll.importtijd
+#   python -m payroll.importtijd --herhalingen 9 --factor 2
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ZWAAR = ("pandas", "plotly", "reportlab", "streamlit", "openpyxl", "matplotlib", "pyarrow")
+
+# module → (budget in ms, toegelaten zware/externe modules)
+# De scalaire rekenketen mag enkel de standaardbibliotheek gebruiken; de
+# gevectoriseerde modules mogen numpy laden, maar niets uit ZWAAR.
+BUDGETTEN = {
+    "parameters.register": (25.0, ()),
+    "payroll.werknemer": (5.0, ()),
+    "payroll.nettoloon": (25.0, ()),
+    "payroll.loonkost": (25.0, ()),
+    "payroll.cache": (25.0, ()),
+    "payroll.meting": (25.0, ()),
+    "payroll.resultaten": (25.0, ()),
+    "payroll.vectorieel": (150.0, ("numpy",)),
+    "payroll.personeelsbestand": (150.0, ("numpy",)),
+    "payroll.terugrekenen": (150.0, ("numpy",)),
+    "payroll.knikpunten": (150.0, ("numpy",)),
+    "payroll.centen": (150.0, ("numpy",)),
+}
+
+_METING = """
+import sys, time, json
+t0 = time.perf_counter()
+import {module}
+duur = time.perf_counter() - t0
+print(json.dumps({{"ms": duur * 1000.0, "geladen": sorted(m for m in sys.modules if m.split(".")[0] in {extern!r})}}))
+"""
+
+
+def meet_import(module: str, herhalingen: int = 5) -> dict:
+    """Importeert `module` in `herhalingen` verse processen → mediaan (ms) + geladen externe modules."""
+    extern = sorted(set(ZWAAR) | {"numpy"})
+    code = _METING.format(module=module, extern=tuple(extern))
+    omgeving = dict(os.environ)
+    omgeving["PYTHONPATH"] = os.pathsep.join(filter(None, [os.getcwd(), omgeving.get("PYTHONPATH")]))
+
+    tijden, geladen = [], set()
+    for _ in range(herhalingen):
+        uit = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True, env=omgeving
+        ).stdout
+        meting = json.loads(uit.strip().splitlines()[-1])
+        tijden.append(meting["ms"])
+        geladen.update(m.split(".")[0] for m in meting["geladen"])
+    return {"module": module, "ms": statistics.median(tijden), "geladen": sorted(geladen)}
+
+
+def controleer(budgetten: dict = BUDGETTEN, herhalingen: int = 5, factor: float = 1.0) -> list:
+    """Meet alle modules; elk resultaat krijgt 'budget_ms', 'verboden' en 'ok'."""
+    resultaten = []
+    for module, (budget, toegelaten) in budgetten.items():
+        r = meet_import(module, herhalingen)
+        r["budget_ms"] = budget * factor
+        r["verboden"] = [m for m in r["geladen"] if m not in toegelaten]
+        r["ok"] = r["ms"] <= r["budget_ms"] and not r["verboden"]
+        resultaten.append(r)
+    return resultaten
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m payroll.importtijd",
+        description="Controleer importtijd en afhankelijkheden van de rekenmodules.",
+    )
+    parser.add_argument("--herhalingen", type=int, default=5, help="verse processen per module (mediaan)")
+    parser.add_argument("--factor", type=float, default=1.0, help="vermenigvuldig alle budgetten (trage machines/CI)")
+    parser.add_argument("--json", action="store_true", help="resultaten als JSON i.p.v. tabel")
+    args = parser.parse_args(argv)
+
+    resultaten = controleer(herhalingen=args.herhalingen, factor=args.factor)
+    if args.json:
+        print(json.dumps(resultaten, indent=2))
+    else:
+        for r in resultaten:
+            status = "✅" if r["ok"] else "❌"
+            extra = f"  verboden: {', '.join(r['verboden'])}" if r["verboden"] else ""
+            print(f"{status} {r['module']:<28} {r['ms']:7.1f} ms  (budget {r['budget_ms']:.0f} ms){extra}")
+    return 0 if all(r["ok"] for r in resultaten) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
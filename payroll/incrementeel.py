@@ -0,0 +1,263 @@
+# payroll/incrementeel.py
+#
+# Incrementele maandafsluiting: enkel werknemers met gewijzigde invoer (of een
+# ander/gewijzigd parameterjaar) worden opnieuw berekend.
+#
+# Per rij wordt een vingerafdruk (64-bit hash) berekend over alle invoervelden
+# van Bediende, het regime en de toepasselijke parameters. De vorige run wordt
+# bewaard als toestand (.npz: ID's, vingerafdrukken, invoer en resultaten).
+# Bij een nieuwe run:
+#   - ongewijzigde vingerafdruk → resultaat overnemen uit de toestand
+#   - nieuw of gewijzigd        → opnieuw berekenen (gevectoriseerd)
+# en een deltarapport vermeldt per werknemer wat er veranderde en waarom.
+#
+#   python -m payroll.incrementeel personeel.csv resultaten.csv \
+#       --toestand vorige_run.npz --delta delta.csv
+
+import argparse
+import hashlib
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from parameters.register import Parameterset, STANDAARD, laad_parameters
+from payroll.batch import lees_in_blokken
+from payroll.resultaten import NETTO_VELDEN, KOST_VELDEN
+from payroll.personeelsbestand import Personeelsbestand, NUMERIEKE_KOLOMMEN
+
+STANDAARD_SLEUTEL = "werknemer_id"
+JAARKOLOM = "parameterjaar"   # optioneel: parameterjaar per werknemer
+RAPPORT_VELDEN = ("nettoloon_maand", "koopkracht_maand", "totaal_loonkost_maand")
+INTERNE_KOLOMMEN = ("regime", JAARKOLOM, "_parameters", "_vingerafdruk")
+
+
+# -----------------------
+# Vingerafdrukken
+# -----------------------
+_M1 = np.uint64(0xBF58476D1CE4E5B9)
+_M2 = np.uint64(0x94D049BB133111EB)
+_GOUDEN = np.uint64(0x9E3779B97F4A7C15)
+
+
+def _meng(h):
+    """splitmix64-finalizer (uint64, overloop is gewenst)."""
+    h = h ^ (h >> np.uint64(30)); h = h * _M1
+    h = h ^ (h >> np.uint64(27)); h = h * _M2
+    return h ^ (h >> np.uint64(31))
+
+
+def parameter_vingerafdruk(params: Parameterset) -> int:
+    """Stabiele hash van een volledige parameterset (wijzigt bij elke correctie van een waarde)."""
+    return int.from_bytes(hashlib.blake2b(repr(params).encode(), digest_size=8).digest(), "little")
+
+
+def vingerafdrukken(pb: Personeelsbestand, param_afdruk) -> np.ndarray:
+    """Vingerafdruk per rij over alle invoervelden + regime + parameters (uint64)."""
+    with np.errstate(over="ignore"):
+        h = np.broadcast_to(np.asarray(param_afdruk, dtype=np.uint64), (len(pb),)).copy()
+        for naam in NUMERIEKE_KOLOMMEN:
+            bits = np.ascontiguousarray(pb.kolommen[naam] + 0.0).view(np.uint64)  # -0.0 → 0.0
+            h = _meng(h ^ (bits + _GOUDEN))
+        h = _meng(h ^ (pb.regime_code.astype(np.uint64) + _GOUDEN))
+    return h
+
+
+# -----------------------
+# Toestand van de vorige run
+# -----------------------
+def bewaar_toestand(pad: str, toestand: pd.DataFrame):
+    """Schrijft de toestand (resultaat van herbereken) naar een .npz-bestand."""
+    kolommen = {}
+    for naam in toestand.columns:
+        v = toestand[naam].to_numpy()
+        kolommen[naam] = v.astype(str) if v.dtype == object else v
+    tijdelijk = pad + ".tmp.npz"
+    np.savez_compressed(tijdelijk, **kolommen)
+    os.replace(tijdelijk, pad)  # nooit een half geschreven toestand achterlaten
+
+
+def laad_toestand(pad: str) -> pd.DataFrame:
+    with np.load(pad, allow_pickle=False) as data:
+        return pd.DataFrame({naam: data[naam] for naam in data.files})
+
+
+# -----------------------
+# Herberekenen
+# -----------------------
+def _deel(pb: Personeelsbestand, rijen: np.ndarray) -> Personeelsbestand:
+    return Personeelsbestand._uit_kolommen({k: v[rijen] for k, v in pb.kolommen.items()}, pb.regime_code[rijen])
+
+
+def _bereken(pb: Personeelsbestand, jaren: np.ndarray, parametersets: dict) -> dict:
+    """Nettoloon + loonkost voor pb, per parameterjaar gegroepeerd → dict van arrays."""
+    uit = {naam: np.empty(len(pb)) for naam in (*NETTO_VELDEN, *KOST_VELDEN)}
+    for jaar in np.unique(jaren):
+        rijen = np.nonzero(jaren == jaar)[0]
+        netto, kost = _deel(pb, rijen).bereken(parametersets[int(jaar)])
+        for naam, waarden in {**netto, **kost}.items():
+            uit[naam][rijen] = waarden
+    return uit
+
+
+def _redenen(nieuw: pd.DataFrame, oud: pd.DataFrame, velden) -> np.ndarray:
+    """Per rij een opsomming van de velden die verschillen (leeg als niets)."""
+    redenen = np.full(len(nieuw), "", dtype=object)
+    for veld in velden:
+        a, b = nieuw[veld].to_numpy(), oud[veld].to_numpy()
+        anders = a != b
+        if a.dtype.kind == "f":
+            anders &= ~(np.isnan(a) & np.isnan(b))
+        redenen[anders] += veld + ", "
+    return np.array([r[:-2] for r in redenen], dtype=object)
+
+
+def herbereken(
+    df: pd.DataFrame,
+    vorige: pd.DataFrame | None = None,
+    sleutel: str = STANDAARD_SLEUTEL,
+    params: Parameterset = STANDAARD,
+):
+    """
+    Berekent een personeelsbestand en hergebruikt ongewijzigde rijen uit `vorige`
+    (de toestand van de vorige run). Het parameterjaar komt uit de kolom
+    'parameterjaar' indien aanwezig, anders uit `params`.
+
+    Geeft (toestand, delta) terug:
+    - toestand: invoer + resultaten + vingerafdruk per werknemer (ook de volgende 'vorige')
+    - delta: één rij per nieuwe, gewijzigde of verdwenen werknemer met de reden
+      en het verschil in netto, koopkracht en loonkost
+    """
+    if sleutel not in df.columns:
+        raise ValueError(f"Kolom {sleutel!r} (werknemer-ID) ontbreekt")
+    if df[sleutel].duplicated().any():
+        dubbel = df.loc[df[sleutel].duplicated(), sleutel].iloc[0]
+        raise ValueError(f"Werknemer-ID {dubbel!r} komt meer dan eens voor")
+
+    df = df.reset_index(drop=True)
+    pb = Personeelsbestand.uit_dataframe(df)
+    if JAARKOLOM in df.columns:
+        jaren = df[JAARKOLOM].to_numpy(dtype=np.int64)
+    else:
+        jaren = np.full(len(df), params.jaar, dtype=np.int64)
+    parametersets = {int(j): params if j == params.jaar else laad_parameters(int(j)) for j in np.unique(jaren)}
+    afdrukken = {j: parameter_vingerafdruk(p) for j, p in parametersets.items()}
+    param_afdruk = np.array([afdrukken[int(j)] for j in jaren], dtype=np.uint64)
+    afdruk = vingerafdrukken(pb, param_afdruk)
+
+    invoer = pd.DataFrame({sleutel: df[sleutel], **pb.kolommen, "regime": pb.regime_code, JAARKOLOM: jaren})
+    invoer["_parameters"] = param_afdruk
+    invoer["_vingerafdruk"] = afdruk
+
+    # Koppelen aan de vorige run op werknemer-ID
+    if vorige is not None and len(vorige):
+        vorige = vorige.set_index(sleutel)
+        positie = vorige.index.get_indexer(df[sleutel].to_numpy())
+    else:
+        vorige = None
+        positie = np.full(len(df), -1)
+    bekend = positie >= 0
+    gelijk = np.zeros(len(df), dtype=bool)
+    if vorige is not None:
+        gelijk[bekend] = vorige["_vingerafdruk"].to_numpy()[positie[bekend]] == afdruk[bekend]
+
+    # Enkel nieuwe/gewijzigde rijen herberekenen; de rest overnemen
+    te_berekenen = np.nonzero(~gelijk)[0]
+    berekend = _bereken(_deel(pb, te_berekenen), jaren[te_berekenen], parametersets)
+    resultaten = {}
+    for naam, waarden in berekend.items():
+        kolom = np.empty(len(df))
+        kolom[te_berekenen] = waarden
+        if gelijk.any():
+            kolom[gelijk] = vorige[naam].to_numpy()[positie[gelijk]]
+        resultaten[naam] = kolom
+    toestand = pd.concat([invoer, pd.DataFrame(resultaten)], axis=1)
+
+    # -------------------------------------------
+    # Deltarapport
+    # -------------------------------------------
+    delen = []
+    gewijzigd = bekend & ~gelijk
+    if (~bekend).any():
+        nieuw = toestand.loc[~bekend, [sleutel, *RAPPORT_VELDEN]].copy()
+        nieuw.insert(1, "status", "nieuw")
+        nieuw.insert(2, "reden", "nieuwe werknemer")
+        for veld in RAPPORT_VELDEN:
+            nieuw[veld + "_oud"] = np.nan
+        delen.append(nieuw)
+    if gewijzigd.any():
+        oud = vorige.iloc[positie[gewijzigd]].reset_index()
+        nu = toestand.loc[gewijzigd].reset_index(drop=True)
+        reden = _redenen(nu, oud, (*NUMERIEKE_KOLOMMEN, "regime", JAARKOLOM))
+        parameters_anders = (nu["_parameters"].to_numpy() != oud["_parameters"].to_numpy()) \
+            & (nu[JAARKOLOM].to_numpy() == oud[JAARKOLOM].to_numpy())
+        reden = np.where(parameters_anders, [r + (", " if r else "") + "parameters" for r in reden], reden)
+        rij = nu[[sleutel, *RAPPORT_VELDEN]].copy()
+        rij.insert(1, "status", "gewijzigd")
+        rij.insert(2, "reden", reden)
+        for veld in RAPPORT_VELDEN:
+            rij[veld + "_oud"] = oud[veld].to_numpy()
+        delen.append(rij)
+    if vorige is not None:
+        weg = ~vorige.index.isin(df[sleutel].to_numpy())
+        if weg.any():
+            verdwenen = vorige.loc[weg, list(RAPPORT_VELDEN)].reset_index()
+            verdwenen = verdwenen.rename(columns={v: v + "_oud" for v in RAPPORT_VELDEN})
+            verdwenen.insert(1, "status", "verdwenen")
+            verdwenen.insert(2, "reden", "niet meer in het bestand")
+            for veld in RAPPORT_VELDEN:
+                verdwenen[veld] = np.nan
+            delen.append(verdwenen)
+
+    kolommen = [sleutel, "status", "reden", *(f"{v}{s}" for v in RAPPORT_VELDEN for s in ("_oud", ""))]
+    delta = pd.concat(delen, ignore_index=True)[kolommen] if delen else pd.DataFrame(columns=kolommen)
+    for veld in RAPPORT_VELDEN:
+        # Op de cent, zoals alle bedragen (+ 0.0: geen -0.0 in het rapport)
+        delta[veld + "_verschil"] = (delta[veld] - delta[veld + "_oud"]).astype(np.float64).round(2) + 0.0
+    return toestand, delta
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m payroll.incrementeel",
+        description="Incrementele maandafsluiting: herberekent enkel gewijzigde werknemers.",
+    )
+    parser.add_argument("invoer", help="CSV- of Excel-bestand met één rij per werknemer")
+    parser.add_argument("uitvoer", help="CSV-bestand voor de resultaten")
+    parser.add_argument("--toestand", required=True,
+                        help="toestand van de vorige run (.npz); wordt na afloop bijgewerkt")
+    parser.add_argument("--delta", help="CSV-bestand voor het deltarapport")
+    parser.add_argument("--sleutel", default=STANDAARD_SLEUTEL, help="kolom met het werknemer-ID")
+    parser.add_argument("--sep", default=",", help="scheidingsteken voor CSV (standaard ',')")
+    parser.add_argument("--jaar", type=int, help="parameterjaar voor rijen zonder kolom 'parameterjaar'")
+    args = parser.parse_args(argv)
+
+    try:
+        params = laad_parameters(args.jaar) if args.jaar else STANDAARD
+    except ValueError as e:
+        parser.error(str(e))
+
+    start = time.perf_counter()
+    df = pd.concat(lees_in_blokken(args.invoer, sep=args.sep), ignore_index=True)
+    vorige = laad_toestand(args.toestand) if os.path.exists(args.toestand) else None
+    toestand, delta = herbereken(df, vorige, args.sleutel, params)
+
+    resultaat_velden = [k for k in toestand.columns if k not in df.columns and k not in INTERNE_KOLOMMEN]
+    pd.concat([df, toestand[resultaat_velden]], axis=1).to_csv(args.uitvoer, index=False, sep=args.sep)
+    if args.delta:
+        delta.to_csv(args.delta, index=False, sep=args.sep)
+    bewaar_toestand(args.toestand, toestand)
+
+    aantal = delta["status"].value_counts()
+    print(
+        f"✅ {len(df):,} werknemers in {time.perf_counter() - start:.2f}s — "
+        f"{aantal.get('nieuw', 0):,} nieuw, {aantal.get('gewijzigd', 0):,} gewijzigd, "
+        f"{aantal.get('verdwenen', 0):,} verdwenen → {args.uitvoer}",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
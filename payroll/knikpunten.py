@@ -0,0 +1,241 @@
+# payroll/knikpunten.py
+#
+# Gecompileerd, stuksgewijs lineair model van netto / koopkracht / loonkost
+# als functie van het bruto maandloon.
+#
+# Alle regels in parameters/ zijn stuksgewijs lineair in het maandloon:
+# belastingschijven, afbouw van de werkbonus (luik A/B), BSZB-zones en de
+# S0/S2-grenzen van de structurele vermindering. Voor vaste overige invoer
+# (prestatiebreuk, voordelen, regime) worden al die knikken samengevoegd tot
+# één gesorteerde reeks knikpunten met per segment een helling en snijpunt.
+# Evalueren is daarna O(log n) (bisect) en de helling ís het marginale tarief.
+#
+# ⚠️ Het model volgt de formules zonder tussentijdse afrondingen; het wijkt
+# daardoor hooguit enkele centen af van bereken_nettoloon/bereken_loonkost.
+
+import bisect
+
+import numpy as np
+
+from parameters.register import Parameterset, STANDAARD
+from payroll.vectorieel import (
+    bereken_nettoloon_batch,
+    bereken_loonkost_batch,
+    structurele_vermindering_maand_vec,
+)
+
+GROOTHEDEN = ("nettoloon_maand", "koopkracht_maand", "totaal_loonkost_maand")
+
+
+class StuksgewijsModel:
+    """
+    Segment i loopt van knikpunten[i] tot knikpunten[i+1]; het laatste segment
+    loopt door tot oneindig. Op een knikpunt zelf geldt waarden_op_knik, zodat
+    sprongen (bv. bij BSZB-zonegrenzen) exact aan de juiste kant vallen.
+    """
+    __slots__ = ("knikpunten", "hellingen", "snijpunten", "waarden_op_knik", "_knik_lijst")
+
+    def __init__(self, knikpunten, hellingen: dict, snijpunten: dict, waarden_op_knik: dict):
+        self.knikpunten = knikpunten
+        self.hellingen = hellingen
+        self.snijpunten = snijpunten
+        self.waarden_op_knik = waarden_op_knik
+        self._knik_lijst = knikpunten.tolist()
+
+    def __len__(self):
+        return len(self._knik_lijst)
+
+    def __repr__(self):
+        return f"StuksgewijsModel({len(self)} segmenten vanaf {self._knik_lijst[0]:.2f})"
+
+    def segment(self, bruto):
+        """Index van het segment waarin bruto valt (scalar via bisect, array via searchsorted)."""
+        if np.ndim(bruto) == 0:
+            return max(bisect.bisect_right(self._knik_lijst, bruto) - 1, 0)
+        i = np.searchsorted(self.knikpunten, bruto, side="right") - 1
+        return np.maximum(i, 0)
+
+    def evalueer(self, grootheid: str, bruto):
+        """Waarde van de grootheid (zie GROOTHEDEN) bij gegeven bruto maandloon."""
+        i = self.segment(bruto)
+        a, b, k = self.hellingen[grootheid], self.snijpunten[grootheid], self.waarden_op_knik[grootheid]
+        if np.ndim(bruto) == 0:
+            if bruto == self._knik_lijst[i]:
+                return float(k[i])
+            return float(a[i] * bruto + b[i])
+        x = np.asarray(bruto, dtype=np.float64)
+        return np.where(self.knikpunten[i] == x, k[i], a[i] * x + b[i])
+
+    def marginaal(self, grootheid: str, bruto):
+        """
+        Exact marginaal tarief d(grootheid)/d(bruto) rechts van bruto:
+        welk deel van een extra euro bruto bij de werknemer terechtkomt
+        (netto/koopkracht) of wat hij de werkgever kost (loonkost).
+        """
+        i = self.segment(bruto)
+        a = self.hellingen[grootheid]
+        return float(a[i]) if np.ndim(bruto) == 0 else a[i]
+
+
+# -----------------------
+# Compilatie
+# -----------------------
+def _directe_knikpunten(prestatiebreuk: float, categorie: int, params: Parameterset):
+    """Knikken die rechtstreeks in het maandloon uit te drukken zijn."""
+    punten = []
+
+    # Werkbonus: begin/einde afbouw en het punt waar het bedrag 0 wordt
+    wb = params.werkbonus["bedienden"]
+    for luik in (wb.luikA, wb.luikB):
+        punten += [luik.S_max, luik.S_afbouw_max, luik.S_max + luik.bedrag / luik.afbouw_coef]
+
+    # BSZB: maand- en kwartaalgrenzen, plus minimum/maximum per regime
+    P = params.bszb
+    punten += [P.g1, P.g2, P.g3, P.g4, P.g5] + [K / 3 for K in (P.k1, P.k2, P.k3, P.k4, P.k5, P.k6)]
+    for naam in ("gemeenschappelijk_met_inkomen", "gemeenschappelijk_zonder_inkomen"):
+        p = P.percentages[naam]
+        if p.min_q:
+            punten.append(P.g1 + p.min_q / p.zone2_pct)
+        punten.append(P.g2 + (p.max_q - p.zone3_basis_q) / p.zone3_pct)
+
+    # Structurele vermindering: S0/S2 gelden voor het refertekwartaalloon (maandloon × 3 × µ)
+    if prestatiebreuk > 0:
+        p = params.structureel[categorie]
+        punten += [p.S0 / (3 * prestatiebreuk), p.S2 / (3 * prestatiebreuk)]
+    return punten
+
+
+def _kruisingen(x, f, drempels):
+    """
+    Punten waar f de drempels kruist. f moet lineair en continu zijn
+    tussen opeenvolgende punten van x (dat volgt uit de reeds gevonden knikken).
+    """
+    fx = f(x)
+    a, b, fa, fb = x[:-1], x[1:], fx[:-1], fx[1:]
+    gevonden = []
+    for T in drempels:
+        m = (fa - T) * (fb - T) < 0
+        gevonden.append(a[m] + (T - fa[m]) * (b[m] - a[m]) / (fb[m] - fa[m]))
+    return np.concatenate(gevonden) if gevonden else np.empty(0)
+
+
+def _samenvoegen(x, extra, bruto_min, bruto_max):
+    x = np.concatenate([x, np.asarray(extra, dtype=np.float64)])
+    x = np.unique(x[(x >= bruto_min) & (x <= bruto_max)])
+    # Bijna-samenvallende punten (afrondingsruis) samennemen
+    return x[np.concatenate([[True], np.diff(x) > 1e-9])]
+
+
+def compileer_model(
+    prestatiebreuk: float = 1.0,
+    MG_WG_jaar: float = 0.0,
+    MG_WN_jaar: float = 0.0,
+    EC_jaar: float = 0.0,
+    GV_WG_pct: float = 0.0,
+    AO_pct: float = 0.0,
+    maandelijkse_kostenvergoeding: float = 0.0,
+    regime: str = "individueel",
+    categorie: int = 1,
+    RSZ_WG_PCT: float = 0.25,
+    bruto_min: float = 0.0,
+    bruto_max: float = 100_000.0,
+    params: Parameterset = STANDAARD,
+) -> StuksgewijsModel:
+    """
+    Compileert netto/koopkracht/loonkost(bruto) voor vaste overige invoer
+    (zelfde velden als Bediende) tot een StuksgewijsModel.
+    """
+    def netto(x):
+        return bereken_nettoloon_batch(
+            x, MG_WG_jaar, MG_WN_jaar, EC_jaar, maandelijkse_kostenvergoeding, regime,
+            afronden=False, params=params,
+        )
+
+    def kost(x):
+        return bereken_loonkost_batch(
+            x, prestatiebreuk, MG_WG_jaar, EC_jaar, GV_WG_pct, AO_pct, maandelijkse_kostenvergoeding,
+            categorie, RSZ_WG_PCT, afronden=False, params=params,
+        )
+
+    # 1️⃣ Knikken rechtstreeks in het maandloon
+    x = _samenvoegen(np.array([bruto_min, bruto_max]), _directe_knikpunten(prestatiebreuk, categorie, params),
+                     bruto_min, bruto_max)
+
+    # 2️⃣ Kostenforfait bereikt zijn plafond: 0,30 × (bruto - RSZ) = plafond
+    def na_rsz(x):
+        r = netto(x)
+        return r["bruto_jaar"] - r["rsz_werknemer"]
+    x = _samenvoegen(x, _kruisingen(x, na_rsz, [params.belasting.kostenforfait_plafond / 0.30]), bruto_min, bruto_max)
+
+    # 3️⃣ Belastbaar inkomen kruist een schijfgrens
+    grenzen = [grens for grens, _ in params.belasting.schijven if np.isfinite(grens)]
+    x = _samenvoegen(x, _kruisingen(x, lambda x: netto(x)["belastbaar_inkomen"], grenzen), bruto_min, bruto_max)
+
+    # 4️⃣ Structurele vermindering wordt begrensd tot de patronale RSZ
+    def sv_min_rsz(x):
+        return structurele_vermindering_maand_vec(categorie, x, prestatiebreuk, False, params.structureel) * 12.0 - x * 12 * RSZ_WG_PCT
+    x = _samenvoegen(x, _kruisingen(x, sv_min_rsz, [0.0]), bruto_min, bruto_max)
+
+    # 5️⃣ Helling en snijpunt per segment (twee punten binnen het segment)
+    breedte = np.diff(np.concatenate([x, [x[-1] + 1000.0]]))
+    p1 = x + breedte / 4
+    p2 = x + 3 * breedte / 4
+    alle = np.concatenate([p1, p2, x])
+    waarden = {**netto(alle), **kost(alle)}
+
+    n = x.size
+    hellingen, snijpunten, op_knik = {}, {}, {}
+    for g in GROOTHEDEN:
+        v1, v2, vk = waarden[g][:n], waarden[g][n:2 * n], waarden[g][2 * n:]
+        a = (v2 - v1) / (p2 - p1)
+        hellingen[g] = a
+        snijpunten[g] = v1 - a * p1
+        op_knik[g] = vk
+    return StuksgewijsModel(x, hellingen, snijpunten, op_knik)
+
+
+# -----------------------
+# Tariefcurves
+# -----------------------
+def tariefcurves(
+    b,
+    bruto_min: float,
+    bruto_max: float,
+    punten: int = 10_000,
+    categorie: int = 1,
+    RSZ_WG_PCT: float = 0.25,
+    params: Parameterset = STANDAARD,
+) -> dict:
+    """
+    Exacte marginale en gemiddelde tarieven over [bruto_min, bruto_max] voor
+    de overige invoer van Bediende `b` (bruto_maandloon zelf wordt genegeerd).
+
+    De x-as is een rooster van `punten` punten aangevuld met alle knikpunten
+    in het bereik, zodat elke knik (bv. einde afbouw werkbonus) exact op de
+    curve ligt. Geeft een dict van arrays:
+    - "bruto", "knikpunten"
+    - per grootheid g (zie GROOTHEDEN):
+      g                → waarde
+      "marginaal_" + g → d(g)/d(bruto) rechts van het punt (stapfunctie; teken
+                          met line_shape="hv")
+      "gemiddeld_" + g → g / bruto
+    """
+    if not 0 <= bruto_min < bruto_max:
+        raise ValueError("verwacht 0 <= bruto_min < bruto_max")
+    model = compileer_model(
+        b.prestatiebreuk, b.MG_WG_jaar, b.MG_WN_jaar, b.EC_jaar, b.GV_WG_pct, b.AO_pct,
+        b.maandelijkse_kostenvergoeding, b.regime, categorie, RSZ_WG_PCT,
+        bruto_min=0.0, bruto_max=max(bruto_max, 100_000.0), params=params,
+    )
+    k = model.knikpunten
+    knikken = k[(k > bruto_min) & (k < bruto_max)]
+    x = np.union1d(np.linspace(bruto_min, bruto_max, max(punten, 2)), knikken)
+
+    curves = {"bruto": x, "knikpunten": knikken}
+    met_bruto = x > 0
+    for g in GROOTHEDEN:
+        waarde = model.evalueer(g, x)
+        curves[g] = waarde
+        curves["marginaal_" + g] = model.marginaal(g, x)
+        curves["gemiddeld_" + g] = np.divide(waarde, x, out=np.full_like(x, np.nan), where=met_bruto)
+    return curves
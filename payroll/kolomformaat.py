@@ -0,0 +1,196 @@
+# payroll/kolomformaat.py
+#
+# Personeelsbestanden lezen uit en resultaten schrijven naar kolombestanden
+# (Parquet en Arrow IPC/Feather) met pyarrow.
+#
+# De Arrow-kolommen worden rechtstreeks de kolommen van Personeelsbestand:
+# - Arrow IPC/Feather (ongecomprimeerd): memory-mapped en zero-copy, de
+#   numpy-arrays wijzen naar het bestand zelf
+# - Parquet: memory-mapped gelezen en enkel de nodige kolommen gedecodeerd
+# - regime: als dictionary-kolom enkel de (kleine) woordenlijst vertalen en
+#   de indices overnemen
+#
+#   from payroll.kolomformaat import lees_personeelsbestand, schrijf_resultaten
+#   pb, extra = lees_personeelsbestand("personeel.parquet", sleutels=["werknemer_id"])
+#   netto, kost = pb.bereken()
+#   schrijf_resultaten("resultaten.parquet", netto, kost, extra, pb.regime_code)
+#
+#   python -m payroll.kolomformaat personeel.parquet resultaten.parquet --sleutel werknemer_id
+
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from parameters.bszb_2025 import REGIMES
+from parameters.register import Parameterset, STANDAARD, STANDAARD_JAAR, laad_parameters
+from payroll.personeelsbestand import Personeelsbestand, NUMERIEKE_KOLOMMEN
+
+IPC_EXTENSIES = (".arrow", ".feather", ".ipc")
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.compute
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError("pyarrow is vereist voor Parquet/Arrow-bestanden") from None
+    return pyarrow
+
+
+def _is_ipc(pad: str) -> bool:
+    return pad.lower().endswith(IPC_EXTENSIES)
+
+
+# -----------------------
+# Lezen
+# -----------------------
+def lees_tabel(pad: str, kolommen=None):
+    """
+    pyarrow.Table met (enkel) de gevraagde kolommen die in het bestand
+    voorkomen. IPC wordt memory-mapped zonder kopie geopend.
+    """
+    pa = _pyarrow()
+    if _is_ipc(pad):
+        tabel = pa.ipc.open_file(pa.memory_map(pad, "r")).read_all()
+        if kolommen is not None:
+            tabel = tabel.select([k for k in kolommen if k in tabel.column_names])
+        return tabel
+    schema = pa.parquet.read_schema(pad)
+    if kolommen is not None:
+        kolommen = [k for k in kolommen if k in schema.names]
+    return pa.parquet.read_table(pad, columns=kolommen, memory_map=True)
+
+
+def _naar_numpy(kolom) -> np.ndarray:
+    """Arrow-kolom → float64-array; zonder kopie als dat kan (één chunk, float64, geen nulls)."""
+    pa = _pyarrow()
+    if kolom.num_chunks == 1 and kolom.type == pa.float64() and kolom.null_count == 0:
+        return kolom.chunk(0).to_numpy(zero_copy_only=True)
+    kolom = kolom.cast(pa.float64())
+    if kolom.null_count:
+        raise ValueError(f"kolom bevat {kolom.null_count} lege waarden")
+    return kolom.to_numpy()
+
+
+def _regime_codes(kolom) -> np.ndarray:
+    """Regimekolom (tekst of dictionary) → int8-codes, via de woordenlijst i.p.v. per rij."""
+    pa = _pyarrow()
+    if pa.types.is_integer(kolom.type):
+        return kolom.to_numpy().astype(np.int8)
+    if not pa.types.is_dictionary(kolom.type):
+        kolom = pa.compute.dictionary_encode(kolom)
+    codes = np.empty(len(kolom), dtype=np.int8)
+    positie = 0
+    for chunk in kolom.chunks:
+        if chunk.null_count:
+            raise ValueError("regimekolom bevat lege waarden")
+        woorden = chunk.dictionary.to_pylist()
+        onbekend = set(woorden) - set(REGIMES)
+        if onbekend:
+            raise ValueError(f"Onbekend BBSZ-regime: {sorted(onbekend)[0]!r}")
+        vertaling = np.array([REGIMES.index(w) for w in woorden], dtype=np.int8)
+        codes[positie:positie + len(chunk)] = vertaling[chunk.indices.to_numpy()]
+        positie += len(chunk)
+    return codes
+
+
+def lees_personeelsbestand(pad: str, sleutels=()) -> tuple:
+    """
+    Personeelsbestand uit een Parquet- of Arrow-bestand met kolommen volgens de
+    velden van Bediende (ontbrekende kolommen krijgen de standaardwaarde).
+    Geeft (Personeelsbestand, {sleutel: numpy-array}) voor de gevraagde
+    extra kolommen (bv. een werknemer-ID), om mee terug te schrijven.
+    """
+    tabel = lees_tabel(pad, [*NUMERIEKE_KOLOMMEN, "regime", *sleutels])
+    ontbrekend = [k for k in sleutels if k not in tabel.column_names]
+    if ontbrekend:
+        raise ValueError(f"kolommen niet gevonden: {', '.join(ontbrekend)}")
+    if "bruto_maandloon" not in tabel.column_names:
+        raise ValueError("kolom bruto_maandloon ontbreekt")
+
+    kol = {k: _naar_numpy(tabel.column(k)) for k in NUMERIEKE_KOLOMMEN if k in tabel.column_names}
+    if "regime" in tabel.column_names:
+        kol["regime"] = _regime_codes(tabel.column("regime"))
+    extra = {k: tabel.column(k).to_numpy() for k in sleutels}
+    return Personeelsbestand(**kol), extra
+
+
+# -----------------------
+# Schrijven
+# -----------------------
+def _schrijf(pad: str, tabel):
+    pa = _pyarrow()
+    if _is_ipc(pad):
+        # Ongecomprimeerd: zo blijft teruglezen zero-copy
+        with pa.ipc.new_file(pad, tabel.schema) as f:
+            f.write_table(tabel)
+    else:
+        pa.parquet.write_table(tabel, pad)
+
+
+def _regime_kolom(regime_code):
+    pa = _pyarrow()
+    return pa.DictionaryArray.from_arrays(pa.array(np.asarray(regime_code, dtype=np.int8)), pa.array(REGIMES))
+
+
+def schrijf_personeelsbestand(pad: str, pb: Personeelsbestand, extra: dict | None = None):
+    """Invoerkolommen (+ extra kolommen vooraan) als Parquet/Arrow."""
+    pa = _pyarrow()
+    kolommen = {**(extra or {}), **pb.kolommen, "regime": _regime_kolom(pb.regime_code)}
+    _schrijf(pad, pa.table(kolommen))
+
+
+def schrijf_resultaten(pad: str, netto: dict, kost: dict, extra: dict | None = None, regime_code=None):
+    """
+    Netto- en loonkostvelden (uit Personeelsbestand.bereken) als kolombestand;
+    extra kolommen (sleutels) en het regime komen vooraan.
+    """
+    pa = _pyarrow()
+    kolommen = dict(extra or {})
+    if regime_code is not None:
+        kolommen["regime"] = _regime_kolom(regime_code)
+    kolommen.update(netto)
+    kolommen.update(kost)
+    _schrijf(pad, pa.table(kolommen))
+
+
+def verwerk_bestand(invoer: str, uitvoer: str, sleutels=(), params: Parameterset = STANDAARD,
+                    log=sys.stderr) -> int:
+    """invoer (Parquet/Arrow) → netto + loonkost → uitvoer (Parquet/Arrow). Geeft het aantal rijen."""
+    t0 = time.perf_counter()
+    pb, extra = lees_personeelsbestand(invoer, sleutels)
+    t1 = time.perf_counter()
+    netto, kost = pb.bereken(params)
+    t2 = time.perf_counter()
+    schrijf_resultaten(uitvoer, netto, kost, extra, pb.regime_code)
+    t3 = time.perf_counter()
+    if log is not None:
+        print(f"✅ {len(pb):,} rijen — lezen {t1 - t0:.2f}s, rekenen {t2 - t1:.2f}s, schrijven {t3 - t2:.2f}s "
+              f"→ {uitvoer}", file=log)
+    return len(pb)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m payroll.kolomformaat",
+        description="Bereken nettoloon en loonkost voor een personeelsbestand in Parquet- of Arrow-formaat.",
+    )
+    parser.add_argument("invoer", help="Parquet (.parquet) of Arrow IPC (.arrow/.feather)")
+    parser.add_argument("uitvoer", help="Parquet (.parquet) of Arrow IPC (.arrow/.feather)")
+    parser.add_argument("--sleutel", action="append", default=[], help="extra kolom om mee te nemen (herhaalbaar)")
+    parser.add_argument("--jaar", type=int, default=STANDAARD_JAAR, help=f"parameterjaar (standaard {STANDAARD_JAAR})")
+    args = parser.parse_args(argv)
+
+    try:
+        params = laad_parameters(args.jaar)
+    except ValueError as e:
+        parser.error(str(e))
+    verwerk_bestand(args.invoer, args.uitvoer, args.sleutel, params)
+
+
+if __name__ == "__main__":
+    main()
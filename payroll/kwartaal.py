@@ -0,0 +1,214 @@
+# payroll/kwartaal.py
+#
+# Kwartaalaangifte: BSZB, patronale RSZ en structurele vermindering per
+# werknemer en per werkgever per kwartaal, op basis van maandelijkse
+# loonhistorieken van een volledig personeelsbestand.
+#
+# Invoer: één rij per werknemer per maand met de kolommen werkgever,
+# werknemer_id, periode (JJJJ-MM), bruto_maandloon en optioneel
+# prestatiebreuk en regime.
+#
+# 1️⃣ groeperen per (werkgever, werknemer, kwartaal): kwartaalloon, aantal
+#    maanden, gemiddelde prestatiebreuk, regime van de laatste maand
+# 2️⃣ BSZB op het kwartaalloon (kwartaalgrenzen van bszb_2025), naast wat
+#    maandelijks ingehouden werd → regularisatie
+# 3️⃣ patronale RSZ op het kwartaalloon, min de structurele vermindering per
+#    kwartaal (bereken_R), nooit meer dan de patronale bijdrage
+# 4️⃣ optellen per (werkgever, kwartaal)
+#
+# ⚡ Alles gevectoriseerd: groepen via pd.factorize + np.unique, sommen via
+#    np.bincount; geen lus per werknemer of per groep.
+# ⚠️ Bij een onvolledig kwartaal (in- of uitdienst) wordt de structurele
+#    vermindering berekend op het gemiddelde maandloon en pro rata het aantal
+#    maanden toegekend; de BSZB volgt het werkelijke kwartaalloon.
+#
+#   python -m payroll.kwartaal lonen.csv -o aangifte.csv --detail per_werknemer.csv
+
+import argparse
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from parameters.bszb_2025 import REGIMES
+from parameters.register import Parameterset, STANDAARD, STANDAARD_JAAR, laad_parameters
+from payroll.vectorieel import _round2, bszb_vec, regime_codes, structurele_vermindering_kwartaal_vec
+
+KWARTAALVELDEN = ("kwartaalloon", "rsz_patronaal_bruto", "structurele_vermindering", "rsz_patronaal",
+                  "bszb_kwartaal", "bszb_ingehouden", "bszb_regularisatie")
+
+
+def _maanden(periode) -> np.ndarray:
+    """Periodes (JJJJ-MM of datum) → maandnummer jaar*12 + maand-1, per unieke waarde geparsed."""
+    codes, uniek = pd.factorize(pd.Series(periode), sort=False)
+    if (codes < 0).any():
+        raise ValueError("kolom periode bevat lege waarden")
+    datums = pd.to_datetime(pd.Series(uniek).astype(str), format="%Y-%m", errors="coerce")
+    if datums.isna().any():
+        datums = pd.to_datetime(pd.Series(uniek), errors="coerce")
+    if datums.isna().any():
+        fout = uniek[int(np.flatnonzero(datums.isna().to_numpy())[0])]
+        raise ValueError(f"periode moet JJJJ-MM zijn, niet {fout!r}")
+    maandnr = (datums.dt.year * 12 + datums.dt.month - 1).to_numpy(dtype=np.int64)
+    return maandnr[codes]
+
+
+def kwartaalaangifte(
+    lonen: pd.DataFrame,
+    werkgever: str = "werkgever",
+    werknemer: str = "werknemer_id",
+    periode: str = "periode",
+    categorie: int = 1,
+    RSZ_WG_PCT: float = 0.25,
+    params: Parameterset = STANDAARD,
+) -> tuple:
+    """
+    Maandelijkse loonhistorieken → (per werknemer per kwartaal, per werkgever per kwartaal).
+
+    Een ontbrekende werkgeverkolom betekent één werkgever; prestatiebreuk is
+    standaard 1.0 en regime "individueel". Een werknemer met twee rijen voor
+    dezelfde maand (bv. een correctie) telt met de som van beide. Bedragen in
+    de detailtabel zijn afgerond per werknemer, die per werkgever zijn de som
+    daarvan.
+    """
+    ontbrekend = [k for k in (werknemer, periode, "bruto_maandloon") if k not in lonen.columns]
+    if ontbrekend:
+        raise ValueError(f"kolommen niet gevonden: {', '.join(ontbrekend)}")
+    n = len(lonen)
+    bruto = lonen["bruto_maandloon"].to_numpy(dtype=np.float64)
+    mu = lonen["prestatiebreuk"].to_numpy(dtype=np.float64) if "prestatiebreuk" in lonen.columns else np.ones(n)
+    regime = regime_codes(lonen["regime"].to_numpy()) if "regime" in lonen.columns else np.zeros(n, np.int8)
+
+    # 1️⃣ groepsnummer per (werkgever, werknemer, kwartaal)
+    wg_code, wg_namen = (pd.factorize(lonen[werkgever], sort=True) if werkgever in lonen.columns
+                         else (np.zeros(n, np.int64), pd.Index([""])))
+    wn_code, wn_namen = pd.factorize(lonen[werknemer], sort=True)
+    maandnr = _maanden(lonen[periode])
+    kw = maandnr // 12 * 10 + maandnr % 12 // 3 + 1     # jaar*10 + kwartaal
+    sleutel = (wg_code.astype(np.int64) * len(wn_namen) + wn_code) * 100_000 + kw
+    uniek, groep = np.unique(sleutel, return_inverse=True)
+    G = len(uniek)
+
+    def som(x):
+        return np.bincount(groep, weights=x, minlength=G)
+
+    kwartaalloon = som(bruto)
+    # Aantal verschillende maanden (correctierijen voor dezelfde maand tellen één keer)
+    _, eerste = np.unique(groep * 1_000_000 + maandnr, return_index=True)
+    maanden = np.bincount(groep[eerste], minlength=G)
+    mu_gem = np.round(som(mu) / np.bincount(groep, minlength=G), 6)
+    # Regime van de laatste maand in het kwartaal (bij gelijke maand: de laatste rij)
+    laatste = np.zeros(G, dtype=np.int64)
+    np.maximum.at(laatste, groep, maandnr * n + np.arange(n))
+    regime_g = regime[laatste % n]
+
+    # 2️⃣ BSZB: kwartaalgrenzen toegepast op het kwartaalloon (maandloon = K/3)
+    bszb = bszb_vec(kwartaalloon / 3.0, regime_g, params=params.bszb)["bszb_kwartaal"]
+    ingehouden = som(bszb_vec(bruto, regime, params=params.bszb)["bszb_maand"])
+
+    # 3️⃣ patronale RSZ en structurele vermindering per kwartaal
+    rsz_bruto = _round2(kwartaalloon * RSZ_WG_PCT)
+    sv = structurele_vermindering_kwartaal_vec(categorie, kwartaalloon / maanden, mu_gem,
+                                               params=params.structureel)
+    sv = np.minimum(_round2(sv * maanden / 3.0), rsz_bruto)
+
+    wn_idx = (uniek // 100_000) % len(wn_namen)
+    detail = pd.DataFrame({
+        "werkgever": np.asarray(wg_namen)[uniek // 100_000 // len(wn_namen)],
+        werknemer: np.asarray(wn_namen)[wn_idx],
+        "kwartaal": [f"{k // 10}-Q{k % 10}" for k in (uniek % 100_000).tolist()],
+        "maanden": maanden,
+        "prestatiebreuk": mu_gem,
+        "regime": pd.Categorical.from_codes(regime_g, REGIMES),
+        "kwartaalloon": _round2(kwartaalloon),
+        "rsz_patronaal_bruto": rsz_bruto,
+        "structurele_vermindering": sv,
+        "rsz_patronaal": _round2(rsz_bruto - sv),
+        "bszb_kwartaal": bszb,
+        "bszb_ingehouden": _round2(ingehouden),
+        "bszb_regularisatie": _round2(bszb - ingehouden),
+    })
+
+    # 4️⃣ per werkgever en kwartaal: opnieuw factoriseren en optellen
+    wgk = (uniek // 100_000 // len(wn_namen)) * 100_000 + uniek % 100_000
+    wgk_uniek, wgk_groep = np.unique(wgk, return_inverse=True)
+    per_werkgever = pd.DataFrame({
+        "werkgever": np.asarray(wg_namen)[wgk_uniek // 100_000],
+        "kwartaal": [f"{k // 10}-Q{k % 10}" for k in (wgk_uniek % 100_000).tolist()],
+        "werknemers": np.bincount(wgk_groep, minlength=len(wgk_uniek)),
+        **{v: _round2(np.bincount(wgk_groep, weights=detail[v].to_numpy(), minlength=len(wgk_uniek)))
+           for v in KWARTAALVELDEN},
+    })
+    return detail, per_werkgever
+
+
+def synthetische_lonen(werknemers: int, werkgevers: int = 50, jaar: int = 2025, seed: int = 2025) -> pd.DataFrame:
+    """Twaalf maanden loonhistoriek per werknemer (met enkele in- en uitdiensttredingen) voor benchmarks."""
+    rng = np.random.default_rng(seed)
+    basis = np.round(rng.lognormal(np.log(3500.0), 0.35, werknemers).clip(1_500.0, 15_000.0), 2)
+    mu = rng.choice([1.0, 1.0, 1.0, 0.8, 0.5], werknemers)
+    regime = rng.integers(0, len(REGIMES), werknemers)
+    start = np.where(rng.random(werknemers) < 0.1, rng.integers(1, 13, werknemers), 1)
+    einde = np.where(rng.random(werknemers) < 0.1, rng.integers(1, 13, werknemers), 12)
+    wn, m = np.divmod(np.arange(werknemers * 12), 12)
+    m += 1
+    actief = (m >= start[wn]) & (m <= np.maximum(start, einde)[wn])
+    wn, m = wn[actief], m[actief]
+    return pd.DataFrame({
+        "werkgever": pd.Categorical.from_codes(wn % werkgevers, [f"WG{i:04d}" for i in range(werkgevers)]),
+        "werknemer_id": wn,
+        "periode": pd.Categorical.from_codes(m - 1, [f"{jaar}-{i:02d}" for i in range(1, 13)]),
+        "bruto_maandloon": np.round(basis[wn] * mu[wn] * (1 + 0.02 * (m >= 7)), 2),
+        "prestatiebreuk": mu[wn],
+        "regime": pd.Categorical.from_codes(regime[wn], REGIMES),
+    })
+
+
+def main(argv=None):
+    from payroll.batch import lees_in_blokken
+
+    parser = argparse.ArgumentParser(
+        prog="python -m payroll.kwartaal",
+        description="Kwartaalaangifte (BSZB, patronale RSZ, structurele vermindering) per werkgever.",
+    )
+    parser.add_argument("invoer", nargs="?", help="CSV of Excel met één rij per werknemer per maand")
+    parser.add_argument("-o", "--uitvoer", help="CSV per werkgever per kwartaal (standaard: scherm)")
+    parser.add_argument("--detail", metavar="PAD", help="CSV per werknemer per kwartaal")
+    parser.add_argument("--werkgever", default="werkgever", help="kolom met de werkgever")
+    parser.add_argument("--werknemer", default="werknemer_id", help="kolom met de werknemer")
+    parser.add_argument("--periode", default="periode", help="kolom met de maand (JJJJ-MM)")
+    parser.add_argument("--rsz-wg", type=float, default=0.25, help="patronale RSZ (standaard 0.25)")
+    parser.add_argument("--jaar", type=int, default=STANDAARD_JAAR, help=f"parameterjaar (standaard {STANDAARD_JAAR})")
+    parser.add_argument("--sep", default=",", help="scheidingsteken voor CSV")
+    parser.add_argument("--benchmark", type=int, metavar="N", help="synthetische historiek van N werknemers × 12 maanden")
+    args = parser.parse_args(argv)
+
+    try:
+        params = laad_parameters(args.jaar)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.benchmark:
+        lonen = synthetische_lonen(args.benchmark)
+    elif args.invoer:
+        lonen = pd.concat(lees_in_blokken(args.invoer, sep=args.sep), ignore_index=True)
+    else:
+        parser.error("geef een invoerbestand of --benchmark N")
+
+    t0 = time.perf_counter()
+    detail, per_werkgever = kwartaalaangifte(lonen, args.werkgever, args.werknemer, args.periode,
+                                             RSZ_WG_PCT=args.rsz_wg, params=params)
+    duur = time.perf_counter() - t0
+
+    if args.uitvoer:
+        per_werkgever.to_csv(args.uitvoer, index=False, sep=args.sep)
+    else:
+        print(per_werkgever.to_string(index=False))
+    if args.detail:
+        detail.to_csv(args.detail, index=False, sep=args.sep)
+    print(f"✅ {len(lonen):,} maandrijen → {len(detail):,} werknemerkwartalen, {len(per_werkgever):,} "
+          f"werkgeverkwartalen in {duur:.2f}s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
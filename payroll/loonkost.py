@@ -2,6 +2,8 @@
 
 from payroll.werknemer import Bediende
 from parameters.structurele_vermindering_2025 import bereken_structurele_vermindering_maand
+from parameters.register import Parameterset, STANDAARD
+from payroll.resultaten import Loonkostresultaat
 
 # Belgisch afronden op 2 cijfers (met klein epsilon-Dodging)
 def round2(x): 
@@ -12,8 +14,9 @@ def bereken_loonkost(
     b: Bediende,
     nettoloon_result: dict,
     categorie: int = 1,       # categorie structurele vermindering (1 = algemene categorie)
-    RSZ_WG_PCT: float = 0.25  # standaard patronale bijdrage: 25%
-) -> dict:
+    RSZ_WG_PCT: float = 0.25, # standaard patronale bijdrage: 25%
+    params: Parameterset = STANDAARD  # parameterjaar (zie parameters/register.py)
+) -> Loonkostresultaat:
     """
     Berekent de totale werkgeverskost voor een bediende.
 
@@ -28,7 +31,7 @@ def bereken_loonkost(
     ✅ Structurele vermindering als aftrek
 
     Return:
-    Dict met detail + totaal kost (per jaar en per maand)
+    Loonkostresultaat (gedraagt zich als dict) met detail + totaal kost (per jaar en per maand)
     """
 
     # Basismassa
@@ -45,7 +48,7 @@ def bereken_loonkost(
     kosten_eigen = b.maandelijkse_kostenvergoeding * 12.0  # fiscaal vrijgesteld, wel kosten
 
    # ✅ Structurele vermindering (aftrek werkgeverslasten)
-    sv_maand = bereken_structurele_vermindering_maand(categorie, b.bruto_maandloon, b.prestatiebreuk)
+    sv_maand = bereken_structurele_vermindering_maand(categorie, b.bruto_maandloon, b.prestatiebreuk, params.structureel)
     sv_jaar = sv_maand * 12.0
 
     # 🚫 Nooit meer aftrekken dan de totale patronale bijdrage
@@ -65,14 +68,14 @@ def bereken_loonkost(
     )
 
     # ✅ Resultaat rapporteren (ook per maand)
-    return {
-        "rsz_werkgever": round2(rsz_wg-sv_jaar),
-        "gv_werkgever": round2(gv_wg),
-        "ao_verzekering": round2(ao),
-        "maaltijdcheques_wg": round2(mg_wg),
-        "ecocheques": round2(ec),
-        "kosten_eigen": round2(kosten_eigen),
-        
-        "totaal_loonkost_jaar": round2(totaal_kost_jaar),
-        "totaal_loonkost_maand": round2(totaal_kost_jaar / 12.0),
-    }
+    return Loonkostresultaat(
+        rsz_werkgever=round2(rsz_wg-sv_jaar),
+        gv_werkgever=round2(gv_wg),
+        ao_verzekering=round2(ao),
+        maaltijdcheques_wg=round2(mg_wg),
+        ecocheques=round2(ec),
+        kosten_eigen=round2(kosten_eigen),
+
+        totaal_loonkost_jaar=round2(totaal_kost_jaar),
+        totaal_loonkost_maand=round2(totaal_kost_jaar / 12.0),
+    )
@@ -0,0 +1,233 @@
+# payroll/meting.py
+#
+# Opt-in tijdsmeting per rekenstap (werkbonus, personenbelasting, BSZB,
+# structurele vermindering, nettoloon, loonkost, maak_overzicht, ...).
+#
+# Uitgeschakeld kost dit niets: er staat geen enkele controle in de
+# rekenfuncties. Enkel binnen `with meet():` worden de functies in de
+# modules van payroll/ en parameters/ vervangen door een gemeten versie,
+# en bij het verlaten worden de originelen teruggezet.
+#
+#   from payroll.meting import meet
+#   with meet() as m:
+#       verwerk_bestand("personeel.csv", "resultaten.csv")
+#   print(m.tabel())          # of m.naar_json("meting.json")
+#
+# Per stap: aantal aanroepen, cumulatieve tijd en eigen tijd (zonder de tijd
+# in andere gemeten stappen). De eigen tijd van maak_overzicht en
+# verwerk_blok is dus de opbouw en opmaak van het DataFrame.
+#
+# Metingen mogen overlappen (genest, of in verschillende threads) en in
+# willekeurige volgorde eindigen: elke functie wordt per proces hooguit één
+# keer vervangen, die ene gemeten versie meldt elke aanroep aan alle actieve
+# metingen, en de laatste meting die stopt zet het origineel terug.
+#
+# Let op: meet() werkt per proces; workers van payroll.parallel/rapport
+# worden niet gemeten.
+
+import functools
+import importlib
+import json
+import sys
+import threading
+import time
+
+# (stap, module, functie)
+STAPPEN = (
+    ("werkbonus", "parameters.werkbonus_2025", "bereken_sociale_werkbonus"),
+    ("werkbonus", "parameters.werkbonus_2025", "bereken_fiscale_werkbonus"),
+    ("personenbelasting", "parameters.belasting_2025", "bereken_personenbelasting"),
+    ("bszb", "parameters.bszb_2025", "bereken_bszb"),
+    ("structurele_vermindering", "parameters.structurele_vermindering_2025", "bereken_structurele_vermindering_maand"),
+    ("nettoloon", "payroll.nettoloon", "bereken_nettoloon"),
+    ("loonkost", "payroll.loonkost", "bereken_loonkost"),
+    ("overzicht", "payroll.overzicht", "maak_overzicht"),
+    ("dataframe", "payroll.batch", "verwerk_blok"),
+    # Gevectoriseerde motor
+    ("werkbonus", "payroll.vectorieel", "sociale_werkbonus_vec"),
+    ("werkbonus", "payroll.vectorieel", "fiscale_werkbonus_vec"),
+    ("personenbelasting", "payroll.vectorieel", "personenbelasting_vec"),
+    ("bszb", "payroll.vectorieel", "bszb_vec"),
+    ("structurele_vermindering", "payroll.vectorieel", "structurele_vermindering_maand_vec"),
+    ("structurele_vermindering", "payroll.vectorieel", "structurele_vermindering_kwartaal_vec"),
+    ("nettoloon", "payroll.vectorieel", "bereken_nettoloon_batch"),
+    ("loonkost", "payroll.vectorieel", "bereken_loonkost_batch"),
+    # Centenmotor
+    ("nettoloon", "payroll.centen", "bereken_nettoloon_centen"),
+    ("loonkost", "payroll.centen", "bereken_loonkost_centen"),
+    ("batch", "payroll.centen", "bereken_batch_centen"),
+)
+
+# Procesbrede vervanging, gedeeld door alle actieve metingen
+_PATCH_LOCK = threading.Lock()
+_GEPATCHT = {}      # (module, functie) → [(module-object, attribuut, origineel), ...]
+_LUISTERAARS = {}   # (module, functie) → ((meting, stap), ...); leeg → origineel terugzetten
+
+
+def _gemeten_versie(sleutel, functie):
+    """Vervanger van `functie` die elke aanroep meldt aan de metingen die hem op dat moment volgen."""
+    naam = ".".join(sleutel)
+
+    @functools.wraps(functie)
+    def gemeten(*args, **kwargs):
+        luisteraars = _LUISTERAARS.get(sleutel, ())
+        if not luisteraars:     # aanroeper hield nog een verwijzing na het stoppen
+            return functie(*args, **kwargs)
+        for meting, _ in luisteraars:
+            meting._begin()
+        t0 = time.perf_counter()
+        try:
+            return functie(*args, **kwargs)
+        finally:
+            duur = time.perf_counter() - t0
+            for meting, stap in luisteraars:
+                meting._einde(stap, naam, duur)
+
+    return gemeten
+
+
+def _vervang(modulenaam: str, attribuut: str):
+    """Vervangt de functie overal waar ze staat; geeft de lijst vervangingen (None als de module ontbreekt)."""
+    try:
+        modules = [importlib.import_module(modulenaam)]
+    except ImportError:    # bv. pandas ontbreekt → maak_overzicht niet meten
+        return None
+    # `python -m payroll.batch`: de draaiende module is __main__, niet payroll.batch
+    hoofd = sys.modules.get("__main__")
+    if getattr(getattr(hoofd, "__spec__", None), "name", None) == modulenaam:
+        modules.append(hoofd)
+    vervangen = []
+    for module in modules:
+        origineel = getattr(module, attribuut)
+        gemeten = _gemeten_versie((modulenaam, attribuut), origineel)
+        # Ook overal waar de functie met `from ... import` binnengehaald werd
+        for naam, m in list(sys.modules.items()):
+            if m is None or not (naam.startswith(("payroll.", "parameters.")) or m is module):
+                continue
+            for veld, waarde in list(vars(m).items()):
+                if waarde is origineel:
+                    setattr(m, veld, gemeten)
+                    vervangen.append((m, veld, origineel))
+    return vervangen
+
+
+class Meting:
+    """
+    Context manager die de functies uit `stappen` tijdelijk vervangt door
+    gemeten versies. `callbacks` krijgen per aanroep (stap, functie, seconden).
+    """
+
+    def __init__(self, stappen=STAPPEN, callbacks=()):
+        self.stappen = stappen
+        self.callbacks = list(callbacks)
+        self.resultaat = {}            # "module.functie" → [stap, aanroepen, totaal_s, eigen_s]
+        self._lock = threading.Lock()
+        self._lokaal = threading.local()
+        self._sleutels = []            # (module, functie) die deze meting volgt
+        self._actief = False
+
+    def registreer(self, callback):
+        """Extra callback(stap, functie, seconden); ook tijdens een lopende meting."""
+        self.callbacks.append(callback)
+        return callback
+
+    # -----------------------
+    # Meten
+    # -----------------------
+    def _noteer(self, stap: str, naam: str, duur: float, eigen: float):
+        with self._lock:
+            r = self.resultaat.get(naam)
+            if r is None:
+                r = self.resultaat[naam] = [stap, 0, 0.0, 0.0]
+            r[1] += 1
+            r[2] += duur
+            r[3] += eigen
+        for callback in self.callbacks:
+            callback(stap, naam, duur)
+
+    def _begin(self):
+        # Per thread een stapel met de tijd die in geneste stappen doorgebracht werd
+        self._lokaal.__dict__.setdefault("stapel", []).append(0.0)
+
+    def _einde(self, stap: str, naam: str, duur: float):
+        stapel = self._lokaal.stapel
+        kinderen = stapel.pop()
+        if stapel:
+            stapel[-1] += duur
+        self._noteer(stap, naam, duur, duur - kinderen)
+
+    def __enter__(self):
+        if self._actief:
+            raise RuntimeError("deze meting loopt al")
+        self._actief = True
+        with _PATCH_LOCK:
+            for stap, modulenaam, attribuut in self.stappen:
+                sleutel = (modulenaam, attribuut)
+                if sleutel in self._sleutels:
+                    continue
+                if sleutel not in _GEPATCHT:
+                    vervangen = _vervang(modulenaam, attribuut)
+                    if vervangen is None:
+                        continue
+                    _GEPATCHT[sleutel] = vervangen
+                _LUISTERAARS[sleutel] = _LUISTERAARS.get(sleutel, ()) + ((self, stap),)
+                self._sleutels.append(sleutel)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        with _PATCH_LOCK:
+            for sleutel in self._sleutels:
+                over = tuple(l for l in _LUISTERAARS[sleutel] if l[0] is not self)
+                if over:
+                    _LUISTERAARS[sleutel] = over
+                    continue
+                # Laatste meting op deze functie: origineel terugzetten
+                del _LUISTERAARS[sleutel]
+                for m, veld, origineel in reversed(_GEPATCHT.pop(sleutel)):
+                    setattr(m, veld, origineel)
+        self._sleutels.clear()
+        self._actief = False
+
+    # -----------------------
+    # Rapporteren
+    # -----------------------
+    def samenvatting(self) -> list:
+        """Eén dict per gemeten functie, traagste (eigen tijd) eerst."""
+        rijen = [
+            {
+                "stap": stap, "functie": naam, "aanroepen": n,
+                "totaal_ms": totaal * 1e3, "eigen_ms": eigen * 1e3, "gemiddeld_us": totaal / n * 1e6,
+            }
+            for naam, (stap, n, totaal, eigen) in self.resultaat.items()
+        ]
+        return sorted(rijen, key=lambda r: -r["eigen_ms"])
+
+    def per_stap(self) -> dict:
+        """Eigen tijd (ms) en aanroepen opgeteld per stap."""
+        totaal = {}
+        for r in self.samenvatting():
+            t = totaal.setdefault(r["stap"], {"aanroepen": 0, "eigen_ms": 0.0})
+            t["aanroepen"] += r["aanroepen"]
+            t["eigen_ms"] += r["eigen_ms"]
+        return dict(sorted(totaal.items(), key=lambda kv: -kv[1]["eigen_ms"]))
+
+    def tabel(self) -> str:
+        rijen = self.samenvatting()
+        b = max([len("functie")] + [len(r["functie"]) for r in rijen]) + 2
+        regels = [f"{'stap':<26}{'functie':<{b}}{'aanroepen':>11}{'totaal ms':>12}{'eigen ms':>12}{'gem. µs':>11}"]
+        for r in rijen:
+            regels.append(f"{r['stap']:<26}{r['functie']:<{b}}{r['aanroepen']:>11,}"
+                          f"{r['totaal_ms']:>12.2f}{r['eigen_ms']:>12.2f}{r['gemiddeld_us']:>11.2f}")
+        return "\n".join(regels)
+
+    def naar_json(self, pad: str | None = None) -> str:
+        tekst = json.dumps({"functies": self.samenvatting(), "stappen": self.per_stap()}, indent=2)
+        if pad:
+            with open(pad, "w", encoding="utf-8") as f:
+                f.write(tekst)
+        return tekst
+
+
+def meet(stappen=STAPPEN, callbacks=()) -> Meting:
+    """Meting(...) als context manager: `with meet() as m: ...`."""
+    return Meting(stappen, callbacks)
@@ -0,0 +1,297 @@
+# payroll/opslag.py
+#
+# Lokale SQLite-opslag van loonruns, zodat historische vragen ("loonkost per
+# regime per maand over de laatste 3 jaar") zonder herberekening beantwoord
+# kunnen worden.
+#
+# Tabellen:
+#   runs        één rij per run: periode (JJJJ-MM), parameterjaar, tijdstip,
+#               aantal werknemers, vingerafdruk van invoer + parameters
+#   resultaten  één rij per werknemer per run: alle netto- en loonkostvelden
+#               + vingerafdruk van de invoerrij
+#   totalen     per run en regime: aantal werknemers + som van elk veld
+#   regimes     code → naam (resultaten bewaren de int-code)
+# Indexen op (werknemer, periode), (periode, regime) en run.
+#
+# ⚡ Wegschrijven gebeurt in één transactie per run met executemany in
+#    batches; bij meerdere runs voor dezelfde periode telt de laatste.
+# ⚡ Sommen en gemiddelden per periode/regime komen uit `totalen` (enkele
+#    rijen per run) i.p.v. uit alle resultaatrijen.
+#
+#   python -m payroll.opslag bewaar personeel.csv --periode 2025-01 --db loon.db
+#   python -m payroll.opslag rapport --db loon.db --van 2023-01 --veld totaal_loonkost_maand
+
+import argparse
+import hashlib
+import re
+import sqlite3
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from parameters.bszb_2025 import REGIMES
+from parameters.register import Parameterset, STANDAARD, STANDAARD_JAAR, laad_parameters
+from payroll.personeelsbestand import Personeelsbestand
+from payroll.resultaten import NETTO_VELDEN, KOST_VELDEN
+from payroll.incrementeel import parameter_vingerafdruk, vingerafdrukken
+
+STANDAARD_DB = "loonhistoriek.db"
+STANDAARD_SLEUTEL = "werknemer_id"
+BATCHGROOTTE = 50_000
+VELDEN = NETTO_VELDEN + KOST_VELDEN
+_PERIODE = re.compile(r"^\d{4}-(0[1-9]|1[0-2])$")
+
+# Enkel huidige runs: bij meerdere runs voor een periode de laatste
+_HUIDIGE_RUNS = "SELECT MAX(run_id) FROM runs GROUP BY periode"
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS runs (
+    run_id        INTEGER PRIMARY KEY,
+    periode       TEXT NOT NULL,
+    parameterjaar INTEGER NOT NULL,
+    tijdstip      TEXT NOT NULL,
+    aantal        INTEGER NOT NULL,
+    vingerafdruk  TEXT NOT NULL,
+    omschrijving  TEXT NOT NULL DEFAULT ''
+);
+CREATE TABLE IF NOT EXISTS regimes (
+    regime_code INTEGER PRIMARY KEY,
+    regime      TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS resultaten (
+    run_id       INTEGER NOT NULL REFERENCES runs(run_id) ON DELETE CASCADE,
+    werknemer    TEXT NOT NULL,
+    periode      TEXT NOT NULL,
+    regime_code  INTEGER NOT NULL,
+    vingerafdruk INTEGER NOT NULL,
+    {", ".join(f"{v} REAL NOT NULL" for v in VELDEN)}
+);
+CREATE TABLE IF NOT EXISTS totalen (
+    run_id      INTEGER NOT NULL REFERENCES runs(run_id) ON DELETE CASCADE,
+    periode     TEXT NOT NULL,
+    regime_code INTEGER NOT NULL,
+    werknemers  INTEGER NOT NULL,
+    {", ".join(f"{v} REAL NOT NULL" for v in VELDEN)},
+    PRIMARY KEY (run_id, regime_code)
+);
+CREATE INDEX IF NOT EXISTS idx_totalen_periode ON totalen (periode, regime_code);
+CREATE INDEX IF NOT EXISTS idx_resultaten_werknemer ON resultaten (werknemer, periode);
+CREATE INDEX IF NOT EXISTS idx_resultaten_periode_regime ON resultaten (periode, regime_code);
+CREATE INDEX IF NOT EXISTS idx_resultaten_run ON resultaten (run_id);
+CREATE INDEX IF NOT EXISTS idx_runs_periode ON runs (periode);
+"""
+
+
+def _controleer_periode(periode: str) -> str:
+    if not _PERIODE.match(periode or ""):
+        raise ValueError(f"periode moet JJJJ-MM zijn, niet {periode!r}")
+    return periode
+
+
+def _controleer_velden(velden) -> list:
+    velden = [velden] if isinstance(velden, str) else list(velden)
+    onbekend = [v for v in velden if v not in VELDEN]
+    if onbekend:
+        raise ValueError(f"Onbekende velden: {', '.join(onbekend)}; kies uit {', '.join(VELDEN)}")
+    return velden
+
+
+class Resultatenopslag:
+    """SQLite-bestand met loonruns; `with Resultatenopslag(pad) as db: ...`."""
+
+    def __init__(self, pad: str = STANDAARD_DB):
+        self.pad = pad
+        self.con = sqlite3.connect(pad)
+        self.con.execute("PRAGMA foreign_keys = ON")
+        self.con.execute("PRAGMA journal_mode = WAL")
+        self.con.execute("PRAGMA synchronous = NORMAL")
+        with self.con:
+            self.con.executescript(_SCHEMA)
+            self.con.executemany("INSERT OR IGNORE INTO regimes VALUES (?, ?)", enumerate(REGIMES))
+
+    def close(self):
+        self.con.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # -----------------------
+    # Wegschrijven
+    # -----------------------
+    def bewaar_run(self, pb: Personeelsbestand, netto: dict, kost: dict, periode: str, werknemers=None,
+                   params: Parameterset = STANDAARD, omschrijving: str = "", batchgrootte: int = BATCHGROOTTE) -> int:
+        """
+        Bewaart de resultaten van pb.bereken(params) voor `periode` (JJJJ-MM).
+        werknemers: ID per rij (standaard het rijnummer). Geeft het run_id.
+        """
+        _controleer_periode(periode)
+        n = len(pb)
+        werknemers = [str(w) for w in (range(n) if werknemers is None else werknemers)]
+        if len(werknemers) != n:
+            raise ValueError("aantal werknemer-ID's verschilt van het aantal rijen")
+
+        afdrukken = vingerafdrukken(pb, parameter_vingerafdruk(params))
+        run_afdruk = hashlib.blake2b(afdrukken.tobytes(), digest_size=16).hexdigest()
+        kolommen = [afdrukken.view(np.int64).tolist()] + [
+            np.asarray((netto if v in netto else kost)[v], dtype=np.float64).tolist() for v in VELDEN
+        ]
+        regime = pb.regime_code.tolist()
+        sql = f"INSERT INTO resultaten VALUES ({', '.join('?' * (5 + len(VELDEN)))})"
+
+        # Totalen per regime (numpy, vóór het wegschrijven)
+        aantal = np.bincount(pb.regime_code, minlength=len(REGIMES))
+        sommen = [np.bincount(pb.regime_code, weights=kolommen[1 + j], minlength=len(REGIMES))
+                  for j in range(len(VELDEN))]
+        totalen = [(code, int(aantal[code]), *(float(s[code]) for s in sommen))
+                   for code in range(len(REGIMES)) if aantal[code]]
+
+        with self.con:  # één transactie: een afgebroken run laat niets achter
+            run_id = self.con.execute(
+                "INSERT INTO runs (periode, parameterjaar, tijdstip, aantal, vingerafdruk, omschrijving) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (periode, params.jaar, datetime.now().isoformat(timespec="seconds"), n, run_afdruk, omschrijving),
+            ).lastrowid
+            for begin in range(0, n, batchgrootte):
+                einde = min(begin + batchgrootte, n)
+                self.con.executemany(sql, zip(
+                    [run_id] * (einde - begin), werknemers[begin:einde], [periode] * (einde - begin),
+                    regime[begin:einde], *(k[begin:einde] for k in kolommen),
+                ))
+            self.con.executemany(
+                f"INSERT INTO totalen VALUES ({', '.join('?' * (4 + len(VELDEN)))})",
+                [(run_id, periode, *t) for t in totalen],
+            )
+        return run_id
+
+    def verwijder_run(self, run_id: int):
+        with self.con:
+            self.con.execute("DELETE FROM totalen WHERE run_id = ?", (run_id,))
+            self.con.execute("DELETE FROM resultaten WHERE run_id = ?", (run_id,))
+            self.con.execute("DELETE FROM runs WHERE run_id = ?", (run_id,))
+
+    # -----------------------
+    # Opvragen
+    # -----------------------
+    def runs(self) -> pd.DataFrame:
+        return pd.read_sql_query("SELECT * FROM runs ORDER BY periode, run_id", self.con)
+
+    def vingerafdruk_bestaat(self, pb: Personeelsbestand, periode: str, params: Parameterset = STANDAARD) -> bool:
+        """True als exact deze invoer met deze parameters al voor `periode` bewaard is."""
+        afdruk = hashlib.blake2b(vingerafdrukken(pb, parameter_vingerafdruk(params)).tobytes(),
+                                 digest_size=16).hexdigest()
+        rij = self.con.execute("SELECT 1 FROM runs WHERE periode = ? AND vingerafdruk = ?", (periode, afdruk))
+        return rij.fetchone() is not None
+
+    def aggregeer(self, velden=("totaal_loonkost_maand",), per=("periode", "regime"), van: str | None = None,
+                  tot: str | None = None, functie: str = "SUM") -> pd.DataFrame:
+        """
+        Geaggregeerde velden (SUM/AVG/MIN/MAX) per periode en/of regime over
+        de huidige runs, met het aantal werknemers. van/tot: JJJJ-MM (inclusief).
+        """
+        velden = _controleer_velden(velden)
+        functie = functie.upper()
+        if functie not in ("SUM", "AVG", "MIN", "MAX"):
+            raise ValueError("functie moet SUM, AVG, MIN of MAX zijn")
+        groepen = {"periode": "r.periode", "regime": "g.regime"}
+        onbekend = [p for p in per if p not in groepen]
+        if onbekend:
+            raise ValueError(f"kan enkel groeperen per periode en/of regime, niet {', '.join(onbekend)}")
+
+        # SUM/AVG uit de totalen per run en regime; MIN/MAX vragen de afzonderlijke rijen
+        tabel = "totalen" if functie in ("SUM", "AVG") else "resultaten"
+        waar, args = [f"r.run_id IN ({_HUIDIGE_RUNS})"], []
+        if van:
+            waar.append("r.periode >= ?")
+            args.append(_controleer_periode(van))
+        if tot:
+            waar.append("r.periode <= ?")
+            args.append(_controleer_periode(tot))
+        kolommen = [f"{groepen[p]} AS {p}" for p in per]
+        if tabel == "totalen":
+            kolommen.append("SUM(r.werknemers) AS werknemers")
+            if functie == "SUM":
+                kolommen += [f"SUM(r.{v}) AS {v}" for v in velden]
+            else:
+                kolommen += [f"SUM(r.{v}) / SUM(r.werknemers) AS {v}" for v in velden]
+        else:
+            kolommen.append("COUNT(*) AS werknemers")
+            kolommen += [f"{functie}(r.{v}) AS {v}" for v in velden]
+        sql = f"SELECT {', '.join(kolommen)} FROM {tabel} r JOIN regimes g USING (regime_code) WHERE {' AND '.join(waar)}"
+        if per:
+            sql += f" GROUP BY {', '.join(groepen[p] for p in per)} ORDER BY {', '.join(groepen[p] for p in per)}"
+        return pd.read_sql_query(sql, self.con, params=args)
+
+    def per_regime_per_maand(self, veld: str = "totaal_loonkost_maand", van: str | None = None,
+                             tot: str | None = None) -> pd.DataFrame:
+        """Draaitabel: periode × regime → som van `veld`."""
+        df = self.aggregeer((veld,), ("periode", "regime"), van, tot)
+        return df.pivot(index="periode", columns="regime", values=veld).fillna(0.0)
+
+    def historiek(self, werknemer, velden=("nettoloon_maand", "totaal_loonkost_maand")) -> pd.DataFrame:
+        """Huidige resultaten van één werknemer over alle periodes."""
+        velden = _controleer_velden(velden)
+        sql = (f"SELECT r.periode, g.regime, {', '.join('r.' + v for v in velden)} FROM resultaten r "
+               f"JOIN regimes g USING (regime_code) WHERE r.werknemer = ? AND r.run_id IN ({_HUIDIGE_RUNS}) "
+               "ORDER BY r.periode")
+        return pd.read_sql_query(sql, self.con, params=[str(werknemer)])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m payroll.opslag",
+        description="Loonruns bewaren in en opvragen uit een SQLite-historiek.",
+    )
+    parser.add_argument("--db", default=STANDAARD_DB, help=f"SQLite-bestand (standaard {STANDAARD_DB})")
+    sub = parser.add_subparsers(dest="opdracht", required=True)
+
+    p = sub.add_parser("bewaar", help="personeelsbestand berekenen en de resultaten bewaren")
+    p.add_argument("invoer", help="CSV of Excel met één rij per werknemer")
+    p.add_argument("--periode", required=True, help="JJJJ-MM")
+    p.add_argument("--sleutel", default=STANDAARD_SLEUTEL, help="kolom met het werknemer-ID")
+    p.add_argument("--jaar", type=int, default=STANDAARD_JAAR, help=f"parameterjaar (standaard {STANDAARD_JAAR})")
+    p.add_argument("--omschrijving", default="")
+    p.add_argument("--sep", default=",", help="scheidingsteken voor CSV")
+    p.add_argument("--forceer", action="store_true", help="ook bewaren als een identieke run al bestaat")
+
+    r = sub.add_parser("rapport", help="geaggregeerde resultaten per periode en regime")
+    r.add_argument("--veld", default="totaal_loonkost_maand", choices=VELDEN)
+    r.add_argument("--van", help="JJJJ-MM")
+    r.add_argument("--tot", help="JJJJ-MM")
+    args = parser.parse_args(argv)
+
+    with Resultatenopslag(args.db) as db:
+        if args.opdracht == "bewaar":
+            from payroll.batch import lees_in_blokken
+            try:
+                params = laad_parameters(args.jaar)
+                _controleer_periode(args.periode)
+            except ValueError as e:
+                parser.error(str(e))
+            df = pd.concat(lees_in_blokken(args.invoer, sep=args.sep), ignore_index=True)
+            pb = Personeelsbestand.uit_dataframe(df)
+            werknemers = df[args.sleutel].tolist() if args.sleutel in df.columns else None
+            if not args.forceer and db.vingerafdruk_bestaat(pb, args.periode, params):
+                print(f"ℹ️ identieke run voor {args.periode} is al bewaard; niets gedaan (--forceer om toch te "
+                      "bewaren)", file=sys.stderr)
+                return
+            t0 = time.perf_counter()
+            netto, kost = pb.bereken(params)
+            run_id = db.bewaar_run(pb, netto, kost, args.periode, werknemers, params, args.omschrijving)
+            print(f"✅ run {run_id}: {len(pb):,} werknemers voor {args.periode} bewaard in "
+                  f"{time.perf_counter() - t0:.2f}s → {args.db}", file=sys.stderr)
+        else:
+            try:
+                tabel = db.per_regime_per_maand(args.veld, args.van, args.tot)
+            except ValueError as e:
+                parser.error(str(e))
+            print(tabel.round(2).to_string())
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 # payroll/overzicht.py
 
+from parameters.register import Parameterset, STANDAARD
 from payroll.werknemer import Bediende
 from payroll.nettoloon import bereken_nettoloon
 from payroll.loonkost import bereken_loonkost
@@ -13,15 +14,16 @@ def fmt_eur_be(x: float, signed: bool = True) -> str:
     return f"€ {s}"
 
 
-def maak_overzicht(b: Bediende, toon_per_maand: bool = True):
+def maak_overzicht(b: Bediende, toon_per_maand: bool = True, params: Parameterset = STANDAARD):
     """
     Maakt één tabel (pandas DataFrame) met alle relevante looncomponenten.
     toon_per_maand=True → alle bedragen per maand
     anders toon_per_maand=False → per jaar
+    params → parameterjaar (zie parameters/register.py)
     """
     # ✅ Berekeningen ophalen
-    netto = bereken_nettoloon(b)
-    kost = bereken_loonkost(b, netto)
+    netto = bereken_nettoloon(b, params)
+    kost = bereken_loonkost(b, netto, params=params)
 
     rows = []
     label = "maand" if toon_per_maand else "jaar"
@@ -102,9 +104,12 @@ def export_to_csv(df, path: str):
     df.to_csv(path, index=False)
 
 def export_to_excel(df, path: str):
-    """Exporteert naar Excel indien openpyxl beschikbaar is"""
+    """
+    Exporteert naar Excel (vereist openpyxl). Voor volledige
+    personeelsbestanden: payroll.export.StreamExport.
+    """
     try:
-        import openpyxl
+        import openpyxl  # noqa: F401
     except ImportError:
-        pass
-    df.to_excel(path, index=False)
+        raise ImportError("openpyxl is vereist om naar Excel te exporteren") from None
+    df.to_excel(path, index=False, engine="openpyxl")
@@ -0,0 +1,165 @@
+# payroll/parallel.py
+#
+# Personeelsbestand verdeeld over een procespool (alle cores).
+#
+# De invoerkolommen worden één keer naar gedeeld geheugen gekopieerd; elke
+# worker koppelt daar bij het opstarten aan en krijgt per taak enkel een
+# (begin, einde)-bereik. Resultaten schrijft de worker rechtstreeks op de
+# juiste rijen van een gedeelde uitvoermatrix, zodat er niets gepickled wordt
+# en de volgorde vanzelf behouden blijft.
+#
+#   from payroll.parallel import bereken_parallel
+#   netto, kost = bereken_parallel(pb, workers=32, blokgrootte=100_000)
+#
+#   python -m payroll.parallel --werknemers 2000000 --workers 1 2 4 8
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from parameters.register import Parameterset, STANDAARD
+from payroll.personeelsbestand import Personeelsbestand, NUMERIEKE_KOLOMMEN
+from payroll.vectorieel import bereken_batch
+from payroll.resultaten import NETTO_VELDEN, KOST_VELDEN, Nettoresultaat, Loonkostresultaat, Resultatentabel
+
+STANDAARD_BLOKGROOTTE = 100_000
+MOTOREN = ("vectorieel", "scalair")
+
+
+# Toestand per workerproces (gezet door _init_worker)
+_WORKER = {}
+
+
+def _koppel(naam: str):
+    """Bestaand gedeeld geheugenblok openen zonder het opnieuw te laten opruimen."""
+    try:
+        return shared_memory.SharedMemory(name=naam, track=False)   # Python ≥ 3.13
+    except TypeError:
+        return shared_memory.SharedMemory(name=naam)
+
+
+def _init_worker(invoer_naam, regime_naam, uitvoer_naam, n, params, motor):
+    blokken = [_koppel(naam) for naam in (invoer_naam, regime_naam, uitvoer_naam)]
+    _WORKER.update(
+        blokken=blokken,  # referentie houden, anders wordt het geheugen gesloten
+        invoer=np.ndarray((len(NUMERIEKE_KOLOMMEN), n), dtype=np.float64, buffer=blokken[0].buf),
+        regime=np.ndarray((n,), dtype=np.int8, buffer=blokken[1].buf),
+        uitvoer=np.ndarray((len(NETTO_VELDEN) + len(KOST_VELDEN), n), dtype=np.float64, buffer=blokken[2].buf),
+        params=params,      # de Parameterset zelf, ook een aangepaste (picklebaar, zie parameters/structuren.py)
+        motor=motor,
+    )
+
+
+def _bereken_shard(begin: int, einde: int) -> int:
+    w = _WORKER
+    kolommen = {k: w["invoer"][j, begin:einde] for j, k in enumerate(NUMERIEKE_KOLOMMEN)}
+    uit = w["uitvoer"][:, begin:einde]
+
+    if w["motor"] == "vectorieel":
+        netto, kost = bereken_batch(regime=w["regime"][begin:einde], params=w["params"], **kolommen)
+        # Resultatentabels: velden in dezelfde volgorde als de rijen van de uitvoermatrix
+        uit[:len(NETTO_VELDEN)] = netto.matrix
+        uit[len(NETTO_VELDEN):] = kost.matrix
+    else:
+        # Scalaire referentie: per bediende bereken_nettoloon/bereken_loonkost
+        from payroll.nettoloon import bereken_nettoloon
+        from payroll.loonkost import bereken_loonkost
+
+        shard = Personeelsbestand._uit_kolommen(kolommen, w["regime"][begin:einde])
+        for i, rij in enumerate(shard):
+            b = rij.naar_bediende()
+            netto = bereken_nettoloon(b, w["params"])
+            kost = bereken_loonkost(b, netto, params=w["params"])
+            uit[:, i] = [netto[v] for v in NETTO_VELDEN] + [kost[v] for v in KOST_VELDEN]
+    return einde - begin
+
+
+def bereken_parallel(
+    pb: Personeelsbestand,
+    workers: int | None = None,
+    blokgrootte: int = STANDAARD_BLOKGROOTTE,
+    params: Parameterset = STANDAARD,
+    motor: str = "vectorieel",
+    mp_context=None,
+):
+    """
+    Zelfde resultaat als pb.bereken(params), maar verdeeld over `workers`
+    processen (standaard: alle cores) in shards van `blokgrootte` rijen.
+    motor="scalair" rekent in de workers per Bediende met bereken_nettoloon/
+    bereken_loonkost i.p.v. met de gevectoriseerde motor.
+    mp_context: multiprocessing-context voor de pool (bv. get_context("spawn")).
+    """
+    if motor not in MOTOREN:
+        raise ValueError(f"Onbekende motor {motor!r}; kies uit {', '.join(MOTOREN)}")
+    if blokgrootte <= 0:
+        raise ValueError("blokgrootte moet positief zijn")
+    workers = workers or os.cpu_count() or 1
+    n = len(pb)
+    grenzen = list(range(0, n, blokgrootte)) + [n]
+    shards = list(zip(grenzen[:-1], grenzen[1:]))
+    workers = max(1, min(workers, len(shards)))
+
+    aantal_velden = len(NETTO_VELDEN) + len(KOST_VELDEN)
+    blokken = [
+        shared_memory.SharedMemory(create=True, size=max(1, len(NUMERIEKE_KOLOMMEN) * n * 8)),
+        shared_memory.SharedMemory(create=True, size=max(1, n)),
+        shared_memory.SharedMemory(create=True, size=max(1, aantal_velden * n * 8)),
+    ]
+    try:
+        invoer = np.ndarray((len(NUMERIEKE_KOLOMMEN), n), dtype=np.float64, buffer=blokken[0].buf)
+        for j, k in enumerate(NUMERIEKE_KOLOMMEN):
+            invoer[j] = pb.kolommen[k]
+        np.ndarray((n,), dtype=np.int8, buffer=blokken[1].buf)[:] = pb.regime_code
+        uitvoer = np.ndarray((aantal_velden, n), dtype=np.float64, buffer=blokken[2].buf)
+
+        init = (blokken[0].name, blokken[1].name, blokken[2].name, n, params, motor)
+        with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context, initializer=_init_worker,
+                                 initargs=init) as pool:
+            verwerkt = sum(pool.map(_bereken_shard, *zip(*shards))) if shards else 0
+        if verwerkt != n:
+            raise RuntimeError(f"{verwerkt} van {n} rijen verwerkt")
+
+        # Uit het gedeelde geheugen kopiëren vóór het wordt vrijgegeven
+        resultaat = uitvoer.copy()
+        del invoer, uitvoer
+    finally:
+        for blok in blokken:
+            blok.close()
+            blok.unlink()
+
+    # Resultatentabels zoals bereken_batch: views op de gekopieerde uitvoermatrix
+    netto = Resultatentabel(NETTO_VELDEN, soort=Nettoresultaat, matrix=resultaat[:len(NETTO_VELDEN)])
+    kost = Resultatentabel(KOST_VELDEN, soort=Loonkostresultaat, matrix=resultaat[len(NETTO_VELDEN):])
+    return netto, kost
+
+
+def main(argv=None):
+    import argparse
+    import time
+
+    from payroll.benchmark import synthetisch_bestand
+
+    parser = argparse.ArgumentParser(
+        prog="python -m payroll.parallel",
+        description="Meet de schaalbaarheid van bereken_parallel over verschillende aantallen workers.",
+    )
+    parser.add_argument("--werknemers", type=int, default=2_000_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8, os.cpu_count() or 1])
+    parser.add_argument("--blok", type=int, default=STANDAARD_BLOKGROOTTE, help="rijen per shard")
+    parser.add_argument("--motor", choices=MOTOREN, default="vectorieel")
+    args = parser.parse_args(argv)
+
+    pb = synthetisch_bestand(args.werknemers)
+    basis = None
+    for w in sorted(set(args.workers)):
+        t0 = time.perf_counter()
+        bereken_parallel(pb, workers=w, blokgrootte=args.blok, motor=args.motor)
+        duur = time.perf_counter() - t0
+        basis = basis or duur * w
+        print(f"{w:>3} workers: {args.werknemers / duur:>14,.0f} rijen/s  (efficiëntie {basis / (duur * w):.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+# payroll/personeelsbestand.py
+#
+# Kolomgewijze opslag (struct-of-arrays) van een volledig personeelsbestand.
+# Eén getypeerde NumPy-kolom per veld van Bediende i.p.v. één object per
+# werknemer; het regime wordt categorisch gecodeerd (index in REGIMES).
+
+import numpy as np
+
+from parameters.bszb_2025 import REGIMES
+from parameters.register import Parameterset, STANDAARD
+from payroll.werknemer import Bediende
+from payroll.vectorieel import regime_codes, bereken_batch
+
+# Alle numerieke velden van Bediende (regime apart, als code)
+NUMERIEKE_KOLOMMEN = tuple(k for k in Bediende.__slots__ if k != "regime")
+
+
+class BediendeRij:
+    """
+    Lichte 'view' op één rij van een Personeelsbestand.
+    Gedraagt zich als een Bediende voor de bestaande scalaire functies
+    (bereken_nettoloon, bereken_loonkost, maak_overzicht), zonder data te kopiëren.
+    """
+    __slots__ = ("_bestand", "_i")
+
+    def __init__(self, bestand: "Personeelsbestand", i: int):
+        self._bestand = bestand
+        self._i = i
+
+    def _waarde(self, naam):
+        return float(self._bestand.kolommen[naam][self._i])
+
+    bruto_maandloon = property(lambda self: self._waarde("bruto_maandloon"))
+    prestatiebreuk = property(lambda self: self._waarde("prestatiebreuk"))
+    MG_WG_jaar = property(lambda self: self._waarde("MG_WG_jaar"))
+    MG_WN_jaar = property(lambda self: self._waarde("MG_WN_jaar"))
+    EC_jaar = property(lambda self: self._waarde("EC_jaar"))
+    GV_WG_pct = property(lambda self: self._waarde("GV_WG_pct"))
+    AO_pct = property(lambda self: self._waarde("AO_pct"))
+    maandelijkse_kostenvergoeding = property(lambda self: self._waarde("maandelijkse_kostenvergoeding"))
+
+    @property
+    def bruto_jaarloon(self):
+        return self.bruto_maandloon * 12
+
+    @property
+    def regime(self):
+        return REGIMES[self._bestand.regime_code[self._i]]
+
+    def naar_bediende(self) -> Bediende:
+        """Volwaardige (losse) Bediende met dezelfde waarden."""
+        return Bediende(**{k: getattr(self, k) for k in Bediende.__slots__})
+
+    def __repr__(self):
+        return f"BediendeRij({self._i}: bruto={self.bruto_maandloon} EUR/maand, prestatiebreuk={self.prestatiebreuk})"
+
+
+class Personeelsbestand:
+    """
+    Struct-of-arrays voor een volledig personeelsbestand.
+
+    - numerieke velden: float64-kolommen (zelfde namen als bij Bediende)
+    - regime: int8-code per werknemer (index in REGIMES)
+
+    pb[i] geeft een BediendeRij (view), pb[a:b] een nieuw bestand dat de
+    onderliggende kolommen deelt.
+    """
+    __slots__ = ("kolommen", "regime_code")
+
+    def __init__(
+        self,
+        bruto_maandloon,
+        prestatiebreuk=1.0,
+        MG_WG_jaar=0.0,
+        MG_WN_jaar=0.0,
+        EC_jaar=0.0,
+        GV_WG_pct=0.0,
+        AO_pct=0.0,
+        maandelijkse_kostenvergoeding=0.0,
+        regime="individueel",
+    ):
+        bruto = np.asarray(bruto_maandloon, dtype=np.float64)
+        if bruto.ndim != 1:
+            raise ValueError("bruto_maandloon moet een 1D-reeks zijn")
+        n = bruto.shape[0]
+        waarden = dict(
+            prestatiebreuk=prestatiebreuk, MG_WG_jaar=MG_WG_jaar, MG_WN_jaar=MG_WN_jaar, EC_jaar=EC_jaar,
+            GV_WG_pct=GV_WG_pct, AO_pct=AO_pct, maandelijkse_kostenvergoeding=maandelijkse_kostenvergoeding,
+        )
+        self.kolommen = {"bruto_maandloon": bruto}
+        for naam, x in waarden.items():
+            # Scalars worden uitgerold naar een volledige kolom
+            self.kolommen[naam] = np.ascontiguousarray(np.broadcast_to(np.asarray(x, dtype=np.float64), (n,)))
+        self.regime_code = np.ascontiguousarray(np.broadcast_to(regime_codes(regime), (n,)))
+
+    # -----------------------
+    # Constructie
+    # -----------------------
+    @classmethod
+    def uit_bedienden(cls, bedienden):
+        """Bouwt een bestand op uit bestaande Bediende-objecten."""
+        bedienden = list(bedienden)
+        kol = {k: np.fromiter((getattr(b, k) for b in bedienden), dtype=np.float64, count=len(bedienden))
+               for k in NUMERIEKE_KOLOMMEN}
+        return cls(regime=[b.regime for b in bedienden], **kol)
+
+    @classmethod
+    def uit_dataframe(cls, df):
+        """
+        Bouwt een bestand op uit een DataFrame met kolommen volgens de velden
+        van Bediende. Ontbrekende kolommen krijgen de standaardwaarde.
+        """
+        kol = {k: df[k].to_numpy(dtype=np.float64) for k in NUMERIEKE_KOLOMMEN if k in df.columns}
+        if "regime" in df.columns:
+            kol["regime"] = df["regime"].to_numpy()
+        return cls(**kol)
+
+    @classmethod
+    def _uit_kolommen(cls, kolommen, regime_code):
+        pb = cls.__new__(cls)
+        pb.kolommen = kolommen
+        pb.regime_code = regime_code
+        return pb
+
+    # -----------------------
+    # Toegang
+    # -----------------------
+    def __len__(self):
+        return self.regime_code.shape[0]
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return self._uit_kolommen({k: v[i] for k, v in self.kolommen.items()}, self.regime_code[i])
+        n = len(self)
+        if not -n <= i < n:
+            raise IndexError("rij buiten bereik")
+        return BediendeRij(self, i % n)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield BediendeRij(self, i)
+
+    def __getattr__(self, naam):
+        # pb.bruto_maandloon → volledige kolom
+        if naam in Personeelsbestand.__slots__:
+            raise AttributeError(naam)
+        try:
+            return self.kolommen[naam]
+        except KeyError:
+            raise AttributeError(naam) from None
+
+    @property
+    def regime(self):
+        """Regimenamen als array (wordt enkel op vraag gedecodeerd)."""
+        return np.asarray(REGIMES, dtype=object)[self.regime_code]
+
+    @property
+    def nbytes(self):
+        return sum(v.nbytes for v in self.kolommen.values()) + self.regime_code.nbytes
+
+    def __repr__(self):
+        return f"Personeelsbestand({len(self)} werknemers, {self.nbytes / 1e6:.1f} MB)"
+
+    # -----------------------
+    # Berekeningen / export
+    # -----------------------
+    def bereken(self, params: Parameterset = STANDAARD):
+        """Nettoloon en loonkost voor alle werknemers → (netto, kost), Resultatentabels (dicts van arrays)."""
+        return bereken_batch(regime=self.regime_code, params=params, **self.kolommen)
+
+    def naar_dataframe(self):
+        import pandas as pd
+        df = pd.DataFrame(self.kolommen)
+        df["regime"] = pd.Categorical.from_codes(self.regime_code, categories=list(REGIMES))
+        return df
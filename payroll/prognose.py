@@ -0,0 +1,215 @@
+# payroll/prognose.py
+#
+# Monte Carlo-prognose van de totale werkgeverskost van een personeelsbestand.
+#
+# Per scenario en per jaar:
+# 1️⃣ indexering: één trekking per scenario-jaar (geldt voor alle lonen)
+# 2️⃣ uitstroom: elke werknemer vertrekt met kans `uitstroom`
+# 3️⃣ aanwerving: Poisson(aanwerving × personeelsbestand) nieuwe werknemers,
+#    met het profiel van een willekeurige huidige werknemer (geïndexeerd)
+# 4️⃣ deeltijds: voltijdse werknemers gaan met kans `deeltijd` naar
+#    `deeltijdse_breuk` (bruto en voordelen pro rata)
+# → totaal_loonkost_jaar van alle actieve werknemers, gevectoriseerd.
+#
+# Alle scenario's × werknemers vormen één grote matrix die in blokken van
+# scenario's berekend wordt (max_cellen), zodat het geheugen begrensd blijft.
+# Elk scenario heeft vaste plaatsen voor werknemers: vertrekkers laten een
+# plaats vrij, nieuwe werknemers vullen vrije plaatsen op.
+#
+# ⚠️ De parameters van het huidige jaar gelden voor alle prognosejaren
+#    (schijven en grenzen worden niet mee geïndexeerd).
+#
+#   python -m payroll.prognose personeel.csv --scenarios 10000 --jaren 3
+
+import argparse
+import json
+import sys
+import time
+
+import numpy as np
+
+from parameters.register import Parameterset, STANDAARD, STANDAARD_JAAR, laad_parameters
+from payroll.personeelsbestand import Personeelsbestand
+from payroll.vectorieel import bereken_loonkost_batch
+
+STANDAARD_PERCENTIELEN = (5, 25, 50, 75, 95)
+MAX_CELLEN = 1_000_000      # scenario's × plaatsen per blok
+SEED = 2025
+
+# Velden die voor de loonkost nodig zijn; bedragen schalen mee bij een andere prestatiebreuk
+_KOLOMMEN = ("bruto_maandloon", "prestatiebreuk", "MG_WG_jaar", "EC_jaar", "GV_WG_pct", "AO_pct",
+             "maandelijkse_kostenvergoeding")
+_PRO_RATA = ("bruto_maandloon", "MG_WG_jaar", "EC_jaar")
+
+
+def _simuleer_blok(pb: Personeelsbestand, indexering: np.ndarray, rng, jaren: int, plaatsen: int,
+                   aanwerving: float, uitstroom: float, deeltijd: float, deeltijdse_breuk: float,
+                   categorie: int, RSZ_WG_PCT: float, params: Parameterset):
+    """
+    Eén blok van S scenario's (indexering: S × jaren) → (kost S × jaren, koppen S × jaren, tekort).
+    tekort = aantal aanwervingen dat niet paste in `plaatsen`.
+    """
+    S, M = indexering.shape[0], len(pb)
+    # Plaatsen 0..M-1 starten met het huidige bestand, de rest is vrij
+    bron = np.broadcast_to(np.arange(plaatsen) % M, (S, plaatsen)).copy()
+    actief = np.zeros((S, plaatsen), dtype=bool)
+    actief[:, :M] = True
+    kol = {k: pb.kolommen[k][bron] for k in _KOLOMMEN}
+    groei = np.ones(S)
+    scenario = np.repeat(np.arange(S), plaatsen).reshape(S, plaatsen)
+
+    kost = np.empty((S, jaren))
+    koppen = np.empty((S, jaren), dtype=np.int64)
+    tekort = 0
+    for j in range(jaren):
+        # 1️⃣ indexering
+        factor = 1.0 + indexering[:, j]
+        groei *= factor
+        kol["bruto_maandloon"] *= factor[:, None]
+
+        # 2️⃣ uitstroom
+        actief &= rng.random((S, plaatsen)) >= uitstroom
+
+        # 3️⃣ aanwerving in de eerste vrije plaatsen; profiel van een huidige werknemer
+        nieuw_aantal = rng.poisson(aanwerving * actief.sum(axis=1))
+        vrij = ~actief
+        nieuw = vrij & (np.cumsum(vrij, axis=1) <= nieuw_aantal[:, None])
+        tekort += int((nieuw_aantal - nieuw.sum(axis=1)).sum())
+        if nieuw.any():
+            s, p = np.nonzero(nieuw)
+            profiel = rng.integers(0, M, size=s.size)
+            for k in _KOLOMMEN:
+                kol[k][s, p] = pb.kolommen[k][profiel]
+            kol["bruto_maandloon"][s, p] *= groei[s]
+            actief |= nieuw
+
+        # 4️⃣ overstap naar deeltijds
+        naar_deeltijd = actief & (kol["prestatiebreuk"] >= 1.0) & (rng.random((S, plaatsen)) < deeltijd)
+        if naar_deeltijd.any():
+            verhouding = deeltijdse_breuk / kol["prestatiebreuk"][naar_deeltijd]
+            for k in _PRO_RATA:
+                kol[k][naar_deeltijd] *= verhouding
+            kol["prestatiebreuk"][naar_deeltijd] = deeltijdse_breuk
+
+        # Loonkost enkel voor actieve plaatsen, opgeteld per scenario (zonder afronding per
+        # component: op een totaal van miljoenen telt dat niet, en het halveert de rekentijd)
+        sel = actief.ravel()
+        r = bereken_loonkost_batch(
+            *(kol[k].ravel()[sel] for k in _KOLOMMEN), categorie, RSZ_WG_PCT, afronden=False, params=params,
+        )
+        kost[:, j] = np.bincount(scenario.ravel()[sel], weights=r["totaal_loonkost_jaar"], minlength=S)
+        koppen[:, j] = actief.sum(axis=1)
+    return kost, koppen, tekort
+
+
+def prognose(
+    pb: Personeelsbestand,
+    scenarios: int = 10_000,
+    jaren: int = 3,
+    indexering: tuple = (0.02, 0.01),
+    aanwerving: float = 0.10,
+    uitstroom: float = 0.08,
+    deeltijd: float = 0.03,
+    deeltijdse_breuk: float = 0.8,
+    percentielen: tuple = STANDAARD_PERCENTIELEN,
+    categorie: int = 1,
+    RSZ_WG_PCT: float = 0.25,
+    max_cellen: int = MAX_CELLEN,
+    seed: int = SEED,
+    params: Parameterset = STANDAARD,
+) -> dict:
+    """
+    Verdeling van totaal_loonkost_jaar voor de komende `jaren` jaar.
+    indexering = (gemiddelde, standaardafwijking) per jaar (normaal, ≥ 0);
+    aanwerving/uitstroom/deeltijd zijn jaarlijkse kansen/fracties.
+
+    Geeft een dict met "jaren", "percentielen", "banden" (jaren × percentielen),
+    "gemiddelde", "koppen_mediaan", "huidig" (kost van het huidige bestand),
+    "scenarios" (scenarios × jaren) en "tekort" (aanwervingen zonder vrije plaats).
+    Zelfde seed en max_cellen → zelfde resultaat.
+    """
+    M = len(pb)
+    if M == 0 or scenarios <= 0 or jaren <= 0:
+        raise ValueError("verwacht een niet-leeg bestand en positieve scenarios/jaren")
+    # Ruimte voor groei: verwachte aanwervingen plus ruim marge
+    plaatsen = M + int(np.ceil(M * aanwerving * jaren * 1.5 + 6 * np.sqrt(M * aanwerving * jaren + 1)))
+    blok = max(1, max_cellen // plaatsen)
+
+    rng = np.random.default_rng(seed)
+    idx = np.clip(rng.normal(indexering[0], indexering[1], (scenarios, jaren)), 0.0, None)
+
+    kost = np.empty((scenarios, jaren))
+    koppen = np.empty((scenarios, jaren), dtype=np.int64)
+    tekort = 0
+    for begin in range(0, scenarios, blok):
+        einde = min(begin + blok, scenarios)
+        k, h, t = _simuleer_blok(pb, idx[begin:einde], rng, jaren, plaatsen, aanwerving, uitstroom, deeltijd,
+                                 deeltijdse_breuk, categorie, RSZ_WG_PCT, params)
+        kost[begin:einde], koppen[begin:einde] = k, h
+        tekort += t
+
+    huidig = bereken_loonkost_batch(*(pb.kolommen[k] for k in _KOLOMMEN), categorie, RSZ_WG_PCT, params=params)
+    return {
+        "jaren": [params.jaar + j + 1 for j in range(jaren)],
+        "percentielen": list(percentielen),
+        "banden": np.percentile(kost, percentielen, axis=0).T,
+        "gemiddelde": kost.mean(axis=0),
+        "koppen_mediaan": np.median(koppen, axis=0),
+        "huidig": float(huidig["totaal_loonkost_jaar"].sum()),
+        "scenarios": kost,
+        "tekort": tekort,
+    }
+
+
+def main(argv=None):
+    from payroll.batch import lees_in_blokken
+
+    parser = argparse.ArgumentParser(
+        prog="python -m payroll.prognose",
+        description="Monte Carlo-prognose van de totale werkgeverskost (percentielbanden per jaar).",
+    )
+    parser.add_argument("invoer", help="CSV of Excel met het huidige personeelsbestand")
+    parser.add_argument("--scenarios", type=int, default=10_000)
+    parser.add_argument("--jaren", type=int, default=3)
+    parser.add_argument("--indexering", type=float, nargs=2, default=(0.02, 0.01), metavar=("GEM", "SD"))
+    parser.add_argument("--aanwerving", type=float, default=0.10, help="nieuwe werknemers per jaar (fractie)")
+    parser.add_argument("--uitstroom", type=float, default=0.08, help="kans op vertrek per werknemer per jaar")
+    parser.add_argument("--deeltijd", type=float, default=0.03, help="kans op overstap naar deeltijds per jaar")
+    parser.add_argument("--deeltijdse-breuk", type=float, default=0.8)
+    parser.add_argument("--seed", type=int, default=SEED)
+    parser.add_argument("--max-cellen", type=int, default=MAX_CELLEN, help="scenario's × werknemers per blok")
+    parser.add_argument("--jaar", type=int, default=STANDAARD_JAAR, help=f"parameterjaar (standaard {STANDAARD_JAAR})")
+    parser.add_argument("--json", metavar="PAD", help="resultaat (zonder individuele scenario's) als JSON")
+    parser.add_argument("--sep", default=",", help="scheidingsteken voor CSV")
+    args = parser.parse_args(argv)
+
+    try:
+        params = laad_parameters(args.jaar)
+    except ValueError as e:
+        parser.error(str(e))
+    import pandas as pd
+    pb = Personeelsbestand.uit_dataframe(pd.concat(lees_in_blokken(args.invoer, sep=args.sep), ignore_index=True))
+
+    t0 = time.perf_counter()
+    r = prognose(pb, args.scenarios, args.jaren, tuple(args.indexering), args.aanwerving, args.uitstroom,
+                 args.deeltijd, args.deeltijdse_breuk, max_cellen=args.max_cellen, seed=args.seed, params=params)
+    duur = time.perf_counter() - t0
+
+    print(f"Huidige loonkost: € {r['huidig']:,.0f} per jaar ({len(pb):,} werknemers)")
+    kop = "".join(f"{'P' + str(p):>18}" for p in r["percentielen"])
+    print(f"{'jaar':<8}{'koppen':>10}{kop}")
+    for j, jaar in enumerate(r["jaren"]):
+        print(f"{jaar:<8}{r['koppen_mediaan'][j]:>10,.0f}" + "".join(f"{v:>18,.0f}" for v in r["banden"][j]))
+    print(f"✅ {args.scenarios:,} scenario's × {len(pb):,} werknemers × {args.jaren} jaar in {duur:.2f}s",
+          file=sys.stderr)
+    if r["tekort"]:
+        print(f"⚠️ {r['tekort']:,} aanwervingen vonden geen vrije plaats (verhoog de marge)", file=sys.stderr)
+
+    if args.json:
+        uit = {k: (v.tolist() if isinstance(v, np.ndarray) else v) for k, v in r.items() if k != "scenarios"}
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(uit, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,298 @@
+# payroll/rapport.py
+#
+# PDF-loonrapporten: één rapport (Streamlit-knop) of één per werknemer in bulk
+# (jaareinde), rechtstreeks gestreamd naar een ZIP-archief.
+#
+# ⚡ Stijlen en tabelstijlen worden één keer per proces opgebouwd en daarna
+#    hergebruikt; per rapport worden enkel nog de flowables met de cijfers
+#    gemaakt.
+# ⚡ Bulk: rapporten worden in blokken over een procespool verdeeld. Er zijn
+#    nooit meer dan een paar blokken tegelijk onderweg en elke PDF gaat meteen
+#    de ZIP in, dus het geheugengebruik hangt niet af van het aantal werknemers.
+#
+#   from payroll.rapport import bouw_rapport
+#   pdf, paginas = bouw_rapport(df, netto, kost, beschrijving)
+#
+#   python -m payroll.rapport personeel.csv rapporten.zip --workers 8
+
+import argparse
+import os
+import re
+import sys
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import date, datetime
+from functools import lru_cache
+from io import BytesIO
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+from reportlab.lib.units import cm
+from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+from payroll.werknemer import Bediende
+
+PRIMARY = "#003366"
+STANDAARD_BLOKGROOTTE = 50          # rapporten per taak voor een worker
+STANDAARD_SLEUTEL = "werknemer_id"
+_ONVEILIG = re.compile(r"[^\w.-]+")     # alles behalve letters, cijfers, _ . -
+
+
+# -----------------------
+# Gecachete stijlen
+# -----------------------
+@lru_cache(maxsize=None)
+def _stijlen() -> dict:
+    """Paragraafstijlen, één keer per proces."""
+    basis = getSampleStyleSheet()
+    return {
+        # Afgeleide stijl: de gedeelde Title-stijl zelf blijft ongewijzigd
+        "titel": ParagraphStyle("BAUTitel", parent=basis["Title"], textColor=colors.HexColor(PRIMARY)),
+        "kop": basis["Heading3"],
+        "normaal": basis["Normal"],
+    }
+
+
+@lru_cache(maxsize=None)
+def _samenvatting_stijl() -> TableStyle:
+    return TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor(PRIMARY)),
+        ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
+        ('ALIGN', (1, 0), (-1, -1), 'RIGHT'),
+        ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 0), (-1, -1), 10),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+        ('GRID', (0, 0), (-1, -1), 0.25, colors.grey),
+    ])
+
+
+@lru_cache(maxsize=32)
+def _overzicht_stijl(sectiekoppen: tuple) -> TableStyle:
+    """
+    Tabelstijl van het loonoverzicht. maak_overzicht levert altijd dezelfde
+    indeling, dus in de praktijk is er één variant per maand/jaar-weergave.
+    """
+    opmaak = [
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor(PRIMARY)),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+        ('ALIGN', (1, 1), (-1, -1), 'RIGHT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 0), (-1, -1), 9),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 6),
+        ('GRID', (0, 0), (-1, -1), 0.25, colors.grey),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.whitesmoke, colors.lightgrey]),
+    ]
+    # Extra opmaak voor sectiekoppen
+    for r in sectiekoppen:
+        opmaak += [
+            ('BACKGROUND', (0, r), (-1, r), colors.HexColor("#DDE5F2")),
+            ('TEXTCOLOR', (0, r), (-1, r), colors.HexColor(PRIMARY)),
+            ('FONTNAME', (0, r), (-1, r), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, r), (-1, r), 10),
+            ('ALIGN', (0, r), (-1, r), 'LEFT'),
+            ('LINEABOVE', (0, r), (-1, r), 0.75, colors.HexColor(PRIMARY)),
+            ('TOPPADDING', (0, r), (-1, r), 4),
+        ]
+    return TableStyle(opmaak)
+
+
+# -----------------------
+# Eén rapport
+# -----------------------
+def bouw_rapport(df, netto: dict, kost: dict, beschrijving: str = "", titel: str = "BAU Looncalculator — Rapport",
+                 datum: date | None = None) -> tuple:
+    """
+    PDF-rapport voor één werknemer op basis van maak_overzicht (df, netto, kost).
+    Geeft (pdf_bytes, aantal_paginas).
+    """
+    stijl = _stijlen()
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=A4, leftMargin=2*cm, rightMargin=2*cm, topMargin=2*cm, bottomMargin=2*cm)
+
+    # 🏷️ Titel
+    elements = [
+        Paragraph(titel, stijl["titel"]),
+        Spacer(1, 0.2 * cm),
+        Paragraph(f"<i>Gegenereerd op {datum or datetime.now():%d/%m/%Y}</i>", stijl["normaal"]),
+        Spacer(1, 0.5 * cm),
+    ]
+
+    # 📋 Beschrijving
+    if beschrijving.strip():
+        elements.append(Paragraph("<b>Beschrijving</b>", stijl["kop"]))
+        elements.append(Paragraph(beschrijving.replace("\n", "<br/>"), stijl["normaal"]))
+        elements.append(Spacer(1, 0.5 * cm))
+
+    # 🧾 Samenvatting
+    summary = [
+        ["Bruto maandloon", f"€ {netto['bruto_maand']:.2f}"],
+        ["Netto maandloon", f"€ {netto['nettoloon_maand']:.2f}"],
+        ["Netto koopkracht", f"€ {netto['koopkracht_maand']:.2f}"],
+        ["Totale werkgeverskost", f"€ {kost['totaal_loonkost_maand']:.2f}"],
+        ["Structurele vermindering", f"€ {kost.get('structurele_vermindering', 0):.2f} per jaar"],
+    ]
+    t_summary = Table(summary, colWidths=[8*cm, 6*cm])
+    t_summary.setStyle(_samenvatting_stijl())
+    elements.append(Paragraph("<b>Samenvatting</b>", stijl["kop"]))
+    elements.append(t_summary)
+    elements.append(Spacer(1, 0.7 * cm))
+
+    # 📊 Tabel met loonoverzicht; sectiekoppen zoals 'INKOMSTEN', 'INHOUDINGEN', ...
+    elements.append(Paragraph("<b>Volledig loonoverzicht</b>", stijl["kop"]))
+    data = [df.columns.tolist()] + df.values.tolist()
+    sectiekoppen = tuple(
+        i for i, row in enumerate(df["Component"].tolist(), start=1)
+        if isinstance(row, str) and row.isupper() and row.strip() != ""
+    )
+    table = Table(data, repeatRows=1, colWidths=[7*cm, 7*cm])
+    table.setStyle(_overzicht_stijl(sectiekoppen))
+    elements.append(table)
+
+    # Footer
+    elements.append(Spacer(1, 0.7 * cm))
+    elements.append(Paragraph(
+        "<i>Gegenereerd met BAU Looncalculator — dit rapport is informatief en niet bindend.</i>",
+        stijl["normaal"],
+    ))
+
+    doc.build(elements)
+    return buffer.getvalue(), doc.page
+
+
+def rapport_voor(b: Bediende, beschrijving: str = "", datum: date | None = None) -> tuple:
+    """Rekent het overzicht voor `b` en bouwt er het rapport van → (pdf_bytes, aantal_paginas)."""
+    from payroll.overzicht import maak_overzicht
+
+    df, netto, kost = maak_overzicht(b)
+    return bouw_rapport(df, netto, kost, beschrijving, datum=datum)
+
+
+# -----------------------
+# Bulk → ZIP
+# -----------------------
+def _render_blok(taken: list, beschrijving: str, datum: date) -> list:
+    """Workertaak: [(bestandsnaam, invoerwaarden)] → [(bestandsnaam, pdf_bytes, paginas)]."""
+    resultaat = []
+    for naam, waarden in taken:
+        pdf, paginas = rapport_voor(Bediende(**dict(zip(Bediende.__slots__, waarden))), beschrijving, datum)
+        resultaat.append((naam, pdf, paginas))
+    return resultaat
+
+
+def _bestandsnaam(naam, rij: int, gezien: set) -> str:
+    """
+    Veilige, unieke naam in de ZIP: geen mappen of `..` (enkel letters,
+    cijfers, _ . -), en bij een dubbele naam het rijnummer erachter.
+    """
+    basis = _ONVEILIG.sub("_", str(naam)).strip("._") or "werknemer"
+    kandidaat, extra = basis, 0
+    while kandidaat.lower() in gezien:      # ook hoofdletterongevoelig uniek (Windows, macOS)
+        extra += 1
+        kandidaat = f"{basis}_{rij}" if extra == 1 else f"{basis}_{rij}_{extra}"
+    gezien.add(kandidaat.lower())
+    return f"{kandidaat}.pdf"
+
+
+def _blokken(werknemers, blokgrootte: int):
+    """(naam, Bediende) → blokken van (bestandsnaam, invoer-tuple); kleine, picklebare taken."""
+    blok = []
+    gezien = set()
+    for rij, (naam, b) in enumerate(werknemers, start=1):
+        blok.append((_bestandsnaam(naam, rij, gezien), tuple(getattr(b, k) for k in Bediende.__slots__)))
+        if len(blok) == blokgrootte:
+            yield blok
+            blok = []
+    if blok:
+        yield blok
+
+
+def genereer_zip(werknemers, uitvoer, workers: int | None = None, blokgrootte: int = STANDAARD_BLOKGROOTTE,
+                 beschrijving: str = "", datum: date | None = None, log=sys.stderr) -> dict:
+    """
+    Eén PDF per werknemer, gestreamd naar het ZIP-bestand `uitvoer` (pad of
+    beschrijfbaar bestandsobject). `werknemers` is een iterable van
+    (naam, Bediende) en mag een generator zijn; namen worden bestandsnamen
+    (opgeschoond, dubbele krijgen het rijnummer als achtervoegsel).
+    workers=1 rendert in dit proces. Geeft statistieken terug (rapporten,
+    paginas, seconden, paginas_per_s).
+    """
+    if blokgrootte <= 0:
+        raise ValueError("blokgrootte moet positief zijn")
+    workers = workers or os.cpu_count() or 1
+    datum = datum or date.today()
+    rapporten = paginas = 0
+    start = time.perf_counter()
+
+    # PDF's zijn al gecomprimeerd: opnieuw deflaten kost enkel tijd in het hoofdproces
+    with zipfile.ZipFile(uitvoer, "w", compression=zipfile.ZIP_STORED) as zf:
+        def schrijf(blok):
+            nonlocal rapporten, paginas
+            for naam, pdf, n in blok:
+                zf.writestr(naam, pdf)
+                rapporten += 1
+                paginas += n
+            if log is not None:
+                duur = time.perf_counter() - start
+                print(f"\r{rapporten:,} rapporten, {paginas:,} pagina's ({paginas / max(duur, 1e-9):,.1f} pagina's/s)",
+                      end="", file=log)
+
+        if workers == 1:
+            for blok in _blokken(werknemers, blokgrootte):
+                schrijf(_render_blok(blok, beschrijving, datum))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                # Begrensd aantal blokken onderweg: invoer en PDF's stapelen zich niet op
+                lopend = set()
+                for blok in _blokken(werknemers, blokgrootte):
+                    lopend.add(pool.submit(_render_blok, blok, beschrijving, datum))
+                    if len(lopend) >= 2 * workers:
+                        klaar, lopend = wait(lopend, return_when=FIRST_COMPLETED)
+                        for f in klaar:
+                            schrijf(f.result())
+                for f in wait(lopend)[0]:
+                    schrijf(f.result())
+
+    duur = time.perf_counter() - start
+    if log is not None:
+        print(file=log)
+    return {"rapporten": rapporten, "paginas": paginas, "seconden": duur, "paginas_per_s": paginas / max(duur, 1e-9)}
+
+
+def werknemers_uit_bestand(pad: str, sleutel: str = STANDAARD_SLEUTEL, sep: str = ","):
+    """(naam, Bediende) per rij van een CSV/Excel-bestand, blok per blok gelezen."""
+    from payroll.batch import lees_in_blokken
+    from payroll.personeelsbestand import Personeelsbestand
+
+    rij = 0
+    for df in lees_in_blokken(pad, sep=sep):
+        namen = df[sleutel].astype(str).tolist() if sleutel in df.columns else None
+        for i, r in enumerate(Personeelsbestand.uit_dataframe(df)):
+            yield (namen[i] if namen else f"werknemer_{rij + 1:06d}"), r.naar_bediende()
+            rij += 1
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m payroll.rapport",
+        description="Eén PDF-loonrapport per werknemer, gebundeld in een ZIP-archief.",
+    )
+    parser.add_argument("invoer", help="CSV of Excel met één rij per werknemer")
+    parser.add_argument("uitvoer", help="ZIP-bestand")
+    parser.add_argument("--workers", type=int, default=None, help="aantal processen (standaard: alle cores)")
+    parser.add_argument("--blok", type=int, default=STANDAARD_BLOKGROOTTE, help="rapporten per workertaak")
+    parser.add_argument("--sleutel", default=STANDAARD_SLEUTEL, help="kolom voor de bestandsnamen")
+    parser.add_argument("--beschrijving", default="", help="tekst bovenaan elk rapport")
+    parser.add_argument("--sep", default=",", help="scheidingsteken voor CSV")
+    args = parser.parse_args(argv)
+
+    stats = genereer_zip(werknemers_uit_bestand(args.invoer, args.sleutel, args.sep), args.uitvoer,
+                         args.workers, args.blok, args.beschrijving)
+    print(f"✅ {stats['rapporten']:,} rapporten ({stats['paginas']:,} pagina's) in {stats['seconden']:.1f}s — "
+          f"{stats['paginas_per_s']:,.1f} pagina's/s → {args.uitvoer}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
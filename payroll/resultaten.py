@@ -0,0 +1,157 @@
+# payroll/resultaten.py
+#
+# Compacte resultaattypes i.p.v. een dict per werknemer.
+#
+# - Nettoresultaat / Loonkostresultaat: één berekening (bereken_nettoloon,
+#   bereken_loonkost). __slots__, geen __dict__: ongeveer een derde van het
+#   geheugen van een dict met dezelfde sleutels.
+# - Resultatentabel: batchresultaat (vectorieel) als één matrix velden × rijen;
+#   elke kolom is een view op die matrix.
+#
+# Beide gedragen zich als een dict (resultaat["nettoloon_maand"], .get,
+# .items(), dict(resultaat), {**netto, **kost}), zodat bestaande aanroepers
+# ongewijzigd blijven werken. Velden zijn ook als attribuut beschikbaar:
+# netto.nettoloon_maand.
+#
+# ⚡ numpy wordt pas geladen bij een Resultatentabel: bereken_nettoloon en
+#    bereken_loonkost blijven zonder numpy importeerbaar (zie importtijd.py).
+
+from collections.abc import Mapping
+
+NETTO_VELDEN = (
+    "bruto_maand", "bruto_jaar", "rsz_werknemer", "sociale_werkbonus", "fiscale_werkbonus", "kostenforfait",
+    "belastbaar_inkomen", "personenbelasting", "bbsz", "nettoloon_maand", "nettoloon_jaar", "koopkracht_maand",
+    "koopkracht_jaar",
+)
+KOST_VELDEN = (
+    "rsz_werkgever", "gv_werkgever", "ao_verzekering", "maaltijdcheques_wg", "ecocheques", "kosten_eigen",
+    "totaal_loonkost_jaar", "totaal_loonkost_maand",
+)
+
+
+# -----------------------
+# Eén werknemer
+# -----------------------
+class _Resultaat(Mapping):
+    """Mapping veld → bedrag bovenop __slots__ (dict-compatibele toegang)."""
+    __slots__ = ()
+    velden = ()
+
+    def __getitem__(self, veld):
+        if veld in self.velden:
+            return getattr(self, veld)
+        raise KeyError(veld)
+
+    def __iter__(self):
+        return iter(self.velden)
+
+    def __len__(self):
+        return len(self.velden)
+
+    def __contains__(self, veld):
+        return veld in self.velden
+
+    def __reduce__(self):
+        return type(self), tuple(getattr(self, v) for v in self.velden)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({', '.join(f'{v}={getattr(self, v)!r}' for v in self.velden)})"
+
+    def _asdict(self) -> dict:
+        return {v: getattr(self, v) for v in self.velden}
+
+
+class Nettoresultaat(_Resultaat):
+    __slots__ = velden = NETTO_VELDEN
+
+    def __init__(self, bruto_maand, bruto_jaar, rsz_werknemer, sociale_werkbonus, fiscale_werkbonus, kostenforfait,
+                 belastbaar_inkomen, personenbelasting, bbsz, nettoloon_maand, nettoloon_jaar, koopkracht_maand,
+                 koopkracht_jaar):
+        self.bruto_maand = bruto_maand
+        self.bruto_jaar = bruto_jaar
+        self.rsz_werknemer = rsz_werknemer
+        self.sociale_werkbonus = sociale_werkbonus
+        self.fiscale_werkbonus = fiscale_werkbonus
+        self.kostenforfait = kostenforfait
+        self.belastbaar_inkomen = belastbaar_inkomen
+        self.personenbelasting = personenbelasting
+        self.bbsz = bbsz
+        self.nettoloon_maand = nettoloon_maand
+        self.nettoloon_jaar = nettoloon_jaar
+        self.koopkracht_maand = koopkracht_maand
+        self.koopkracht_jaar = koopkracht_jaar
+
+
+class Loonkostresultaat(_Resultaat):
+    __slots__ = velden = KOST_VELDEN
+
+    def __init__(self, rsz_werkgever, gv_werkgever, ao_verzekering, maaltijdcheques_wg, ecocheques, kosten_eigen,
+                 totaal_loonkost_jaar, totaal_loonkost_maand):
+        self.rsz_werkgever = rsz_werkgever
+        self.gv_werkgever = gv_werkgever
+        self.ao_verzekering = ao_verzekering
+        self.maaltijdcheques_wg = maaltijdcheques_wg
+        self.ecocheques = ecocheques
+        self.kosten_eigen = kosten_eigen
+        self.totaal_loonkost_jaar = totaal_loonkost_jaar
+        self.totaal_loonkost_maand = totaal_loonkost_maand
+
+
+# -----------------------
+# Batch
+# -----------------------
+class Resultatentabel(dict):
+    """
+    Batchresultaat: dict veld → array, waarbij alle arrays rijen (views) zijn
+    van één matrix `matrix` (velden × werknemers). Toekennen aan een bestaand
+    veld schrijft in de matrix. rij(i) geeft het resultaattype van één
+    werknemer, naar_dataframe() een DataFrame zonder kopie per kolom.
+    """
+
+    def __init__(self, velden, vorm=(), soort=None, matrix=None):
+        import numpy as np
+        velden = tuple(velden)
+        if matrix is None:
+            matrix = np.empty((len(velden), *vorm), dtype=np.float64)
+        # matrix[j, ...] is ook bij één werknemer (vorm ()) een view, geen scalar
+        super().__init__((veld, matrix[j, ...]) for j, veld in enumerate(velden))
+        self.velden = velden
+        self.matrix = matrix
+        self.soort = soort
+
+    @classmethod
+    def uit_kolommen(cls, kolommen: dict, soort=None) -> "Resultatentabel":
+        """Tabel met dezelfde velden en waarden als een dict van arrays (of scalars)."""
+        import numpy as np
+        vorm = np.broadcast_shapes(*(np.shape(v) for v in kolommen.values()))
+        tabel = cls(kolommen, vorm, soort)
+        for veld, waarde in kolommen.items():
+            tabel[veld] = waarde
+        return tabel
+
+    def __setitem__(self, veld, waarde):
+        if veld in self:
+            dict.__getitem__(self, veld)[...] = waarde
+        else:
+            dict.__setitem__(self, veld, waarde)
+
+    def __reduce__(self):
+        # Ontpickeld wijzen de kolommen weer naar één matrix
+        return type(self), (self.velden, (), self.soort, self.matrix)
+
+    @property
+    def aantal(self) -> int:
+        """Aantal werknemers (rijen)."""
+        return self.matrix.shape[1] if self.matrix.ndim > 1 else 1
+
+    @property
+    def nbytes(self) -> int:
+        return self.matrix.nbytes
+
+    def rij(self, i: int):
+        waarden = (self.matrix if self.matrix.ndim == 1 else self.matrix[:, i]).tolist()
+        return self.soort(*waarden) if self.soort else dict(zip(self.velden, waarden))
+
+    def naar_dataframe(self, index=None):
+        import pandas as pd
+        return pd.DataFrame(self.matrix.T, columns=list(self.velden), index=index, copy=False)
@@ -0,0 +1,209 @@
+# payroll/terugrekenen.py
+#
+# Omgekeerde berekening: welk bruto maandloon hoort bij een gewenst netto,
+# een gewenste koopkracht of een gegeven loonkostbudget?
+#
+# De loonkost stijgt monotoon in het brutoloon, het netto niet: aan de
+# kwartaalgrenzen van de BSZB (k1..k6, per maand k/3) springt de bijdrage
+# omhoog en daalt het netto tot ~€8, en door afronding op de cent zakt het
+# netto soms een cent terug. Daarom voor netto en koopkracht:
+#
+# 1️⃣ het bereik opdelen in segmenten tussen de BSZB-sprongen en het eerste
+#    segment kiezen waarvan het maximum (in de laatste centen vóór de
+#    sprong) het doel haalt
+# 2️⃣ regula falsi (Illinois-variant) binnen dat segment om in het juiste
+#    lineaire stuk te landen, daarna bisectie op gehele centen
+# 3️⃣ de centen net onder de gevonden oplossing nalopen: binnen een segment
+#    haalt een lager bruto het doel hooguit enkele centen vroeger
+#
+# Alle doelen worden samen, gevectoriseerd, opgelost.
+
+import numpy as np
+
+from parameters.register import Parameterset, STANDAARD
+from payroll.vectorieel import bereken_nettoloon_batch, bereken_loonkost_batch
+
+DOELEN = ("nettoloon_maand", "koopkracht_maand", "totaal_loonkost_maand")
+VENSTER = 10    # centen: segmentmaximum zoeken en oplossing nalopen (afrondingsdips zijn ≤ 4 cent breed)
+MARGE = 0.05    # euro: maximum dat een afrondingsdip onder het segmentmaximum kan liggen
+
+
+def _sprongen(params: Parameterset = STANDAARD):
+    """Brutomaandlonen (op de cent naar beneden) waar de BSZB van kwartaalzone wisselt."""
+    P = params.bszb
+    return np.unique(np.floor(np.array([P.k1, P.k2, P.k3, P.k4, P.k5, P.k6]) / 3 * 100.0 + 1e-6)).astype(np.int64)
+
+
+def _evaluator(doel, invoer, params: Parameterset = STANDAARD):
+    """Functie bruto → doelgrootheid voor een deelverzameling (idx) van de doelen."""
+    if doel == "totaal_loonkost_maand":
+        velden = ("prestatiebreuk", "MG_WG_jaar", "EC_jaar", "GV_WG_pct", "AO_pct", "maandelijkse_kostenvergoeding")
+
+        def g(bruto, idx):
+            return bereken_loonkost_batch(bruto, **{k: invoer[k][idx] for k in velden}, params=params)[doel]
+    else:
+        velden = ("MG_WG_jaar", "MG_WN_jaar", "EC_jaar", "maandelijkse_kostenvergoeding", "regime")
+
+        def g(bruto, idx):
+            return bereken_nettoloon_batch(bruto, **{k: invoer[k][idx] for k in velden}, params=params)[doel]
+    return g
+
+
+def bereken_bruto_voor_doel(
+    doel: str,
+    waarde,
+    prestatiebreuk=1.0,
+    MG_WG_jaar=0.0,
+    MG_WN_jaar=0.0,
+    EC_jaar=0.0,
+    GV_WG_pct=0.0,
+    AO_pct=0.0,
+    maandelijkse_kostenvergoeding=0.0,
+    regime="individueel",
+    bruto_min: float = 0.0,
+    bruto_max: float = 50_000.0,
+    max_iteraties: int = 30,
+    params: Parameterset = STANDAARD,
+) -> np.ndarray:
+    """
+    Zoekt per doelwaarde het bruto maandloon (op de cent).
+
+    doel:
+    - "nettoloon_maand" / "koopkracht_maand" → laagste bruto dat minstens `waarde` oplevert
+    - "totaal_loonkost_maand" → hoogste bruto waarvan de loonkost binnen `waarde` blijft
+
+    `waarde` en de overige velden (zoals bij Bediende) mogen arrays of scalars
+    zijn. Doelen die binnen [bruto_min, bruto_max] niet haalbaar zijn → NaN.
+    """
+    if doel not in DOELEN:
+        raise ValueError(f"Onbekend doel {doel!r}; kies uit {', '.join(DOELEN)}")
+
+    doelwaarde = np.atleast_1d(np.asarray(waarde, dtype=np.float64))
+    invoer = dict(
+        prestatiebreuk=prestatiebreuk, MG_WG_jaar=MG_WG_jaar, MG_WN_jaar=MG_WN_jaar, EC_jaar=EC_jaar,
+        GV_WG_pct=GV_WG_pct, AO_pct=AO_pct, maandelijkse_kostenvergoeding=maandelijkse_kostenvergoeding,
+        regime=regime,
+    )
+    n = np.broadcast_shapes(doelwaarde.shape, *(np.shape(v) for v in invoer.values()))[0]
+    doelwaarde = np.broadcast_to(doelwaarde, (n,))
+    invoer = {k: np.broadcast_to(np.asarray(v), (n,)) for k, v in invoer.items()}
+    g = _evaluator(doel, invoer, params)
+
+    # "hoog" = predicaat dat geldt aan de bovenkant van het interval
+    if doel == "totaal_loonkost_maand":
+        def hoog(y, idx): return y > doelwaarde[idx]
+    else:
+        def hoog(y, idx): return y >= doelwaarde[idx]
+
+    alle = np.arange(n)
+    bruto_min, bruto_max = round(bruto_min, 2), round(bruto_max, 2)
+    Lc, Hc = round(bruto_min * 100), round(bruto_max * 100)
+    resultaat = np.full(n, np.nan)
+
+    if doel == "totaal_loonkost_maand":
+        # Monotoon: het hele bereik is één segment
+        lo = np.full(n, bruto_min); hi = np.full(n, bruto_max)
+        y_lo = g(lo, alle); y_hi = g(hi, alle)
+        nooit_hoog = ~hoog(y_hi, alle)
+        al_hoog = hoog(y_lo, alle)
+    else:
+        # -------------------------------------------
+        # 1️⃣ Eerste segment (tussen BSZB-sprongen) dat het doel haalt
+        # -------------------------------------------
+        sprong = _sprongen(params)
+        sprong = sprong[(sprong >= Lc) & (sprong < Hc)]
+        einden = np.append(sprong, Hc)
+        begins = np.insert(sprong + 1, 0, Lc)
+        m = einden.size
+        # Binnen een segment ligt het maximum hooguit een afrondingsdip boven de
+        # waarde aan het einde: enkel segmenten met een einde binnen MARGE van
+        # het doel zijn kandidaat, en pas daar worden de laatste centen bekeken.
+        y_eind = g(np.tile(einden / 100.0, n), np.repeat(alle, m)).reshape(n, m)
+        kandidaat = hoog(y_eind + MARGE, alle[:, None])
+        seg = np.full(n, -1)
+        hi = np.full(n, np.nan); y_hi = np.full(n, np.nan)
+        zoek = alle[kandidaat.any(axis=1)]
+        j = kandidaat[zoek].argmax(axis=1)
+        while zoek.size:
+            C = np.maximum(begins[j, None], einden[j, None] - np.arange(VENSTER))
+            y = g(C.ravel() / 100.0, np.repeat(zoek, VENSTER)).reshape(C.shape)
+            beste = y.argmax(axis=1)
+            y_max = y[np.arange(zoek.size), beste]
+            ok = hoog(y_max, zoek)
+            klaar = zoek[ok]
+            seg[klaar] = j[ok]; hi[klaar] = C[ok, beste[ok]] / 100.0; y_hi[klaar] = y_max[ok]
+            # Volgende kandidaat-segment voor wie het doel hier net niet haalde
+            zoek, j = zoek[~ok], j[~ok]
+            volgende = kandidaat[zoek] & (np.arange(m) > j[:, None])
+            verder = volgende.any(axis=1)
+            zoek, j = zoek[verder], volgende[verder].argmax(axis=1)
+        nooit_hoog = seg < 0
+        begin = begins[seg]
+        lo = begin / 100.0
+        y_lo = g(lo, alle)
+        al_hoog = hoog(y_lo, alle) & ~nooit_hoog
+        resultaat[al_hoog] = lo[al_hoog]
+
+    # Randgevallen: reeds voldaan bij het begin van het segment of onhaalbaar
+    actief = alle[~al_hoog & ~nooit_hoog]
+
+    # -------------------------------------------
+    # 2️⃣ Regula falsi (Illinois) in euro's
+    # -------------------------------------------
+    f_lo = y_lo[actief] - doelwaarde[actief]
+    f_hi = y_hi[actief] - doelwaarde[actief]
+    l, h = lo[actief], hi[actief]
+    kant = np.zeros(actief.size, dtype=np.int8)  # laatst verplaatste kant: -1 lo, +1 hi
+    for _ in range(max_iteraties):
+        if not actief.size or (h - l).max() < 0.5:
+            break
+        with np.errstate(divide="ignore", invalid="ignore"):
+            x = np.round(h - f_hi * (h - l) / (f_hi - f_lo), 2)
+        # Terugvallen op het midden als de secant buiten het interval valt.
+        # Enkel op hele centen evalueren: tussen twee centen is de afgeronde
+        # uitkomst niet noodzakelijk monotoon.
+        x = np.where(np.isfinite(x) & (x > l) & (x < h), x, np.round((l + h) / 2, 2))
+        y = g(x, actief)
+        fx = y - doelwaarde[actief]
+        naar_hi = hoog(y, actief)
+
+        # Illinois: als dezelfde kant twee keer na elkaar schuift, halveer de andere
+        f_lo = np.where(naar_hi & (kant == 1), f_lo / 2, f_lo)
+        f_hi = np.where(~naar_hi & (kant == -1), f_hi / 2, f_hi)
+        h = np.where(naar_hi, x, h); f_hi = np.where(naar_hi, fx, f_hi)
+        l = np.where(naar_hi, l, x); f_lo = np.where(naar_hi, f_lo, fx)
+        kant = np.where(naar_hi, 1, -1).astype(np.int8)
+
+    # Bisectie op gehele centen
+    L = np.rint(l * 100.0).astype(np.int64)
+    H = np.rint(h * 100.0).astype(np.int64)
+    while actief.size:
+        open_ = H - L > 1
+        if not open_.any():
+            break
+        M = (L + H) // 2
+        y = g(M[open_] / 100.0, actief[open_])
+        naar_hi = np.zeros(actief.size, dtype=bool)
+        naar_hi[open_] = hoog(y, actief[open_])
+        H = np.where(open_ & naar_hi, M, H)
+        L = np.where(open_ & ~naar_hi, M, L)
+
+    if doel == "totaal_loonkost_maand":
+        resultaat[actief] = L / 100.0
+        return resultaat
+
+    # -------------------------------------------
+    # 3️⃣ Afrondingsdips: lagere centen in hetzelfde segment die het doel ook halen
+    # -------------------------------------------
+    begin = begin[actief]
+    nalopen = np.arange(actief.size)
+    while nalopen.size:
+        C = H[nalopen, None] - 1 - np.arange(VENSTER)[::-1]                          # oplopend, eindigt op H-1
+        geldig = C >= begin[nalopen, None]
+        y = g(np.maximum(C, begin[nalopen, None]).ravel() / 100.0, np.repeat(actief[nalopen], VENSTER))
+        raak = hoog(y.reshape(C.shape), actief[nalopen, None]) & geldig
+        verbeterd = raak.any(axis=1)
+        H[nalopen[verbeterd]] = C[verbeterd, raak[verbeterd].argmax(axis=1)]
+        nalopen = nalopen[verbeterd]
+    resultaat[actief] = H / 100.0
+    return resultaat
@@ -0,0 +1,311 @@
+# payroll/vectorieel.py
+#
+# Gevectoriseerde (NumPy) versie van bereken_nettoloon en bereken_loonkost.
+# Werkt op kolommen (arrays) i.p.v. één Bediende per keer en volgt exact
+# dezelfde bewerkingen én volgorde als de scalaire functies, zodat de
+# resultaten tot op de cent gelijk zijn.
+
+import numpy as np
+
+from parameters.bszb_2025 import REGIMES
+from parameters.register import Parameterset, STANDAARD
+from payroll.nettoloon import RSZ_WERKNEMER_PERCENT
+from payroll.resultaten import KOST_VELDEN, Loonkostresultaat, Nettoresultaat, Resultatentabel
+
+REGIME_CODES = {naam: code for code, naam in enumerate(REGIMES)}
+
+
+# -----------------------
+# Hulpfuncties
+# -----------------------
+def _kolom(x):
+    return np.asarray(x, dtype=np.float64)
+
+
+def _round2(x, eps=1e-9, afronden=True):
+    """
+    Zelfde resultaat als round(x + eps, 2) in Python, maar op een array.
+
+    np.round rekent via x*100 en kan daardoor bij een (bijna-)gelijkspel op
+    een halve cent anders uitkomen dan Python's round(). Die zeldzame
+    gevallen worden elementsgewijs met round() herberekend.
+
+    afronden=False laat de waarde ongemoeid (exacte, stuksgewijs lineaire
+    variant van de formules, zie payroll/knikpunten.py).
+    """
+    if not afronden:
+        return _kolom(x)
+    y = _kolom(x) + eps
+    r = np.round(y, 2)
+    c = y * 100.0
+    twijfel = np.abs(c - np.floor(c) - 0.5) < 1e-6
+    if twijfel.any():
+        r[twijfel] = [round(v, 2) for v in y[twijfel].tolist()]
+    return r
+
+
+def regime_codes(regime) -> np.ndarray:
+    """
+    Zet regime(s) om naar categorische codes (index in REGIMES).
+    Aanvaardt één naam, een reeks namen of reeds gecodeerde gehele getallen.
+    """
+    r = np.asarray(regime)
+    if r.dtype.kind in "USO":
+        try:
+            return np.array([REGIME_CODES[x] for x in r.ravel().tolist()], dtype=np.int8).reshape(r.shape)
+        except KeyError as e:
+            raise ValueError(f"Onbekend BBSZ-regime: {e.args[0]!r}") from None
+    codes = r.astype(np.int8)
+    if codes.size and (codes.min() < 0 or codes.max() >= len(REGIMES)):
+        raise ValueError(f"Regimecode buiten bereik 0..{len(REGIMES) - 1}")
+    return codes
+
+
+# -----------------------
+# Parameters (gevectoriseerd)
+# -----------------------
+def _afbouw_vec(S, luik):
+    v = np.maximum(0.0, luik.bedrag - luik.afbouw_coef * (S - luik.S_max))
+    return np.where(S <= luik.S_max, luik.bedrag, np.where(S <= luik.S_afbouw_max, v, 0.0))
+
+
+def sociale_werkbonus_vec(refertemaandloon, categorie: str = "bedienden", afronden=True, params=STANDAARD.werkbonus):
+    p = params[categorie]
+    S = _kolom(refertemaandloon)
+    A = _afbouw_vec(S, p.luikA)
+    B = _afbouw_vec(S, p.luikB)
+    return _round2(A, 0.0, afronden), _round2(B, 0.0, afronden)
+
+
+def fiscale_werkbonus_vec(luikA, luikB, categorie: str = "bedienden", afronden=True, params=STANDAARD.werkbonus):
+    p = params[categorie]
+    return (_round2(luikA * p.fiscale_pct_luikA, 0.0, afronden),
+            _round2(luikB * p.fiscale_pct_luikB, 0.0, afronden))
+
+
+def personenbelasting_vec(belastbaar_inkomen, afronden=True, params=STANDAARD.belasting):
+    x = _kolom(belastbaar_inkomen)
+    belasting = np.zeros_like(x)
+    vorige = 0.0
+    # Schijven die boven het inkomen liggen geven deel <= 0 en tellen niet mee
+    for grens, tarief in params.schijven:
+        deel = np.minimum(x, grens) - vorige
+        belasting = belasting + np.where(deel > 0, deel * tarief, 0.0)
+        vorige = grens
+    return _round2(belasting, afronden=afronden)
+
+
+def _within_vec(x, low, high):
+    return np.maximum(0.0, np.minimum(x, high) - low)
+
+
+def bszb_vec(maandloon, regime=0, afronden=True, params=STANDAARD.bszb) -> dict:
+    S = _kolom(maandloon); K = S * 3
+    codes = np.broadcast_to(regime_codes(regime), S.shape)
+    P = params; pc = P.percentages
+
+    zone2 = (P.k2 <= K) & (K <= P.k3)
+    boven3 = K > P.k3
+    base12 = _within_vec(S, P.g1, P.g2)
+    excedent = np.maximum(0.0, S - P.g2)
+
+    p = pc["gemeenschappelijk_met_inkomen"]
+    q_met = np.select(
+        [(P.k1 <= K) & (K < P.k2), zone2, boven3],
+        [p.zone1_q, np.maximum(p.min_q, base12 * p.zone2_pct),
+         np.minimum(p.zone3_basis_q + excedent * p.zone3_pct, p.max_q)],
+        0.0,
+    )
+
+    p = pc["gemeenschappelijk_zonder_inkomen"]
+    q_zonder = np.select(
+        [zone2, boven3],
+        [base12 * p.zone2_pct, np.minimum(p.zone3_basis_q + excedent * p.zone3_pct, p.max_q)],
+        0.0,
+    )
+
+    p = pc["individueel"]
+    q_ind = np.select(
+        [zone2,
+         (P.k3 < K) & (K <= P.k4),
+         (P.k4 < K) & (K <= P.k5),
+         (P.k5 < K) & (K <= P.k6),
+         K > P.k6],
+        [base12 * p.z2_pct,
+         p.z3_q + _within_vec(S, P.g2, P.g3) * p.z3_pct,
+         p.z4_q + _within_vec(S, P.g3, P.g4) * p.z4_pct,
+         p.z5_q + _within_vec(S, P.g4, P.g5) * p.z5_pct,
+         p.z6_q],
+        0.0,
+    )
+
+    q = np.choose(codes, [q_ind, q_met, q_zonder])  # volgorde van REGIMES
+    maand = _round2(q / 3.0, afronden=afronden)
+    jaar = _round2(maand * 12, afronden=afronden)
+    return {"bszb_kwartaal": _round2(q, afronden=afronden), "bszb_maand": maand, "bszb_jaar": jaar}
+
+
+def _comp_vec(value, afronden=True):
+    return np.maximum(0.0, _round2(value, afronden=afronden))
+
+
+def _structurele_vermindering_vec(categorie: int, maandloon, prestatiebreuk, afronden, params):
+    """Ps = R × µ × β per kwartaal, nog niet afgerond."""
+    p = params[categorie]
+    mu = _kolom(prestatiebreuk)
+    S = _kolom(maandloon) * 3 * mu
+    R = p.F + _comp_vec(p.alpha * (p.S0 - S), afronden)
+    R = R + _comp_vec(p.gamma * (p.S2 - S), afronden)
+    R = _round2(R, afronden=afronden)
+    with np.errstate(divide="ignore"):
+        beta = np.where(mu < 0.55, 1.18, np.where(mu < 0.9, 1.18 + (mu - 0.55) * 0.28, 1 / mu))
+    return R * mu * beta
+
+
+def structurele_vermindering_maand_vec(categorie: int, maandloon, prestatiebreuk=1.0, afronden=True,
+                                       params=STANDAARD.structureel):
+    Ps = _structurele_vermindering_vec(categorie, maandloon, prestatiebreuk, afronden, params) / 3
+    return _round2(Ps, afronden=afronden)
+
+
+def structurele_vermindering_kwartaal_vec(categorie: int, maandloon, prestatiebreuk=1.0, afronden=True,
+                                          params=STANDAARD.structureel):
+    """Zelfde formule, maar het kwartaalbedrag (zonder delen door 3 vóór het afronden)."""
+    Ps = _structurele_vermindering_vec(categorie, maandloon, prestatiebreuk, afronden, params)
+    return _round2(Ps, afronden=afronden)
+
+
+# -----------------------
+# Nettoloon / loonkost
+# -----------------------
+def bereken_nettoloon_batch(
+    bruto_maandloon,
+    MG_WG_jaar=0.0,
+    MG_WN_jaar=0.0,
+    EC_jaar=0.0,
+    maandelijkse_kostenvergoeding=0.0,
+    regime="individueel",
+    afronden: bool = True,
+    params: Parameterset = STANDAARD,
+) -> Resultatentabel:
+    """
+    Gevectoriseerde bereken_nettoloon: elke parameter is een array (of scalar),
+    het resultaat is een Resultatentabel (dict met dezelfde sleutels, elk met
+    een array, samen in één matrix).
+    afronden=False slaat alle tussentijdse en finale afrondingen over.
+    """
+    def r2(x): return _round2(x, afronden=afronden)
+    bruto_maand = _kolom(bruto_maandloon)
+    bruto_jaar = bruto_maand * 12
+    rsz_basis = bruto_jaar * RSZ_WERKNEMER_PERCENT
+
+    luikA, luikB = sociale_werkbonus_vec(bruto_maand, afronden=afronden, params=params.werkbonus)
+    sociale_wb = luikA + luikB
+    fisA, fisB = fiscale_werkbonus_vec(luikA, luikB, afronden=afronden, params=params.werkbonus)
+    fiscale_wb = fisA + fisB
+    rsz_wn = rsz_basis - sociale_wb
+    kostenforfait = np.minimum(params.belasting.kostenforfait_plafond, 0.30 * (bruto_jaar - rsz_wn))
+    belastbaar = bruto_jaar - rsz_wn - kostenforfait
+    personenbelasting = personenbelasting_vec(belastbaar, afronden, params.belasting) - fiscale_wb
+    nettoloon_jaar = bruto_jaar - rsz_wn - personenbelasting
+    bbsz = bszb_vec(bruto_maand, regime, afronden, params.bszb)["bszb_jaar"]
+    netto_jaar = nettoloon_jaar - bbsz - _kolom(MG_WN_jaar); netto_maand = netto_jaar / 12.0
+    koopkracht_jaar = netto_jaar + _kolom(MG_WG_jaar) + _kolom(EC_jaar) + _kolom(maandelijkse_kostenvergoeding) * 12.0
+    koopkracht_maand = koopkracht_jaar / 12.0
+    return Resultatentabel.uit_kolommen({
+        "bruto_maand": r2(bruto_maand), "bruto_jaar": r2(bruto_jaar),
+        "rsz_werknemer": r2(rsz_wn),
+        "sociale_werkbonus": r2(sociale_wb), "fiscale_werkbonus": r2(fiscale_wb),
+        "kostenforfait": r2(kostenforfait), "belastbaar_inkomen": r2(belastbaar),
+        "personenbelasting": r2(personenbelasting), "bbsz": r2(bbsz),
+        "nettoloon_maand": r2(netto_maand), "nettoloon_jaar": r2(netto_jaar),
+        "koopkracht_maand": r2(koopkracht_maand), "koopkracht_jaar": r2(koopkracht_jaar),
+    }, Nettoresultaat)
+
+
+def bereken_loonkost_batch(
+    bruto_maandloon,
+    prestatiebreuk=1.0,
+    MG_WG_jaar=0.0,
+    EC_jaar=0.0,
+    GV_WG_pct=0.0,
+    AO_pct=0.0,
+    maandelijkse_kostenvergoeding=0.0,
+    categorie: int = 1,
+    RSZ_WG_PCT: float = 0.25,
+    afronden: bool = True,
+    params: Parameterset = STANDAARD,
+) -> Resultatentabel:
+    """
+    Gevectoriseerde bereken_loonkost (zelfde sleutels, arrays als waarden).
+    """
+    bruto_maand = _kolom(bruto_maandloon)
+    bruto_jaar = bruto_maand * 12
+
+    rsz_wg = bruto_jaar * RSZ_WG_PCT
+    gv_wg = bruto_jaar * _kolom(GV_WG_pct)
+    ao = bruto_jaar * _kolom(AO_pct)
+
+    mg_wg = _kolom(MG_WG_jaar)
+    ec = _kolom(EC_jaar)
+    kosten_eigen = _kolom(maandelijkse_kostenvergoeding) * 12.0
+
+    sv_maand = structurele_vermindering_maand_vec(categorie, bruto_maand, prestatiebreuk, afronden, params.structureel)
+    sv_jaar = np.minimum(sv_maand * 12.0, rsz_wg)
+
+    totaal_kost_jaar = bruto_jaar + rsz_wg + gv_wg + ao + mg_wg + ec + kosten_eigen - sv_jaar
+
+    # Rechtstreeks in de rijen van de resultatenmatrix (scalars worden uitgesmeerd)
+    kost = Resultatentabel(KOST_VELDEN, bruto_maand.shape, Loonkostresultaat)
+    kost["rsz_werkgever"] = _round2(rsz_wg - sv_jaar, afronden=afronden)
+    kost["gv_werkgever"] = _round2(gv_wg, afronden=afronden)
+    kost["ao_verzekering"] = _round2(ao, afronden=afronden)
+    kost["maaltijdcheques_wg"] = _round2(mg_wg, afronden=afronden)
+    kost["ecocheques"] = _round2(ec, afronden=afronden)
+    kost["kosten_eigen"] = _round2(kosten_eigen, afronden=afronden)
+    kost["totaal_loonkost_jaar"] = _round2(totaal_kost_jaar, afronden=afronden)
+    kost["totaal_loonkost_maand"] = _round2(totaal_kost_jaar / 12.0, afronden=afronden)
+    return kost
+
+
+def bereken_batch(
+    bruto_maandloon,
+    prestatiebreuk=1.0,
+    MG_WG_jaar=0.0,
+    MG_WN_jaar=0.0,
+    EC_jaar=0.0,
+    GV_WG_pct=0.0,
+    AO_pct=0.0,
+    maandelijkse_kostenvergoeding=0.0,
+    regime="individueel",
+    params: Parameterset = STANDAARD,
+):
+    """
+    Nettoloon én loonkost voor een volledig personeelsbestand in één keer.
+    Parameters volgen de velden van Bediende; geeft (netto, kost) terug.
+    """
+    netto = bereken_nettoloon_batch(
+        bruto_maandloon, MG_WG_jaar, MG_WN_jaar, EC_jaar, maandelijkse_kostenvergoeding, regime, params=params
+    )
+    kost = bereken_loonkost_batch(
+        bruto_maandloon, prestatiebreuk, MG_WG_jaar, EC_jaar, GV_WG_pct, AO_pct, maandelijkse_kostenvergoeding,
+        params=params,
+    )
+    return netto, kost
+
+
+def bereken_gevoeligheid(b, bruto_waarden, params: Parameterset = STANDAARD) -> dict:
+    """
+    Enkel netto, koopkracht en loonkost (per maand) voor een reeks brutolonen,
+    met alle andere velden van bediende b ongewijzigd. Geen DataFrame, geen
+    Bediende per punt: bedoeld voor gevoeligheidscurves met duizenden punten.
+    """
+    netto, kost = bereken_batch(
+        bruto_waarden, b.prestatiebreuk, b.MG_WG_jaar, b.MG_WN_jaar, b.EC_jaar,
+        b.GV_WG_pct, b.AO_pct, b.maandelijkse_kostenvergoeding, b.regime, params,
+    )
+    return {
+        "nettoloon_maand": netto["nettoloon_maand"],
+        "koopkracht_maand": netto["koopkracht_maand"],
+        "totaal_loonkost_maand": kost["totaal_loonkost_maand"],
+    }
@@ -0,0 +1,110 @@
+# payroll/voordelenmix.py
+#
+# Optimale verloningsmix: voor een vast loonkostbudget per maand zoeken welke
+# combinatie van bruto en voordelen (maaltijdcheques, ecocheques, kosten eigen
+# aan de werkgever) de hoogste koopkracht oplevert.
+#
+# Werkwijze (volledig gevectoriseerd):
+# 1️⃣ rooster van kandidaat-voordelen binnen de wettelijke grenzen
+# 2️⃣ per kandidaat het hoogste bruto dat binnen het budget past
+#    (bereken_bruto_voor_doel, alle kandidaten samen)
+# 3️⃣ netto/koopkracht/loonkost van alle kandidaten in één batch → beste mix
+#
+# De groepsverzekering blijft een vaste invoer: in dit model kost ze enkel
+# (geen koopkracht), dus een optimalisatie zou ze altijd op 0 zetten.
+
+import numpy as np
+
+from parameters.register import Parameterset, STANDAARD
+from payroll.terugrekenen import bereken_bruto_voor_doel
+from payroll.vectorieel import bereken_nettoloon_batch, bereken_loonkost_batch
+
+# Wettelijke grenzen
+MC_WG_MAX_PER_DAG = 6.91          # werkgeversdeel maaltijdcheque
+MC_WN_MIN_PER_DAG = 1.09          # minimaal werknemersdeel
+MC_TOTAAL_MAX_PER_DAG = 8.00      # nominale waarde maaltijdcheque
+KOSTENVERGOEDING_MAX_MAAND = 197.83
+ECOCHEQUES_MAX_JAAR = 250.0
+
+STANDAARD_STAPPEN = {"mc_wg": 8, "mc_wn": 3, "ecocheques": 6, "kostenvergoeding": 12}
+
+
+def kandidaten(stappen: dict = STANDAARD_STAPPEN, ecocheques_max: float = ECOCHEQUES_MAX_JAAR) -> dict:
+    """
+    Rooster van toegelaten voordelenmixen (randen inbegrepen).
+    Zonder maaltijdcheques (werkgeversdeel 0) is ook het werknemersdeel 0.
+    """
+    mc_wg = np.linspace(0.0, MC_WG_MAX_PER_DAG, stappen["mc_wg"])
+    fractie_wn = np.linspace(0.0, 1.0, stappen["mc_wn"])
+    ec = np.linspace(0.0, ecocheques_max, stappen["ecocheques"])
+    kv = np.linspace(0.0, KOSTENVERGOEDING_MAX_MAAND, stappen["kostenvergoeding"])
+
+    WG, F, EC, KV = (a.ravel() for a in np.meshgrid(mc_wg, fractie_wn, ec, kv, indexing="ij"))
+    # Werknemersdeel tussen het minimum en wat de nominale waarde nog toelaat
+    WN = MC_WN_MIN_PER_DAG + F * (MC_TOTAAL_MAX_PER_DAG - WG - MC_WN_MIN_PER_DAG)
+    zonder_mc = WG == 0
+    WN = np.where(zonder_mc, 0.0, WN)
+
+    # Dubbels (zonder cheques maakt de WN-fractie niet uit) weglaten
+    sleutel = np.stack([WG, WN, EC, KV], axis=1)
+    _, uniek = np.unique(sleutel, axis=0, return_index=True)
+    uniek.sort()
+    return {
+        "mc_wg_per_dag": np.round(WG[uniek], 2),
+        "mc_wn_per_dag": np.round(WN[uniek], 2),
+        "EC_jaar": np.round(EC[uniek], 2),
+        "maandelijkse_kostenvergoeding": np.round(KV[uniek], 2),
+    }
+
+
+def optimaliseer_voordelen(
+    budget_maand: float,
+    werkdagen: float,
+    prestatiebreuk: float = 1.0,
+    GV_WG_pct: float = 0.0,
+    AO_pct: float = 0.0,
+    regime: str = "individueel",
+    bruto_min: float = 0.0,
+    stappen: dict = STANDAARD_STAPPEN,
+    ecocheques_max: float = ECOCHEQUES_MAX_JAAR,
+    params: Parameterset = STANDAARD,
+) -> dict:
+    """
+    Zoekt de mix met de hoogste koopkracht_maand binnen `budget_maand`
+    (totaal_loonkost_maand). Geeft een dict met:
+    - "kandidaten": dict van arrays (voordelen, bruto, netto, koopkracht, loonkost)
+      gesorteerd van beste naar slechtste; onhaalbare mixen (voordelen alleen al
+      boven budget of bruto < bruto_min) krijgen koopkracht -inf
+    - "beste": de beste mix als dict van floats
+    """
+    k = kandidaten(stappen, ecocheques_max)
+    MG_WG = k["mc_wg_per_dag"] * werkdagen
+    MG_WN = k["mc_wn_per_dag"] * werkdagen
+
+    # De loonkost is nooit lager dan het bruto: bruto ≤ budget is altijd een geldige bovengrens
+    bruto = bereken_bruto_voor_doel(
+        "totaal_loonkost_maand", budget_maand, prestatiebreuk, MG_WG, MG_WN, k["EC_jaar"],
+        GV_WG_pct, AO_pct, k["maandelijkse_kostenvergoeding"], regime,
+        bruto_max=max(float(budget_maand), 0.0), params=params,
+    )
+    haalbaar = np.isfinite(bruto) & (bruto >= bruto_min)
+    b = np.where(haalbaar, bruto, 0.0)
+
+    netto = bereken_nettoloon_batch(b, MG_WG, MG_WN, k["EC_jaar"], k["maandelijkse_kostenvergoeding"], regime,
+                                    params=params)
+    kost = bereken_loonkost_batch(b, prestatiebreuk, MG_WG, k["EC_jaar"], GV_WG_pct, AO_pct,
+                                  k["maandelijkse_kostenvergoeding"], params=params)
+    koopkracht = np.where(haalbaar, netto["koopkracht_maand"], -np.inf)
+
+    # Beste eerst; bij gelijke koopkracht het hoogste bruto (meer sociale rechten)
+    volgorde = np.lexsort((-b, -koopkracht))
+    resultaat = {
+        **k,
+        "bruto_maandloon": np.where(haalbaar, bruto, np.nan),
+        "nettoloon_maand": np.where(haalbaar, netto["nettoloon_maand"], np.nan),
+        "koopkracht_maand": koopkracht,
+        "totaal_loonkost_maand": np.where(haalbaar, kost["totaal_loonkost_maand"], np.nan),
+    }
+    resultaat = {naam: v[volgorde] for naam, v in resultaat.items()}
+    beste = {naam: float(v[0]) for naam, v in resultaat.items()} if haalbaar.any() else None
+    return {"kandidaten": resultaat, "beste": beste}
@@ -1,6 +1,14 @@
 # payroll/werknemer.py
 
 class Bediende:
+    # Geen __dict__ per object: bespaart geheugen bij grote aantallen bedienden
+    __slots__ = (
+        "bruto_maandloon", "prestatiebreuk",
+        "MG_WG_jaar", "MG_WN_jaar", "EC_jaar",
+        "GV_WG_pct", "AO_pct", "maandelijkse_kostenvergoeding",
+        "regime",
+    )
+
     def __init__(
         self,
         bruto_maandloon: float,          # Maandelijks brutoloon vóór inhoudingen (basis voor alles)
@@ -16,7 +24,6 @@ class Bediende:
 
         # Basissalaris
         self.bruto_maandloon = bruto_maandloon
-        self.bruto_jaarloon = bruto_maandloon * 12   # Altijd intern ook in jaarvorm beschikbaar
 
         # Contractuele prestaties (voor berekening referteloon werkbonus)
         self.prestatiebreuk = prestatiebreuk        
@@ -34,6 +41,11 @@ class Bediende:
         # BBSZ-regime selectie (beïnvloedt inhouding)
         self.regime = regime
 
+    @property
+    def bruto_jaarloon(self):
+        # Altijd ook in jaarvorm beschikbaar (afgeleid, niet apart opgeslagen)
+        return self.bruto_maandloon * 12
+
     def __repr__(self):
         # Representatie voor debugging of prints
         return f"Bediende(bruto={self.bruto_maandloon} EUR/maand, prestatiebreuk={self.prestatiebreuk})"
@@ -0,0 +1,39 @@
+# tests/test_achtergrond.py
+
+import numpy as np
+
+from payroll.achtergrond import KLAAR, Takenbeheer, samenvatting, tel_rijen
+from payroll.export import SAMENVATTING_BEDRAGEN
+
+INHOUD = (b'werknemer_id,opmerking,bruto_maandloon,regime\n'
+          b'1,"regel 1\nregel 2",3000,individueel\n'
+          b'\n'
+          b'2,ok,4000,gemeenschappelijk_met_inkomen\n'
+          b'3,"a\n\nb",5000,individueel')
+
+
+def test_tel_rijen_met_regeleinden_in_velden():
+    assert tel_rijen(INHOUD) == 3
+    assert tel_rijen(b"bruto_maandloon\n") == 0
+    assert tel_rijen(b"a;b\n1;2\n3;4\n", sep=";") == 2
+
+
+def test_taak_en_samenvatting():
+    beheer = Takenbeheer(workers=1)
+    try:
+        taak = beheer.start(INHOUD)
+        taak.future.result()
+        assert taak.status == KLAAR
+        assert (taak.totaal, taak.verwerkt, taak.voortgang) == (3, 3, 1.0)
+        # Dezelfde upload → dezelfde taak
+        assert beheer.start(INHOUD) is taak
+    finally:
+        beheer.sluit()
+
+    tabel = samenvatting(taak.resultaat)
+    assert list(tabel.index) == ["individueel", "gemeenschappelijk_met_inkomen", "totaal"]
+    assert tabel.loc["individueel", "werknemers"] == 2
+    for veld, _ in SAMENVATTING_BEDRAGEN:
+        som = taak.resultaat[veld].sum()
+        assert np.isclose(tabel.loc["totaal", f"som_{veld}"], som)
+        assert np.isclose(tabel.loc["totaal", f"gemiddeld_{veld}"], som / 3, atol=0.005)
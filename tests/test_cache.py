@@ -0,0 +1,38 @@
+# tests/test_cache.py
+
+from parameters.register import STANDAARD
+from payroll.cache import BerekeningCache
+from payroll.loonkost import bereken_loonkost
+from payroll.nettoloon import bereken_nettoloon
+from payroll.werknemer import Bediende
+
+
+def _aangepast():
+    b = STANDAARD.belasting
+    return STANDAARD._replace(belasting=b._replace(kostenforfait_plafond=1_000.0))
+
+
+def test_hit_en_kopie():
+    cache = BerekeningCache()
+    b = Bediende(3_500.0)
+    eerste = cache.nettoloon(b)
+    eerste["nettoloon_maand"] = 0.0            # aanpassen raakt de cache niet
+    assert cache.nettoloon(b) == bereken_nettoloon(b)
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_aangepaste_parameterset_zelfde_jaar():
+    cache = BerekeningCache()
+    b, eigen = Bediende(3_500.0), _aangepast()
+    assert eigen.jaar == STANDAARD.jaar
+    standaard = cache.nettoloon(b)
+    assert cache.nettoloon(b, eigen) == bereken_nettoloon(b, eigen) != standaard
+    assert cache.loonkost(b, params=eigen) == bereken_loonkost(b, bereken_nettoloon(b, eigen), params=eigen)
+    assert cache.overzicht(b, True, eigen)[1] == bereken_nettoloon(b, eigen)
+
+
+def test_lru_grens():
+    cache = BerekeningCache(maxsize=2)
+    for bruto in (2_000.0, 3_000.0, 4_000.0):
+        cache.nettoloon(Bediende(bruto))
+    assert len(cache) == 2
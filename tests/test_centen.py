@@ -0,0 +1,74 @@
+# tests/test_centen.py
+#
+# Centenmotor (int64): scalair = gevectoriseerd, afronding half weg van nul,
+# en op de cent gelijk aan de float-motor op het pariteitsrooster.
+
+import numpy as np
+import pytest
+
+from parameters.bszb_2025 import REGIMES
+from payroll.centen import _deel, _deel_vec, bereken_batch_centen, bereken_loonkost_centen, \
+    bereken_nettoloon_centen, naar_centen
+from payroll.loonkost import bereken_loonkost
+from payroll.nettoloon import bereken_nettoloon
+from payroll.werknemer import Bediende
+from test_pariteit import PRESTATIEBREUKEN, _knikrijen, _willekeurige_rijen
+
+
+def _rooster(regime, prestatiebreuk):
+    rng = np.random.default_rng([REGIMES.index(regime), round(prestatiebreuk * 100), 12])
+    rijen = [_willekeurige_rijen(rng, 300), _knikrijen(regime, prestatiebreuk)]
+    return {k: np.concatenate([r[k] for r in rijen]) for k in rijen[0]}
+
+
+def _bedienden(rijen, regime, prestatiebreuk):
+    for i in range(rijen["bruto_maandloon"].size):
+        yield i, Bediende(prestatiebreuk=prestatiebreuk, regime=regime, **{k: float(v[i]) for k, v in rijen.items()})
+
+
+# -----------------------
+# Afronding
+# -----------------------
+@pytest.mark.parametrize("euro, centen", [
+    (0.005, 1), (-0.005, -1), (1.005, 101), (-1.005, -101), (2.675, 268), (1234.565, 123457),
+    (8.345, 835), (0.125, 13), (1.004999, 100), (0.0, 0), (3500.0, 350_000),
+])
+def test_naar_centen_half_weg_van_nul(euro, centen):
+    assert naar_centen(euro) == centen
+    assert naar_centen(np.array([euro]))[0] == centen
+
+
+def test_deel_half_weg_van_nul():
+    a = np.arange(-25, 26, dtype=np.int64)
+    verwacht = [_deel(int(x), 10) for x in a]
+    assert _deel(5, 10) == 1 and _deel(-5, 10) == -1 and _deel(4, 10) == 0 and _deel(15, 10) == 2
+    np.testing.assert_array_equal(_deel_vec(a.copy(), 10), verwacht)
+
+
+# -----------------------
+# Scalair = gevectoriseerd, en = float-motor
+# -----------------------
+@pytest.mark.parametrize("prestatiebreuk", PRESTATIEBREUKEN)
+@pytest.mark.parametrize("regime", REGIMES)
+def test_scalair_gelijk_aan_batch(regime, prestatiebreuk):
+    rijen = _rooster(regime, prestatiebreuk)
+    netto, kost = bereken_batch_centen(prestatiebreuk=prestatiebreuk, regime=regime, **rijen)
+    for i, b in _bedienden(rijen, regime, prestatiebreuk):
+        n = bereken_nettoloon_centen(b)
+        k = bereken_loonkost_centen(b, n)
+        assert n == {v: int(a[i]) for v, a in netto.items()}
+        assert k == {v: int(a[i]) for v, a in kost.items()}
+
+
+@pytest.mark.parametrize("prestatiebreuk", PRESTATIEBREUKEN)
+@pytest.mark.parametrize("regime", REGIMES)
+def test_gelijk_aan_float_motor(regime, prestatiebreuk):
+    rijen = _rooster(regime, prestatiebreuk)
+    netto, kost = bereken_batch_centen(prestatiebreuk=prestatiebreuk, regime=regime, **rijen)
+    for i, b in _bedienden(rijen, regime, prestatiebreuk):
+        n = bereken_nettoloon(b)
+        k = bereken_loonkost(b, n)
+        for veld, waarde in n.items():
+            assert naar_centen(waarde) == netto[veld][i], veld
+        for veld, waarde in k.items():
+            assert naar_centen(waarde) == kost[veld][i], veld
@@ -0,0 +1,70 @@
+# tests/test_dienst.py
+
+import asyncio
+import json
+
+import pytest
+
+from payroll.dienst import Fout, Rekendienst
+from payroll.loonkost import bereken_loonkost
+from payroll.nettoloon import bereken_nettoloon
+from payroll.werknemer import Bediende
+
+
+def _verwerk(pad, body, methode="POST"):
+    tekst = body if isinstance(body, str) else json.dumps(body)
+    return asyncio.run(Rekendienst().verwerk(methode, pad, tekst.encode()))
+
+
+def _status(pad, body, methode="POST"):
+    with pytest.raises(Fout) as fout:
+        _verwerk(pad, body, methode)
+    return fout.value.status
+
+
+@pytest.mark.parametrize("pad", ["/nettoloon", "/loonkost", "/overzicht"])
+@pytest.mark.parametrize("body", [
+    '{"bruto_maandloon": NaN}',
+    '{"bruto_maandloon": Infinity}',
+    '{"bruto_maandloon": 3000, "EC_jaar": -Infinity}',
+    '{"bruto_maandloon": "drieduizend"}',
+    '{"bruto_maandloon": 3000, "jaar": 1999}',
+    '{"bruto_maandloon": 3000, "jaar": "vorig jaar"}',
+    '{"bruto_maandloon": 3000, "regime": "onbekend"}',
+    '{"bruto_maandloon": 3000, "loon": 1}',
+    '{"EC_jaar": 100}',
+    '[3000]',
+    '{"bruto_maandloon": ',
+])
+def test_ongeldig_verzoek_400(pad, body):
+    assert _status(pad, body) == 400
+
+
+@pytest.mark.parametrize("extra", [{"categorie": 9}, {"categorie": "twee"}, {"RSZ_WG_PCT": "NaN"}])
+def test_loonkost_ongeldige_categorie_of_pct_400(extra):
+    assert _status("/loonkost", {"bruto_maandloon": 3000, **extra}) == 400
+
+
+def test_pad_en_methode():
+    assert _status("/onbekend", {}) == 404
+    assert _status("/nettoloon", {"bruto_maandloon": 3000}, methode="GET") == 405
+    assert _status("/statistieken", "", methode="POST") == 405
+
+
+def test_geldig_verzoek_200():
+    b = Bediende(bruto_maandloon=3_200.0, MG_WN_jaar=200.0, regime="gemeenschappelijk_met_inkomen")
+    netto = bereken_nettoloon(b)
+    status, antwoord = _verwerk("/nettoloon", {"bruto_maandloon": 3200, "MG_WN_jaar": 200,
+                                               "regime": "gemeenschappelijk_met_inkomen", "jaar": 2025})
+    assert status == 200
+    assert antwoord == netto._asdict()
+
+    status, antwoord = _verwerk("/loonkost", {"bruto_maandloon": 3200, "MG_WN_jaar": 200,
+                                              "regime": "gemeenschappelijk_met_inkomen", "categorie": 1})
+    assert status == 200
+    assert antwoord == bereken_loonkost(b, netto, 1, 0.25)._asdict()
+
+    status, antwoord = _verwerk("/overzicht", {"bruto_maandloon": 3200, "toon_per_maand": False})
+    assert status == 200
+    assert antwoord["overzicht"]
+    assert antwoord["nettoloon"]["nettoloon_maand"] == bereken_nettoloon(Bediende(bruto_maandloon=3_200.0)).nettoloon_maand
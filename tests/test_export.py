@@ -0,0 +1,80 @@
+# tests/test_export.py
+#
+# StreamExport: CSV en xlsx terug inlezen en vergelijken met de berekening.
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from payroll import export
+from payroll.export import StreamExport
+from payroll.personeelsbestand import Personeelsbestand
+from payroll.resultaten import KOST_VELDEN, NETTO_VELDEN
+
+SLEUTEL = 'id;"x"'      # bevat scheidingsteken én aanhalingsteken
+
+
+def _blokken(n=25, blokgrootte=10):
+    rng = np.random.default_rng(5)
+    df = pd.DataFrame({
+        SLEUTEL: [f"W{i:03d}" for i in range(n)],
+        "bruto_maandloon": np.round(rng.uniform(1_500, 8_000, n), 2),
+        "MG_WG_jaar": 1_500.0,
+        "regime": rng.choice(["individueel", "gemeenschappelijk_met_inkomen"], n),
+    })
+    for begin in range(0, n, blokgrootte):
+        blok = df.iloc[begin:begin + blokgrootte].reset_index(drop=True)
+        pb = Personeelsbestand.uit_dataframe(blok)
+        yield blok, *pb.bereken(), pb.regime_code
+
+
+def _schrijf(pad, **kwargs):
+    with StreamExport(str(pad), **kwargs) as exp:
+        verwacht = []
+        for blok, netto, kost, codes in _blokken():
+            exp.schrijf_blok(blok, netto, kost, codes)
+            verwacht.append((blok, netto, kost))
+    return verwacht
+
+
+def _controleer(netto_df, kost_df, verwacht):
+    sleutels = pd.concat([b[SLEUTEL] for b, _, _ in verwacht], ignore_index=True)
+    assert netto_df[SLEUTEL].tolist() == kost_df[SLEUTEL].tolist() == sleutels.tolist()
+    for v in NETTO_VELDEN:
+        np.testing.assert_allclose(netto_df[v], np.concatenate([n[v] for _, n, _ in verwacht]))
+    for v in KOST_VELDEN:
+        np.testing.assert_allclose(kost_df[v], np.concatenate([k[v] for _, _, k in verwacht]))
+
+
+@pytest.mark.parametrize("sep", [",", ";"])
+def test_csv_heen_en_terug(tmp_path, sep):
+    verwacht = _schrijf(tmp_path / "r.csv", sep=sep)
+    netto = pd.read_csv(tmp_path / "r_netto.csv", sep=sep)
+    kost = pd.read_csv(tmp_path / "r_loonkost.csv", sep=sep)
+    assert list(netto.columns) == [SLEUTEL, "regime", *NETTO_VELDEN]
+    _controleer(netto, kost, verwacht)
+    samenvatting = pd.read_csv(tmp_path / "r_samenvatting.csv", sep=sep).set_index("regime")
+    assert samenvatting.loc["totaal", "werknemers"] == 25
+
+
+def test_xlsx_heen_en_terug(tmp_path):
+    pytest.importorskip("openpyxl")
+    verwacht = _schrijf(tmp_path / "r.xlsx")
+    bladen = pd.read_excel(tmp_path / "r.xlsx", sheet_name=None)
+    assert list(bladen) == ["netto", "loonkost", "samenvatting"]
+    _controleer(bladen["netto"], bladen["loonkost"], verwacht)
+
+
+@pytest.mark.parametrize("max_rijen, bladen", [(26, ["netto"]), (25, ["netto", "netto (2)"]),
+                                               (11, ["netto", "netto (2)", "netto (3)"])])
+def test_xlsx_vervolgbladen(tmp_path, monkeypatch, max_rijen, bladen):
+    pytest.importorskip("openpyxl")
+    # max_rijen incl. kopregel: 25 gegevensrijen passen exact op één blad van 26
+    monkeypatch.setattr(export, "MAX_RIJEN_EXCEL", max_rijen)
+    verwacht = _schrijf(tmp_path / "r.xlsx")
+    gelezen = pd.read_excel(tmp_path / "r.xlsx", sheet_name=None)
+    assert [b for b in gelezen if b.startswith("netto")] == bladen
+    assert all(len(gelezen[b]) > 0 for b in bladen)     # geen leeg vervolgblad
+    netto = pd.concat([gelezen[b] for b in bladen], ignore_index=True)
+    kost = pd.concat([gelezen[b] for b in gelezen if b.startswith("loonkost")], ignore_index=True)
+    _controleer(netto, kost, verwacht)
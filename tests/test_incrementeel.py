@@ -0,0 +1,70 @@
+# tests/test_incrementeel.py
+
+import numpy as np
+import pandas as pd
+
+from parameters.register import STANDAARD
+from payroll.incrementeel import RAPPORT_VELDEN, bewaar_toestand, herbereken, laad_toestand
+from payroll.personeelsbestand import Personeelsbestand
+
+
+def _bestand():
+    return pd.DataFrame({
+        "werknemer_id": ["A", "B", "C", "D"],
+        "bruto_maandloon": [2_500.0, 3_500.0, 4_500.0, 5_500.0],
+        "MG_WG_jaar": [1_500.0, 0.0, 1_500.0, 0.0],
+        "regime": ["individueel", "individueel", "gemeenschappelijk_met_inkomen", "individueel"],
+    })
+
+
+def test_eerste_run_alles_nieuw():
+    toestand, delta = herbereken(_bestand())
+    assert (delta["status"] == "nieuw").all() and len(delta) == 4
+    netto, _ = Personeelsbestand.uit_dataframe(_bestand()).bereken()
+    np.testing.assert_array_equal(toestand["nettoloon_maand"], netto["nettoloon_maand"])
+
+
+def test_delta_nieuw_gewijzigd_verdwenen(tmp_path):
+    vorige, _ = herbereken(_bestand())
+    bewaar_toestand(str(tmp_path / "t.npz"), vorige)
+    vorige = laad_toestand(str(tmp_path / "t.npz"))
+
+    df = _bestand()
+    df.loc[df["werknemer_id"] == "B", "bruto_maandloon"] = 3_500.01     # 1 cent opslag
+    df.loc[df["werknemer_id"] == "C", "regime"] = "individueel"
+    df = pd.concat([df[df["werknemer_id"] != "D"],
+                    pd.DataFrame({"werknemer_id": ["E"], "bruto_maandloon": [3_000.0], "MG_WG_jaar": [0.0],
+                                  "regime": ["individueel"]})], ignore_index=True)
+
+    toestand, delta = herbereken(df, vorige)
+    status = dict(zip(delta["werknemer_id"], delta["status"]))
+    assert status == {"B": "gewijzigd", "C": "gewijzigd", "D": "verdwenen", "E": "nieuw"}   # A ongewijzigd
+    reden = dict(zip(delta["werknemer_id"], delta["reden"]))
+    assert reden["B"] == "bruto_maandloon" and reden["C"] == "regime"
+
+    # Verschillen op de cent, zonder float-ruis
+    for veld in RAPPORT_VELDEN:
+        verschil = delta[veld + "_verschil"].dropna().to_numpy()
+        np.testing.assert_array_equal(verschil, np.round(verschil, 2))
+    b = delta.set_index("werknemer_id").loc["B"]
+    assert b["nettoloon_maand_verschil"] == round(b["nettoloon_maand"] - b["nettoloon_maand_oud"], 2)
+
+    # Herberekend resultaat = volledige berekening
+    netto, kost = Personeelsbestand.uit_dataframe(df).bereken()
+    np.testing.assert_array_equal(toestand["nettoloon_maand"], netto["nettoloon_maand"])
+    np.testing.assert_array_equal(toestand["totaal_loonkost_maand"], kost["totaal_loonkost_maand"])
+
+
+def test_gewijzigde_parameters_zelfde_jaar():
+    vorige, _ = herbereken(_bestand())
+    b = STANDAARD.belasting
+    eigen = STANDAARD._replace(belasting=b._replace(kostenforfait_plafond=b.kostenforfait_plafond - 100))
+    _, delta = herbereken(_bestand(), vorige, params=eigen)
+    assert (delta["status"] == "gewijzigd").all() and len(delta) == 4
+    assert (delta["reden"] == "parameters").all()
+
+
+def test_niets_gewijzigd():
+    vorige, _ = herbereken(_bestand())
+    _, delta = herbereken(_bestand(), vorige)
+    assert delta.empty
@@ -0,0 +1,71 @@
+# tests/test_kwartaal.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from parameters.bszb_2025 import REGIMES, bereken_bszb
+from parameters.register import STANDAARD
+from parameters.structurele_vermindering_2025 import bereken_R, bereken_structurele_vermindering_maand
+from payroll.kwartaal import KWARTAALVELDEN, kwartaalaangifte
+
+
+def _volledig_kwartaal(n=60, seed=7):
+    """n werknemers bij drie werkgevers, elk drie maanden in Q1 2025 met wisselend loon."""
+    rng = np.random.default_rng(seed)
+    basis = np.round(rng.uniform(1_800.0, 9_000.0, n), 2)
+    rijen = []
+    for i in range(n):
+        for maand in (1, 2, 3):
+            rijen.append({
+                "werkgever": f"WG{i % 3}",
+                "werknemer_id": f"W{i:03d}",
+                "periode": f"2025-{maand:02d}",
+                "bruto_maandloon": round(basis[i] * (1.0 + 0.05 * (maand == 3) * (i % 2)), 2),
+                "prestatiebreuk": (1.0, 0.8, 0.5)[i % 3] if i % 4 else 1.0,
+                "regime": REGIMES[i % len(REGIMES)],
+            })
+    return pd.DataFrame(rijen)
+
+
+def test_volledig_kwartaal_tegen_scalaire_functies():
+    lonen = _volledig_kwartaal()
+    detail, per_werkgever = kwartaalaangifte(lonen)
+    assert len(detail) == 60 and (detail["maanden"] == 3).all()
+    assert (detail["kwartaal"] == "2025-Q1").all()
+
+    for rij in detail.itertuples():
+        maanden = lonen[lonen["werknemer_id"] == rij.werknemer_id]
+        bruto = maanden["bruto_maandloon"].to_numpy()
+        mu = maanden["prestatiebreuk"].iloc[0]
+        K = bruto.sum()
+        assert rij.kwartaalloon == pytest.approx(round(K, 2), abs=1e-9)
+
+        # BSZB op het kwartaalloon, ingehouden = som van de maandelijkse voorheffing
+        bszb = bereken_bszb(K / 3, rij.regime, STANDAARD.bszb)
+        assert rij.bszb_kwartaal == pytest.approx(bszb["bszb_kwartaal"], abs=1e-9)
+        ingehouden = sum(bereken_bszb(s, rij.regime, STANDAARD.bszb)["bszb_maand"] for s in bruto)
+        assert rij.bszb_ingehouden == pytest.approx(ingehouden, abs=1e-9)
+        assert rij.bszb_regularisatie == pytest.approx(round(bszb["bszb_kwartaal"] - ingehouden, 2), abs=1e-9)
+
+        # Structurele vermindering: kwartaalbedrag ≈ 3 × het maandbedrag (enkel afronding verschilt),
+        # nooit meer dan de patronale bijdrage
+        rsz = round(K * 0.25 + 1e-9, 2)
+        assert rij.rsz_patronaal_bruto == pytest.approx(rsz, abs=1e-9)
+        maand = bereken_structurele_vermindering_maand(1, K / 3, mu, STANDAARD.structureel)
+        if 3 * maand >= rsz + 0.015:
+            assert rij.structurele_vermindering == rsz
+        else:
+            assert rij.structurele_vermindering == pytest.approx(3 * maand, abs=0.015 + 1e-9)
+            if mu == 1.0:
+                R = bereken_R(1, K / 3, mu, STANDAARD.structureel)
+                assert rij.structurele_vermindering == pytest.approx(R, abs=1e-9)
+        assert rij.rsz_patronaal == pytest.approx(round(rsz - rij.structurele_vermindering, 2), abs=1e-9)
+
+    # Per werkgever: som van de detailrijen
+    assert per_werkgever["werkgever"].tolist() == ["WG0", "WG1", "WG2"]
+    assert per_werkgever["werknemers"].tolist() == [20, 20, 20]
+    som = detail.groupby("werkgever")[list(KWARTAALVELDEN)].sum()
+    for veld in KWARTAALVELDEN:
+        np.testing.assert_allclose(per_werkgever[veld].to_numpy(), som[veld].to_numpy(), atol=1e-6)
+
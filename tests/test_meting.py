@@ -0,0 +1,96 @@
+# tests/test_meting.py
+
+import threading
+
+import pytest
+
+import parameters.bszb_2025 as bszb_2025
+import payroll.nettoloon as nettoloon
+import payroll.overzicht as overzicht
+from payroll import meting
+from payroll.meting import meet
+from payroll.werknemer import Bediende
+
+NETTO = "payroll.nettoloon.bereken_nettoloon"
+BSZB = "parameters.bszb_2025.bereken_bszb"
+
+
+@pytest.fixture
+def originelen():
+    """Referenties vóór de meting; na afloop moet alles weer zo staan."""
+    waren = {
+        "nettoloon": nettoloon.bereken_nettoloon,
+        "nettoloon.bereken_bszb": nettoloon.bereken_bszb,
+        "bszb": bszb_2025.bereken_bszb,
+        "overzicht": overzicht.bereken_nettoloon,
+    }
+    yield waren
+    assert not meting._GEPATCHT and not meting._LUISTERAARS
+    assert nettoloon.bereken_nettoloon is waren["nettoloon"]
+    assert nettoloon.bereken_bszb is waren["nettoloon.bereken_bszb"]
+    assert bszb_2025.bereken_bszb is waren["bszb"]
+    assert overzicht.bereken_nettoloon is waren["overzicht"]
+
+
+def test_vervangen_en_terugzetten(originelen):
+    b = Bediende(bruto_maandloon=3_000.0)
+    with meet() as m:
+        # Ook de `from ... import`-kopieën zijn vervangen
+        assert nettoloon.bereken_nettoloon is not originelen["nettoloon"]
+        assert nettoloon.bereken_bszb is not originelen["nettoloon.bereken_bszb"]
+        assert overzicht.bereken_nettoloon is nettoloon.bereken_nettoloon
+        for _ in range(3):
+            nettoloon.bereken_nettoloon(b)
+    assert m.resultaat[NETTO][:2] == ["nettoloon", 3]
+    assert m.resultaat[BSZB][:2] == ["bszb", 3]
+    stap, n, totaal, eigen = m.resultaat[NETTO]
+    assert 0.0 <= eigen <= totaal
+    assert m.per_stap()["nettoloon"]["aanroepen"] == 3
+
+
+def test_overlappende_metingen_willekeurige_volgorde(originelen):
+    b = Bediende(bruto_maandloon=2_500.0)
+    buiten = meet().__enter__()
+    nettoloon.bereken_nettoloon(b)
+    binnen = meet(stappen=[s for s in meting.STAPPEN if s[1] == "payroll.nettoloon"]).__enter__()
+    gemeten = nettoloon.bereken_nettoloon
+    nettoloon.bereken_nettoloon(b)
+
+    # De eerste meting stopt eerst: de tweede blijft meten met dezelfde vervanging
+    buiten.__exit__(None, None, None)
+    assert nettoloon.bereken_nettoloon is gemeten
+    assert bszb_2025.bereken_bszb is originelen["bszb"]
+    nettoloon.bereken_nettoloon(b)
+    binnen.__exit__(None, None, None)
+
+    assert buiten.resultaat[NETTO][1] == 2
+    assert binnen.resultaat[NETTO][1] == 2
+    assert BSZB not in binnen.resultaat
+
+
+def test_metingen_in_threads(originelen):
+    b = Bediende(bruto_maandloon=4_000.0)
+    start = threading.Barrier(4)
+    metingen = []
+
+    def werk():
+        with meet() as m:
+            start.wait()
+            for _ in range(5):
+                nettoloon.bereken_nettoloon(b)
+            start.wait()
+        metingen.append(m)
+
+    threads = [threading.Thread(target=werk) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    # Elke meting ziet de aanroepen van alle threads zolang ze loopt
+    assert all(m.resultaat[NETTO][1] == 20 for m in metingen)
+
+
+def test_zelfde_meting_niet_twee_keer(originelen):
+    with meet() as m:
+        with pytest.raises(RuntimeError):
+            m.__enter__()
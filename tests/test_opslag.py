@@ -0,0 +1,73 @@
+# tests/test_opslag.py
+
+import sqlite3
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from parameters.bszb_2025 import REGIMES
+from payroll.benchmark import synthetisch_bestand
+from payroll.opslag import Resultatenopslag, main
+
+
+@pytest.fixture
+def db(tmp_path):
+    with Resultatenopslag(str(tmp_path / "historiek.sqlite")) as db:
+        yield db
+
+
+def _bestand(n, seed):
+    pb = synthetisch_bestand(n, seed=seed)
+    pb.regime_code[:] = np.arange(n) % len(REGIMES)
+    return pb
+
+
+def _bewaar(db, pb, periode):
+    netto, kost = pb.bereken()
+    db.bewaar_run(pb, netto, kost, periode)
+    return {**netto, **kost}
+
+
+def test_aggregatie_per_periode_en_regime(db):
+    verwacht = {}
+    for periode, seed in (("2025-01", 1), ("2025-02", 2), ("2025-03", 3)):
+        pb = _bestand(300, seed)
+        verwacht[periode] = (pb.regime_code.copy(), _bewaar(db, pb, periode))
+
+    for functie, numpy_functie in (("SUM", np.sum), ("AVG", np.mean), ("MIN", np.min), ("MAX", np.max)):
+        tabel = db.aggregeer(("nettoloon_maand", "totaal_loonkost_maand"), functie=functie)
+        assert len(tabel) == 3 * len(REGIMES)
+        for rij in tabel.itertuples():
+            codes, res = verwacht[rij.periode]
+            m = codes == REGIMES.index(rij.regime)
+            assert rij.werknemers == m.sum()
+            assert rij.nettoloon_maand == pytest.approx(numpy_functie(res["nettoloon_maand"][m]))
+            assert rij.totaal_loonkost_maand == pytest.approx(numpy_functie(res["totaal_loonkost_maand"][m]))
+
+    draai = db.per_regime_per_maand("totaal_loonkost_maand", van="2025-02", tot="2025-03")
+    assert list(draai.index) == ["2025-02", "2025-03"]
+    assert draai.loc["2025-02"].sum() == pytest.approx(verwacht["2025-02"][1]["totaal_loonkost_maand"].sum())
+
+
+def test_nieuwe_run_vervangt_periode(db):
+    _bewaar(db, _bestand(60, 1), "2025-01")
+    tweede = _bewaar(db, _bestand(60, 2), "2025-01")
+    tabel = db.aggregeer(per=("periode",))
+    assert tabel["werknemers"].tolist() == [60]
+    assert tabel["totaal_loonkost_maand"].iloc[0] == pytest.approx(tweede["totaal_loonkost_maand"].sum())
+
+
+def test_cli_identieke_run_niet_opnieuw(tmp_path):
+    pad, csv = str(tmp_path / "h.sqlite"), tmp_path / "personeel.csv"
+    pd.DataFrame({"werknemer_id": ["A", "B", "C"], "bruto_maandloon": [2_500.0, 3_500.0, 4_500.0]}).to_csv(csv, index=False)
+
+    def rijen():
+        with sqlite3.connect(pad) as con:
+            return con.execute("SELECT COUNT(*) FROM resultaten").fetchone()[0]
+
+    main(["--db", pad, "bewaar", str(csv), "--periode", "2025-01"])
+    main(["--db", pad, "bewaar", str(csv), "--periode", "2025-01"])
+    assert rijen() == 3
+    main(["--db", pad, "bewaar", str(csv), "--periode", "2025-01", "--forceer"])
+    assert rijen() == 6
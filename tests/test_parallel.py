@@ -0,0 +1,40 @@
+# tests/test_parallel.py
+#
+# bereken_parallel met spawn-workers (zoals op macOS/Windows en forkserver):
+# de Parameterset moet te pickelen zijn, ook een aangepaste, en het resultaat
+# gelijk aan bereken_batch.
+
+import multiprocessing
+import pickle
+
+import numpy as np
+
+from parameters.register import STANDAARD
+from payroll.benchmark import synthetisch_bestand
+from payroll.parallel import bereken_parallel
+from payroll.vectorieel import bereken_batch
+
+
+def _aangepast():
+    b = STANDAARD.belasting
+    return STANDAARD._replace(belasting=b._replace(kostenforfait_plafond=b.kostenforfait_plafond / 2))
+
+
+def test_parameterset_te_pickelen():
+    for params in (STANDAARD, _aangepast()):
+        terug = pickle.loads(pickle.dumps(params))
+        assert terug == params
+        assert type(terug.structureel) is type(params.structureel)
+
+
+def test_spawn_gelijk_aan_bereken_batch():
+    pb = synthetisch_bestand(3_000)
+    params = _aangepast()
+    netto, kost = bereken_parallel(pb, workers=2, blokgrootte=1_000, params=params,
+                                   mp_context=multiprocessing.get_context("spawn"))
+    verwacht_netto, verwacht_kost = bereken_batch(regime=pb.regime, params=params,
+                                                  **{k: pb.kolommen[k] for k in pb.kolommen})
+    np.testing.assert_array_equal(netto.matrix, verwacht_netto.matrix)
+    np.testing.assert_array_equal(kost.matrix, verwacht_kost.matrix)
+    # De aangepaste set werd echt gebruikt
+    assert not np.array_equal(netto["nettoloon_maand"], pb.bereken()[0]["nettoloon_maand"])
@@ -0,0 +1,62 @@
+# tests/test_pariteit.py
+#
+# Scalaire motor (bereken_nettoloon / bereken_loonkost, per Bediende) tegenover
+# de gevectoriseerde (bereken_batch): op de cent gelijk voor willekeurige
+# rijen en rond elke knik (schijfgrenzen, BSZB, werkbonus, SV).
+
+import numpy as np
+import pytest
+
+from parameters.bszb_2025 import REGIMES
+from payroll.knikpunten import compileer_model
+from payroll.loonkost import bereken_loonkost
+from payroll.nettoloon import bereken_nettoloon
+from payroll.vectorieel import bereken_batch
+from payroll.werknemer import Bediende
+
+PRESTATIEBREUKEN = (1.0, 0.8, 0.5)
+VOORDELEN = ("MG_WG_jaar", "MG_WN_jaar", "EC_jaar", "GV_WG_pct", "AO_pct", "maandelijkse_kostenvergoeding")
+
+
+def _willekeurige_rijen(rng, n):
+    return {
+        "bruto_maandloon": np.round(rng.uniform(0.0, 12_000.0, n), 2),
+        "MG_WG_jaar": rng.choice([0.0, 1_500.0, 1_760.0], n),
+        "MG_WN_jaar": rng.choice([0.0, 250.0, 237.6], n),
+        "EC_jaar": rng.choice([0.0, 250.0], n),
+        "GV_WG_pct": rng.choice([0.0, 0.03, 0.05], n),
+        "AO_pct": rng.choice([0.0, 0.01, 0.02], n),
+        "maandelijkse_kostenvergoeding": rng.choice([0.0, 50.0, 145.37], n),
+    }
+
+
+def _knikrijen(regime, prestatiebreuk):
+    """Elke knik van het model (schijfgrenzen in bruto, BSZB-grenzen, ...) op de cent en ±1 cent."""
+    model = compileer_model(prestatiebreuk, regime=regime, bruto_max=12_000.0)
+    knik = np.round(np.asarray(model.knikpunten), 2)
+    bruto = np.unique(np.concatenate([knik - 0.01, knik, knik + 0.01]))
+    bruto = bruto[bruto >= 0]
+    return {"bruto_maandloon": bruto, **{k: np.zeros(bruto.size) for k in VOORDELEN}}
+
+
+def _vergelijk(rijen, regime, prestatiebreuk):
+    netto, kost = bereken_batch(prestatiebreuk=prestatiebreuk, regime=regime, **rijen)
+    for i in range(netto.aantal):
+        b = Bediende(prestatiebreuk=prestatiebreuk, regime=regime, **{k: float(v[i]) for k, v in rijen.items()})
+        n = bereken_nettoloon(b)
+        k = bereken_loonkost(b, n)
+        assert n == netto.rij(i), f"nettoloon verschilt bij {rijen['bruto_maandloon'][i]:.2f}"
+        assert k == kost.rij(i), f"loonkost verschilt bij {rijen['bruto_maandloon'][i]:.2f}"
+
+
+@pytest.mark.parametrize("prestatiebreuk", PRESTATIEBREUKEN)
+@pytest.mark.parametrize("regime", REGIMES)
+def test_willekeurige_rijen(regime, prestatiebreuk):
+    rng = np.random.default_rng([REGIMES.index(regime), round(prestatiebreuk * 100)])
+    _vergelijk(_willekeurige_rijen(rng, 400), regime, prestatiebreuk)
+
+
+@pytest.mark.parametrize("prestatiebreuk", PRESTATIEBREUKEN)
+@pytest.mark.parametrize("regime", REGIMES)
+def test_rond_knikpunten(regime, prestatiebreuk):
+    _vergelijk(_knikrijen(regime, prestatiebreuk), regime, prestatiebreuk)
@@ -0,0 +1,61 @@
+# tests/test_terugrekenen.py
+#
+# Terugrekenen tegenover brute kracht op een centenrooster: het netto is niet
+# monotoon in het bruto (BSZB-kwartaalgrenzen, afronding op de cent), dus het
+# verwachte antwoord is de eerste cent waar het lopende maximum het doel haalt.
+
+import numpy as np
+import pytest
+
+from parameters.bszb_2025 import REGIMES
+from payroll.terugrekenen import bereken_bruto_voor_doel
+from payroll.vectorieel import bereken_loonkost_batch, bereken_nettoloon_batch
+
+BRUTO_MIN, BRUTO_MAX = 800.0, 9000.0
+BRUTO = np.arange(round(BRUTO_MIN * 100), round(BRUTO_MAX * 100) + 1) / 100.0
+
+
+def _brute_kracht_laagste(y, doel):
+    """Laagste bruto op het rooster met y >= doel."""
+    return BRUTO[np.searchsorted(np.maximum.accumulate(y), doel)]
+
+
+@pytest.mark.parametrize("regime", REGIMES)
+@pytest.mark.parametrize("doel", ["nettoloon_maand", "koopkracht_maand"])
+def test_netto_brute_kracht_over_bszb_sprongen(doel, regime):
+    invoer = dict(MG_WG_jaar=1500.0, MG_WN_jaar=250.0, EC_jaar=250.0, maandelijkse_kostenvergoeding=50.0)
+    y = np.asarray(bereken_nettoloon_batch(BRUTO, regime=regime, **invoer)[doel])
+    grootste = np.maximum.accumulate(y)
+
+    rng = np.random.default_rng(7)
+    doelen = np.round(rng.uniform(y[0] + 0.01, grootste[-1], 3_000), 2)
+    # Net boven/onder de toppen vlak vóór elke sprong van het netto
+    sprong = np.flatnonzero(np.diff(y) < -1.0)
+    doelen = np.concatenate([doelen, y[sprong] - 0.01, y[sprong], y[sprong + 1] + 0.01])
+
+    gevonden = bereken_bruto_voor_doel(doel, doelen, regime=regime, bruto_min=BRUTO_MIN, bruto_max=BRUTO_MAX,
+                                       **invoer)
+    np.testing.assert_array_equal(gevonden, _brute_kracht_laagste(y, doelen))
+
+
+@pytest.mark.parametrize("doel, bruto", [(2672.96, 4099.46), (3539.93, 6037.17)])
+def test_netto_vlak_voor_sprong(doel, bruto):
+    assert bereken_bruto_voor_doel("nettoloon_maand", doel)[0] == bruto
+
+
+@pytest.mark.parametrize("prestatiebreuk", [1.0, 0.5])
+def test_loonkost_brute_kracht(prestatiebreuk):
+    invoer = dict(prestatiebreuk=prestatiebreuk, MG_WG_jaar=1500.0, EC_jaar=250.0, GV_WG_pct=0.05, AO_pct=0.01)
+    y = np.asarray(bereken_loonkost_batch(BRUTO, **invoer)["totaal_loonkost_maand"])
+    doelen = np.round(np.random.default_rng(3).uniform(y[0], y[-1], 3_000), 2)
+
+    gevonden = bereken_bruto_voor_doel("totaal_loonkost_maand", doelen, bruto_min=BRUTO_MIN, bruto_max=BRUTO_MAX,
+                                       **invoer)
+    # Hoogste bruto met loonkost <= budget
+    verwacht = BRUTO[np.searchsorted(y, doelen, side="right") - 1]
+    np.testing.assert_array_equal(gevonden, verwacht)
+
+
+def test_onhaalbaar_en_reeds_voldaan():
+    gevonden = bereken_bruto_voor_doel("nettoloon_maand", [0.0, 1e9], bruto_min=BRUTO_MIN, bruto_max=BRUTO_MAX)
+    assert gevonden[0] == BRUTO_MIN and np.isnan(gevonden[1])
@@ -0,0 +1,22 @@
+# tests/test_voordelenmix.py
+
+import numpy as np
+import pytest
+
+from payroll.voordelenmix import optimaliseer_voordelen
+
+
+@pytest.mark.parametrize("budget", [5_000.0, 62_890.0, 100_000.0])
+def test_beste_mix_binnen_budget(budget):
+    uitkomst = optimaliseer_voordelen(budget, werkdagen=220)
+    beste = uitkomst["beste"]
+    assert beste is not None
+    assert beste["totaal_loonkost_maand"] <= budget
+    # Het budget wordt (op afronding na) volledig benut
+    assert budget - beste["totaal_loonkost_maand"] < 1.0
+
+
+def test_hoog_budget_boven_standaard_brutoplafond():
+    beste = optimaliseer_voordelen(100_000.0, werkdagen=220)["beste"]
+    assert beste["bruto_maandloon"] > 50_000.0
+    assert np.isfinite(beste["koopkracht_maand"])